@@ -0,0 +1,43 @@
+# In-process cache for course catalogs (see course_catalog.load_course_catalog)
+# Key: the catalog CSV and the domain skill graph, each as (absolute path, mtime, size), so
+# editing either file reloads the catalog; value: the CourseCatalog (DataFrame + per-course
+# skill tags). Catalogs are read-only once built, so one instance is shared by all requests.
+# Note: Per-process like the other caches; it resets on restart.
+
+import os
+import threading
+
+from cachetools import LRUCache
+
+import metrics
+
+course_catalog_cache = LRUCache(maxsize=16)
+_lock = threading.Lock()
+
+
+def file_stamp(path):
+    if path is None or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def catalog_key(csv_path, skill_graph_path=None):
+    return (file_stamp(csv_path), file_stamp(skill_graph_path))
+
+
+def get_cached_catalog(key):
+    with _lock:
+        catalog = course_catalog_cache.get(key)
+    metrics.incr(f"cache.course_catalog.{'miss' if catalog is None else 'hit'}")
+    return catalog
+
+
+def cache_catalog(key, catalog):
+    with _lock:
+        course_catalog_cache[key] = catalog
+
+
+def clear_course_catalog_cache():
+    with _lock:
+        course_catalog_cache.clear()
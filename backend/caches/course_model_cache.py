@@ -0,0 +1,41 @@
+# In-process cache for course-selection MILP templates (see course_solver.course_selection_template)
+# Key: skill + hash of its candidate courses (row index and durations), so every request that
+# selects courses for the same skill from the same catalog reuses one PuLP model; only the
+# objective and the duration bounds change between solves.
+# Note: Per-process like the other caches; it resets on restart.
+
+import hashlib
+import threading
+
+from cachetools import LRUCache
+
+import metrics
+
+course_model_cache = LRUCache(maxsize=512)
+_lock = threading.Lock()
+
+
+def template_key(skill, index, durations) -> str:
+    digest = hashlib.sha256()
+    digest.update(skill.encode("utf-8"))
+    digest.update(repr(list(index)).encode("utf-8"))
+    digest.update(durations.tobytes())
+    return digest.hexdigest()
+
+
+def get_cached_template(key):
+    with _lock:
+        template = course_model_cache.get(key)
+    metrics.incr(f"cache.course_model.{'miss' if template is None else 'hit'}")
+    return template
+
+
+def cache_template(key, template):
+    """Store `template` unless another thread got there first; returns the cached one."""
+    with _lock:
+        return course_model_cache.setdefault(key, template)
+
+
+def clear_course_model_cache():
+    with _lock:
+        course_model_cache.clear()
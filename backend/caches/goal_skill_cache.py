@@ -0,0 +1,127 @@
+# Persistent cache for skill-prediction Space responses
+# Key: SHA-256 of the Space endpoint + the normalized request payload (job_title, experience_level,
+# responsibilities), so regenerating skills for an unchanged goal never calls the Space again, and
+# pointing SPACE_URL at another Space (or model) never serves the old one's predictions.
+# SQLite-backed (survives restarts, shared by all workers on one host), with a TTL and a size cap.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_PATH = os.getenv("GOAL_SKILL_CACHE_PATH", "data/cache/goal_skills.sqlite3")
+CACHE_TTL_SECONDS = int(os.getenv("GOAL_SKILL_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("GOAL_SKILL_CACHE_MAX_ENTRIES", "5000"))
+
+_lock = threading.Lock()
+_initialized = False
+
+
+def _connect():
+    global _initialized
+    os.makedirs(os.path.dirname(CACHE_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, timeout=10)
+    if not _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS goal_skill_cache ("
+            " key TEXT PRIMARY KEY,"
+            " skills TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_goal_skill_accessed ON goal_skill_cache(accessed_at)")
+        _initialized = True
+    return conn
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    return value
+
+
+def goal_payload_key(payload: dict, endpoint=None) -> str:
+    """Content hash of the endpoint and the normalized payload (whitespace/case-insensitive)."""
+    canonical = json.dumps(
+        {"endpoint": endpoint, "payload": _normalize(payload)}, sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_cached_goal_skills(payload: dict, endpoint=None):
+    """Cached prediction of `endpoint` for this payload, or None (missing, expired or cache unavailable)."""
+    key = goal_payload_key(payload, endpoint)
+    now = time.time()
+    with _lock:
+        try:
+            conn = _connect()
+        except sqlite3.Error as e:
+            print(f"[goal-skill cache] unavailable: {e}")
+            return None
+        try:
+            row = conn.execute("SELECT skills, created_at FROM goal_skill_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > CACHE_TTL_SECONDS:
+                conn.execute("DELETE FROM goal_skill_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE goal_skill_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return json.loads(row[0])
+        except sqlite3.Error as e:
+            print(f"[goal-skill cache] read failed: {e}")
+            return None
+        finally:
+            conn.close()
+
+
+def cache_goal_skills(payload: dict, skills, endpoint=None):
+    """Store a response, then drop expired rows and the least recently used ones beyond the cap."""
+    key = goal_payload_key(payload, endpoint)
+    now = time.time()
+    with _lock:
+        try:
+            conn = _connect()
+        except sqlite3.Error as e:
+            print(f"[goal-skill cache] unavailable: {e}")
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO goal_skill_cache (key, skills, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(skills), now, now),
+            )
+            conn.execute("DELETE FROM goal_skill_cache WHERE created_at < ?", (now - CACHE_TTL_SECONDS,))
+            conn.execute(
+                "DELETE FROM goal_skill_cache WHERE key IN ("
+                " SELECT key FROM goal_skill_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (CACHE_MAX_ENTRIES,),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[goal-skill cache] write failed: {e}")
+        finally:
+            conn.close()
+
+
+def clear_goal_skill_cache():
+    with _lock:
+        try:
+            conn = _connect()
+        except sqlite3.Error as e:
+            print(f"[goal-skill cache] unavailable: {e}")
+            return
+        try:
+            conn.execute("DELETE FROM goal_skill_cache")
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[goal-skill cache] clear failed: {e}")
+        finally:
+            conn.close()
@@ -0,0 +1,94 @@
+# In-process cache for module plans (see module_generator.generate_modules)
+# For one domain graph the plan is deterministic, so it is memoized in two levels:
+#   skeleton: domain + graph file hash + skill names + association params
+#             → prerequisite graph (cycles broken), association scores, topological order
+#   groups:   skeleton key + canonical hash of the skill list (names + focus) + total hours
+#             → skill groups
+# Module durations are cheap and always recomputed, so a change of hours only re-runs the
+# grouping on the cached skeleton. Editing a graph file changes its hash and misses the cache.
+# Per-domain precomputations (e.g. the prerequisite graph's feedback arc set) are kept alongside,
+# keyed by graph hash, kind and parameters.
+# Note: Per-process like the other caches; it resets on restart.
+
+import hashlib
+import json
+import os
+import threading
+
+from cachetools import LRUCache
+
+import metrics
+
+module_skeleton_cache = LRUCache(maxsize=256)
+module_groups_cache = LRUCache(maxsize=1000)
+domain_graph_cache = LRUCache(maxsize=64)   # (graph hash, kind, *params) -> precomputed data
+_graph_hashes = LRUCache(maxsize=64)  # (path, mtime, size) -> sha256
+_lock = threading.Lock()
+
+
+def graph_file_hash(path: str) -> str:
+    stat = os.stat(path)
+    stamp = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        digest = _graph_hashes.get(stamp)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with _lock:
+            _graph_hashes[stamp] = digest
+    return digest
+
+
+def _hash(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def skeleton_key(domain, graph_hash, skill_names, threshold, conf_weight) -> str:
+    return _hash([domain, graph_hash, sorted(set(skill_names)), threshold, conf_weight])
+
+
+def groups_key(skel_key, skill_focus_map, total_hours) -> str:
+    return _hash([skel_key, sorted(skill_focus_map.items()), total_hours])
+
+
+def _get(cache, name, key):
+    with _lock:
+        value = cache.get(key)
+    metrics.incr(f"cache.{name}.{'miss' if value is None else 'hit'}")
+    return value
+
+
+def get_cached_skeleton(key):
+    return _get(module_skeleton_cache, "module_skeleton", key)
+
+
+def cache_skeleton(key, skeleton):
+    with _lock:
+        module_skeleton_cache[key] = skeleton
+
+
+def get_cached_groups(key):
+    groups = _get(module_groups_cache, "module_groups", key)
+    return None if groups is None else [list(group) for group in groups]
+
+
+def cache_groups(key, groups):
+    with _lock:
+        module_groups_cache[key] = tuple(tuple(group) for group in groups)
+
+
+def get_cached_domain_data(key):
+    return _get(domain_graph_cache, "domain_graph", key)
+
+
+def cache_domain_data(key, value):
+    with _lock:
+        domain_graph_cache[key] = value
+
+
+def clear_module_plan_cache():
+    with _lock:
+        domain_graph_cache.clear()
+        module_skeleton_cache.clear()
+        module_groups_cache.clear()
+        _graph_hashes.clear()
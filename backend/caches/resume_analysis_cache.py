@@ -0,0 +1,52 @@
+# On-disk cache for Gemini resume analyses
+# Key: SHA-256 of the resume bytes + hash of the sorted job skill list + model name, so an
+# unchanged resume analysed against the same skills never hits the LLM (or the PDF parser) again.
+# Entries live per user under data/cache/resume_analysis/<user_id>/ and are dropped whenever the
+# user saves or removes a resume (see routers/user_goal.py).
+
+import hashlib
+import json
+import os
+import shutil
+from typing import List, Optional, Tuple
+
+CACHE_DIR = os.getenv("RESUME_ANALYSIS_CACHE_DIR", "data/cache/resume_analysis")
+
+
+def resume_analysis_key(file_hash: str, skill_list: List[str], model: str) -> str:
+    skills_hash = hashlib.sha256(
+        json.dumps(sorted(skill_list), ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    return hashlib.sha256(f"{file_hash}:{skills_hash}:{model}".encode("utf-8")).hexdigest()
+
+
+def _entry_path(user_id, key: str) -> str:
+    return os.path.join(CACHE_DIR, str(user_id), f"{key}.json")
+
+
+def get_cached_resume_analysis(user_id, key: str) -> Optional[List[Tuple[str, float]]]:
+    path = _entry_path(user_id, key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [tuple(item) for item in json.load(f)]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[resume cache] unreadable entry {path}: {e}")
+        return None
+
+
+def cache_resume_analysis(user_id, key: str, skills: List[Tuple[str, float]]):
+    path = _entry_path(user_id, key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump([list(item) for item in skills], f, ensure_ascii=False)
+        os.replace(tmp_path, path)  # atomic: readers never see a half-written entry
+    except OSError as e:
+        print(f"[resume cache] write failed for {path}: {e}")
+
+
+def clear_resume_analysis_cache(user_id):
+    shutil.rmtree(os.path.join(CACHE_DIR, str(user_id)), ignore_errors=True)
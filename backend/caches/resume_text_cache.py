@@ -0,0 +1,46 @@
+# Extracted-text cache for uploaded resumes
+# Stored next to the upload as data/uploaded_resumes/<user_id>/resume.txt.cache (JSON with the
+# normalized text, page count, extraction time and the SHA-256 of the source file). It is written
+# by a background task right after `save-resume`, so analysis no longer parses the PDF per request.
+
+import json
+import os
+from typing import Optional
+
+TEXT_CACHE_NAME = "resume.txt.cache"
+
+
+def text_cache_path(resume_path: str) -> str:
+    return os.path.join(os.path.dirname(resume_path), TEXT_CACHE_NAME)
+
+
+def read_text_cache(resume_path: str, file_hash: str) -> Optional[str]:
+    """Cached text for this resume, or None if missing, unreadable or built from another file."""
+    try:
+        with open(text_cache_path(resume_path), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[resume text cache] unreadable cache for {resume_path}: {e}")
+        return None
+    if entry.get("sha256") != file_hash:
+        return None
+    return entry.get("text")
+
+
+def write_text_cache(resume_path: str, entry: dict):
+    path = text_cache_path(resume_path)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[resume text cache] write failed for {path}: {e}")
+
+
+def clear_text_cache(user_dir: str):
+    path = os.path.join(user_dir, TEXT_CACHE_NAME)
+    if os.path.exists(path):
+        os.remove(path)
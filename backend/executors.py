@@ -0,0 +1,76 @@
+# Executors that keep blocking work off the event loop
+# - run_stage: CPU-heavy pipeline stages (model inference, graph building, CBC solves) on a small,
+#   bounded pool so a burst of plan requests can't starve the API workers.
+# - run_db: blocking SQLAlchemy calls on the regular threadpool.
+# Queue depth and per-stage latency are reported through metrics.py.
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.concurrency import run_in_threadpool
+
+import metrics
+
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "2"))
+
+_pipeline_executor = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="pipeline")
+_queue_lock = threading.Lock()
+_queued = 0
+_running = 0
+
+
+def _update_queue(queued_delta=0, running_delta=0):
+    global _queued, _running
+    with _queue_lock:
+        _queued += queued_delta
+        _running += running_delta
+        metrics.set_gauge("pipeline.queue_depth", _queued)
+        metrics.set_gauge("pipeline.running", _running)
+
+
+def pipeline_queue_depth() -> int:
+    return _queued
+
+
+async def run_stage(stage: str, fn, *args, **kwargs):
+    """Run a blocking pipeline stage on the bounded pipeline executor and await its result."""
+    enqueued_at = time.perf_counter()
+    state = {"started": False, "abandoned": False}
+    _update_queue(queued_delta=1)
+
+    def call():
+        with _queue_lock:
+            if state["abandoned"]:
+                return None
+            state["started"] = True
+        _update_queue(queued_delta=-1, running_delta=1)
+        metrics.observe(f"pipeline.wait.{stage}", time.perf_counter() - enqueued_at)
+        try:
+            with metrics.timed(f"pipeline.stage.{stage}"):
+                return fn(*args, **kwargs)
+        finally:
+            _update_queue(running_delta=-1)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_pipeline_executor, call)
+    finally:
+        # A stage cancelled while still queued must not run (or be counted) later
+        with _queue_lock:
+            abandon = not state["started"]
+            state["abandoned"] = abandon
+        if abandon:
+            _update_queue(queued_delta=-1)
+
+
+async def run_db(name: str, fn, *args, **kwargs):
+    """Run a blocking DB call on the threadpool, timed under `db.<name>`."""
+    def call():
+        with metrics.timed(f"db.{name}"):
+            return fn(*args, **kwargs)
+
+    return await run_in_threadpool(functools.partial(call))
@@ -0,0 +1,174 @@
+# In-process background job queue for the long-running generation pipelines
+# Note: Jobs live in this process only (asyncio queue + in-memory store), so nothing external is
+# needed. If you restart the backend, queued and finished jobs are lost.
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional
+
+from cachetools import LRUCache
+
+import metrics
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# A runner receives (user_id, params, report_stage) and returns the job result
+JobRunner = Callable[[int, dict, Callable[[str], None]], Awaitable[object]]
+
+_runners: Dict[str, JobRunner] = {}
+_jobs: Dict[str, dict] = {}         # job_id -> job dict, queued/running jobs (never evicted)
+_finished_jobs = LRUCache(maxsize=1000)  # job_id -> job dict, finished jobs (most recent kept)
+_active: Dict[tuple, str] = {}      # (kind, user_id) -> job_id of the queued/running job
+_lock = threading.Lock()
+_queue: Optional[asyncio.Queue] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_workers = []
+
+
+def register_job_kind(kind: str, runner: JobRunner):
+    _runners[kind] = runner
+
+
+def _public_view(job: dict, include_result=False) -> dict:
+    view = {k: v for k, v in job.items() if k not in ("result", "params")}
+    view["stages"] = [dict(s) for s in job["stages"]]
+    if include_result:
+        view["result"] = job["result"]
+    return view
+
+
+def _lookup(job_id: str) -> Optional[dict]:
+    """Job dict by id, queued/running or finished (call with _lock held)."""
+    job = _jobs.get(job_id)
+    return job if job is not None else _finished_jobs.get(job_id)
+
+
+def get_job(job_id: str, include_result=False) -> Optional[dict]:
+    with _lock:
+        job = _lookup(job_id)
+        return _public_view(job, include_result) if job else None
+
+
+def _enqueue(job_id: str):
+    _queue.put_nowait(job_id)
+    metrics.set_gauge("jobs.queue_depth", _queue.qsize())
+
+
+def submit_job(kind: str, user_id: int, params: Optional[dict] = None) -> dict:
+    """Queue a job. A queued/running job of the same kind for the same user is reused instead."""
+    if kind not in _runners:
+        raise KeyError(f"Unknown job kind: {kind}")
+    if _queue is None:
+        raise RuntimeError("Job workers are not running")
+
+    with _lock:
+        existing_id = _active.get((kind, user_id))
+        if existing_id and existing_id in _jobs:
+            metrics.incr(f"jobs.deduplicated.{kind}")
+            return {**_public_view(_jobs[existing_id]), "deduplicated": True}
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "user_id": user_id,
+            "params": params or {},
+            "status": QUEUED,
+            "stage": None,
+            "stages": [],
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "result": None,
+        }
+        _jobs[job["job_id"]] = job
+        _active[(kind, user_id)] = job["job_id"]
+
+    # asyncio.Queue is not thread-safe: from a threadpool thread, hand the put to the event loop
+    try:
+        in_loop = asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        in_loop = False
+    if in_loop:
+        _enqueue(job["job_id"])
+    else:
+        _loop.call_soon_threadsafe(_enqueue, job["job_id"])
+    metrics.incr(f"jobs.submitted.{kind}")
+    return {**_public_view(job), "deduplicated": False}
+
+
+def _report_stage(job: dict, stage: str):
+    """Close the current stage and open `stage` (safe to call from worker threads)."""
+    now = time.time()
+    with _lock:
+        if job["stages"] and job["stages"][-1]["finished_at"] is None:
+            current = job["stages"][-1]
+            current["finished_at"] = now
+            current["seconds"] = round(now - current["started_at"], 4)
+        job["stage"] = stage
+        job["stages"].append({"name": stage, "started_at": now, "finished_at": None, "seconds": None})
+
+
+def _finish(job: dict, status: str, result=None, error=None):
+    now = time.time()
+    with _lock:
+        if job["stages"] and job["stages"][-1]["finished_at"] is None:
+            current = job["stages"][-1]
+            current["finished_at"] = now
+            current["seconds"] = round(now - current["started_at"], 4)
+        job.update(status=status, result=result, error=error, finished_at=now, stage=None)
+        if _active.get((job["kind"], job["user_id"])) == job["job_id"]:
+            del _active[(job["kind"], job["user_id"])]
+        # Only finished jobs are subject to eviction
+        _jobs.pop(job["job_id"], None)
+        _finished_jobs[job["job_id"]] = job
+
+
+async def _worker():
+    while True:
+        job_id = await _queue.get()
+        metrics.set_gauge("jobs.queue_depth", _queue.qsize())
+        with _lock:
+            job = _jobs.get(job_id)
+        if job is None:
+            _queue.task_done()
+            continue
+
+        with _lock:
+            job.update(status=RUNNING, started_at=time.time())
+        try:
+            with metrics.timed(f"jobs.run.{job['kind']}"):
+                result = await _runners[job["kind"]](job["user_id"], job["params"], lambda s: _report_stage(job, s))
+            _finish(job, SUCCEEDED, result=result)
+        except Exception as e:
+            print(f"🔥 Job {job_id} ({job['kind']}) failed: {e}")
+            _finish(job, FAILED, error=getattr(e, "detail", None) or str(e))
+        finally:
+            _queue.task_done()
+
+
+def start_job_workers(count: int = JOB_WORKERS):
+    """Create the queue and worker tasks; call from the app lifespan (inside the event loop)."""
+    global _queue, _loop
+    _loop = asyncio.get_running_loop()
+    _queue = asyncio.Queue()
+    for _ in range(max(count, 1)):
+        _workers.append(asyncio.create_task(_worker()))
+
+
+async def stop_job_workers():
+    global _queue, _loop
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
+    _loop = None
@@ -1,13 +1,38 @@
+import asyncio
+import os
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from database import engine, Base
+from resources import resource_status, warm_up, WARM
+from metrics import metrics_snapshot
+from jobs import start_job_workers, stop_job_workers
 from routers import user_login, user_goal, learn_skill, scheduled_tasks, generate_task, generate_skills, map, user_logout  # ✅ Ensure correct imports
+from routers import jobs as jobs_router  # not `jobs`: that is the top-level job queue module
 
 
-app = FastAPI()
+# Set WARMUP_ON_STARTUP=false to load models/datasets only on first use
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
 
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Table creation is blocking DB I/O: keep it off the event loop
+    await asyncio.to_thread(Base.metadata.create_all, bind=engine)
+
+    # ✅ Warm heavy resources in the background so the API starts serving right away.
+    # A daemon thread, not the loop's executor: shutdown neither waits for nor can cancel a model load.
+    if WARMUP_ON_STARTUP:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    start_job_workers()
+    yield
+    await stop_job_workers()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.mount("/resumes", StaticFiles(directory="./data/uploaded_resumes"), name="resumes")
 
@@ -18,6 +43,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],  # per-stage timings of generate-learn-skills
 )
 
 # ✅ Include Routers (Matches `api.ts` structure)
@@ -29,8 +55,21 @@ app.include_router(generate_task.router, prefix="/generate-scheduled-tasks")
 app.include_router(generate_skills.router, prefix="/generate-learn-skills")
 app.include_router(map.router, prefix="/map")
 app.include_router(user_logout.router, prefix="/user-logout")
+app.include_router(jobs_router.router, prefix="/jobs")  # Background generation jobs (submit + poll)
 
 # ✅ Root Endpoint (Optional)
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the API!"}
+
+# ✅ Readiness: reports which heavy resources are warm (503 until all are)
+@app.get("/ready")
+def read_ready():
+    resources = resource_status()
+    ready = all(r["state"] == WARM for r in resources.values())
+    return JSONResponse(status_code=200 if ready else 503, content={"ready": ready, "resources": resources})
+
+# ✅ In-process metrics: per-stage latency histograms, pipeline queue depth
+@app.get("/metrics")
+def read_metrics():
+    return metrics_snapshot()
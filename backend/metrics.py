@@ -0,0 +1,73 @@
+# In-process metrics (latency histograms, counters, gauges)
+# Note: This is per-process, like the caches. If you restart the backend or scale across servers, it resets.
+# Exposed as JSON by the `/metrics` endpoint in main.py.
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_lock = threading.Lock()
+_timings: Dict[str, dict] = {}
+_counters: Dict[str, float] = {}
+_gauges: Dict[str, float] = {}
+
+
+def observe(name: str, seconds: float):
+    """Record one latency sample under `name`."""
+    with _lock:
+        t = _timings.get(name)
+        if t is None:
+            t = _timings[name] = {
+                "count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "last_seconds": 0.0,
+                "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+            }
+        t["count"] += 1
+        t["total_seconds"] += seconds
+        t["max_seconds"] = max(t["max_seconds"], seconds)
+        t["last_seconds"] = seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                t["buckets"][i] += 1
+                break
+        else:
+            t["buckets"][-1] += 1
+
+
+@contextmanager
+def timed(name: str):
+    """Time the enclosed block and record it under `name` (also on error)."""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start_time)
+
+
+def incr(name: str, amount: float = 1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def set_gauge(name: str, value: float):
+    with _lock:
+        _gauges[name] = value
+
+
+def metrics_snapshot() -> dict:
+    """JSON-friendly copy of every metric."""
+    with _lock:
+        timings = {}
+        for name, t in _timings.items():
+            labels = [f"le_{b}" for b in LATENCY_BUCKETS] + ["le_inf"]
+            timings[name] = {
+                "count": t["count"],
+                "avg_seconds": round(t["total_seconds"] / t["count"], 4) if t["count"] else 0.0,
+                "max_seconds": round(t["max_seconds"], 4),
+                "last_seconds": round(t["last_seconds"], 4),
+                "histogram": dict(zip(labels, t["buckets"])),
+            }
+        return {"timings": timings, "counters": dict(_counters), "gauges": dict(_gauges)}
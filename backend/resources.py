@@ -0,0 +1,113 @@
+# Lazily-initialized heavy resources (models, datasets, heavy libraries)
+# Note: Nothing here is loaded at import time. A resource is built on first `get_resource()`
+# call, or ahead of time by `warm_up()` which main.py runs in the background on startup.
+
+import csv
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+COLD = "cold"
+LOADING = "loading"
+WARM = "warm"
+FAILED = "failed"
+
+JOB_MAP_PATH = "data/job_map.csv"
+
+_loaders: Dict[str, Callable] = {}
+_instances: Dict[str, object] = {}
+_status: Dict[str, dict] = {}
+_locks: Dict[str, threading.Lock] = {}
+
+
+def register_resource(name: str, loader: Callable):
+    """Register a zero-argument loader under `name` (loaded lazily)."""
+    _loaders[name] = loader
+    _locks.setdefault(name, threading.Lock())
+    _status.setdefault(name, {"state": COLD, "load_seconds": None, "error": None})
+
+
+def get_resource(name: str):
+    """Return the resource, loading it on first use. Concurrent callers wait for one load."""
+    if name in _instances:
+        return _instances[name]
+    if name not in _loaders:
+        raise KeyError(f"Unknown resource: {name}")
+
+    with _locks[name]:
+        if name in _instances:
+            return _instances[name]
+        _status[name].update(state=LOADING, error=None)
+        start_time = time.perf_counter()
+        try:
+            instance = _loaders[name]()
+        except Exception as e:
+            _status[name].update(state=FAILED, error=str(e))
+            raise
+        _instances[name] = instance
+        _status[name].update(state=WARM, load_seconds=round(time.perf_counter() - start_time, 4))
+        return instance
+
+
+def is_warm(name: str) -> bool:
+    return name in _instances
+
+
+def resource_status() -> Dict[str, dict]:
+    """Snapshot of every registered resource and whether it is warm."""
+    return {name: dict(status) for name, status in _status.items()}
+
+
+def warm_up(names: Optional[Iterable[str]] = None):
+    """Load the given resources (default: all registered). Failures are logged, not raised."""
+    for name in list(names or _loaders):
+        try:
+            get_resource(name)
+            print(f"[warm-up] {name} ready in {_status[name]['load_seconds']}s")
+        except Exception as e:
+            print(f"[warm-up] {name} failed: {e}")
+
+
+# === LOADERS ===
+def _load_libraries():
+    # Importing these once keeps the first scheduling request from paying for them.
+    import pandas, sklearn.preprocessing, pulp  # noqa: F401
+    return True
+
+
+def _load_minilm():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
+
+
+def _load_mpnet():
+    from sentence_transformers import SentenceTransformer
+    logging.getLogger('sentence_transformers').setLevel(logging.WARNING)
+    return SentenceTransformer('all-mpnet-base-v2')
+
+
+def _load_job_map():
+    jobs = []
+    with open(JOB_MAP_PATH, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for r in reader:
+            if not r["CITY_LATITUDE"] or not r["STATE_LATITUDE"]:
+                continue
+            jobs.append({
+                "CITY":      r["CITY"],
+                "STATE":     r["STATE"],
+                "SALARY":    float(r["SALARY"]),
+                "TITLE_EMB": [float(x) for x in r["TITLE_EMB"].split(",")],
+                "CITY_LAT":  float(r["CITY_LATITUDE"]),
+                "CITY_LNG":  float(r["CITY_LONGITUDE"]),
+                "STATE_LAT": float(r["STATE_LATITUDE"]),
+                "STATE_LNG": float(r["STATE_LONGITUDE"]),
+            })
+    return jobs
+
+
+register_resource("libraries", _load_libraries)
+register_resource("minilm_model", _load_minilm)
+register_resource("mpnet_model", _load_mpnet)
+register_resource("job_map", _load_job_map)
@@ -1,10 +1,13 @@
 import time
 import traceback
-from fastapi import APIRouter, HTTPException, Depends
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Response
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from database import get_db
 from models import User_Goal, Learn_Skill
+from caches.learn_skill_cache import clear_learn_skill_cache
 import requests
 from dotenv import load_dotenv
 import os
@@ -12,7 +15,10 @@ import os
 # Helpers
 from utils.skill_extractor_helper.calculate_skill_importance import calculate_skill_importance
 from utils.skill_extractor_helper.goal_skill_extractor import extractGoalSkills
-from utils.skill_extractor_helper.resume_skill_extractor import analyze_resume_file
+from utils.skill_extractor_helper.resume_skill_extractor import read_resume, load_resume_text, lookup_resume_analysis, score_resume_text
+from utils.skill_extractor_helper.bulk_resume_analyzer import analyze_resumes_bulk
+from utils.skill_extractor_helper.skill_alignment import get_skill_aligner
+from caches.resume_analysis_cache import cache_resume_analysis
 
 router = APIRouter(tags=["Generate Skills"])
 
@@ -24,10 +30,45 @@ SPACE_URL = os.getenv("SPACE_URL")
 GEMINI_KEY = os.getenv("GEMINI_API_KEY")
 UPLOAD_DIR = "data/uploaded_resumes"
 ALLOWED_EXTENSIONS = [".pdf", ".docx", ".txt"]
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", "8"))
+
+# Resume text extraction doesn't depend on the job skills, so it runs here while the calling
+# thread does goal extraction + importance scoring
+_fanout_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SKILLS_FANOUT_WORKERS", "4")), thread_name_prefix="skills-fanout"
+)
 
 class GenerateSkillsRequest(BaseModel):
     user_id: int
 
+class BulkGenerateSkillsRequest(BaseModel):
+    user_ids: List[int]
+
+def find_resume(user_id):
+    """Return (resume_path, file_type) of the user's uploaded resume, or (None, None)."""
+    user_dir = os.path.join(UPLOAD_DIR, str(user_id))
+    resume_path = None
+    file_type = None
+    for ext in ALLOWED_EXTENSIONS:
+        path = os.path.join(user_dir, f"resume{ext}")
+        if os.path.exists(path):
+            resume_path = path
+            file_type = ext[1:]
+    return resume_path, file_type
+
+def match_resume_scores(job_skill_scores, resume_output):
+    """Resume confidence for each job skill, in job skill order (0 when not found)."""
+    alignment = get_skill_aligner().align(job_skill_scores, resume_output)
+    if alignment.unmatched_job:
+        print(f"Job skills not found in resume analysis: {alignment.unmatched_job}")
+    if alignment.unmatched_resume:
+        print(f"Resume skills matching no job skill: {alignment.unmatched_resume}")
+    return alignment.scores
+
+def server_timing_header(timings):
+    """Server-Timing header value (durations in ms) from {stage: seconds}"""
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
 def calculateFocus(job_skill_scores, resume_skill_scores):
     if len(job_skill_scores) != len(resume_skill_scores):
         raise IndexError(
@@ -35,118 +76,217 @@ def calculateFocus(job_skill_scores, resume_skill_scores):
             f"{len(job_skill_scores)} vs {len(resume_skill_scores)}"
         )
 
-    # --- Step 0: Shift job scores so max → 100 ---
-    max_job = max(score for _, score in job_skill_scores)
-    shift = 100 - max_job if max_job < 100 else 0
-    shifted_job = [[skill, score + shift] for skill, score in job_skill_scores]
+    # Shift job scores so max → 100, normalize both to [0, 1], keep skills where resume < job,
+    # then focus = gap share and confidence = resume share (see utils/skill_gap.py)
+    from utils.skill_gap import skill_gaps  # numpy: imported on first use, not with the router
+    return skill_gaps(
+        [skill for skill, _ in job_skill_scores],
+        [score for _, score in job_skill_scores],
+        [score for _, score in resume_skill_scores],
+    )
 
-    # Step 1: Normalize job and resume scores to [0, 1]
-    normalized_job = [[s[0], s[1] / 100.0] for s in shifted_job]
-    normalized_resume = [[s[0], s[1] / 100.0] for s in resume_skill_scores]
 
-    # Step 2: Compute gaps (only where resume < job)
-    gaps = []
-    for i in range(len(normalized_job)):
-        skill_name  = normalized_job[i][0]
-        job_score   = normalized_job[i][1]
-        resume_score= normalized_resume[i][1]
+def _read_resume_text(resume_path, file_type):
+    """(sha256 of the resume file, resume text from the upload-time text cache or extraction)"""
+    file_bytes, file_hash = read_resume(resume_path)
+    return file_hash, load_resume_text(resume_path, file_type, file_bytes, file_hash)
 
-        if resume_score < job_score:
-            gap = job_score - resume_score
-            gaps.append([skill_name, gap, resume_score])
 
-    if not gaps:
-        return []
+def run_generate_skills(user_id: int, db: Session, report_stage=None, timings=None):
+    """
+    Full skill pipeline for one user; `report_stage(name)` is called as each stage starts and
+    `timings` (if given) is filled with {stage: seconds}.
 
-    # Step 3: Normalize gaps → focus_scores
-    total_gap = sum(g[1] for g in gaps)
-    for g in gaps:
-        g[1] = round(g[1] / total_gap, 2)
+    load_goal ─┬─ goal_skills → skill_importance ─┬─ resume_analysis → focus_scores → save_skills
+               └─ resume_text ─────────────────────┘
+    resume_text runs speculatively: when the analysis is cached for this file + skill list, the
+    extracted text is simply not used (and the LLM is not called).
+    """
+    report_stage = report_stage or (lambda stage: None)
+    timings = timings if timings is not None else {}
 
-    # Step 4: Normalize resume confidence scores
-    total_conf = sum(g[2] for g in gaps)
-    for g in gaps:
-        g[2] = round(g[2] / total_conf, 2) if total_conf > 0 else 0.0
+    def timed_stage(stage, fn, *args):
+        start_time = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            timings[stage] = time.perf_counter() - start_time
 
-    return gaps
+    # 1. Load user goal
+    report_stage("load_goal")
+    goal = timed_stage("load_goal", lambda: db.query(User_Goal).filter(User_Goal.user_id == user_id).first())
+    if not goal:
+        raise HTTPException(status_code=404, detail="User goal not found")
+    target_position = goal.target_position
+    responsibility = goal.responsibility
+    industry = goal.industry
+    seniority_level = goal.exp_level
 
+    resume_path, file_type = find_resume(user_id)
+    if not (resume_path and file_type):
+        raise FileNotFoundError(f"Resume file not found for user: {user_id}")
 
-@router.post("/")
-def generate_skills(req: GenerateSkillsRequest, db: Session = Depends(get_db)):
+    # 2. Fan out: resume text in the background, job skills on this thread
+    report_stage("goal_skills")
+    resume_future = _fanout_executor.submit(timed_stage, "resume_text", _read_resume_text, resume_path, file_type)
+
+    print("------------------------------job skill extract begin------------------")
+    start_time = time.time()
+    print(f"target_position: {target_position}\n seniority_level: {seniority_level}\n industry(as part of responsibility): {industry}\n responsibility: {responsibility}")
     try:
-        # 1. Load user goal
-        goal = db.query(User_Goal).filter(User_Goal.user_id == req.user_id).first()
-        if not goal:
-            raise HTTPException(status_code=404, detail="User goal not found")
-        target_position = goal.target_position
-        responsibility = goal.responsibility
-        industry = goal.industry
-        seniority_level = goal.exp_level
-
-        print("------------------------------job skill extract begin------------------")
-        start_time = time.time()
-        print(f"target_position: {target_position}\n seniority_level: {seniority_level}\n industry(as part of responsibility): {industry}\n responsibility: {responsibility}")
-        job_skills = extractGoalSkills(SPACE_URL, target_position, seniority_level, industry, responsibility)
+        job_skills = timed_stage("goal_skills", extractGoalSkills, SPACE_URL, target_position, seniority_level, industry, responsibility)
         # print(f"llm output: {job_skills}")
-        job_skill_scores = calculate_skill_importance(job_skills, target_position, seniority_level)
-        print(f"job skill scores: {job_skill_scores}")
-        
-        end_time = time.time()
-        print(f"Execution time: {end_time - start_time:.4f} seconds")
-        print("------------------------------job skill extract finished---------------------")
-
-        user_dir = os.path.join(UPLOAD_DIR, str(req.user_id))
-        resume_path = None
-        file_type = None
-        for ext in ALLOWED_EXTENSIONS:
-            path = os.path.join(user_dir, f"resume{ext}")
-            if os.path.exists(path):
-                resume_path = path
-                file_type = ext[1:]
-        
-        job_skill_list = [tuple[0] for tuple in job_skill_scores]
-        
-        if os.path.exists(resume_path) and file_type:
-            print("------------------------------resume skill extract begin---------------------------")
-            start_time = time.time()
-
-            resume_output = analyze_resume_file(resume_path, file_type, job_skill_list, GEMINI_KEY)
-            
-            end_time = time.time()
-            print(f"Execution time: {end_time - start_time:.4f} seconds")
-            print("------------------------------resume skill extract finished---------------------------")
-        else:
-            raise FileNotFoundError(f"Resume file not found for user: {req.user_id}")
-        
-        resume_skill_scores = []
-        for (skill_name, importance) in job_skill_scores:
-            found = False
-            for (name, confidence) in resume_output:
-                if skill_name == name:
-                    resume_skill_scores.append((skill_name, confidence))
-                    found = True
-                    break
-            if not found:
-                resume_skill_scores.append((skill_name, 0))
-        print(resume_skill_scores,"---------------------")
-        normalized_skills = calculateFocus(job_skill_scores, resume_skill_scores)
-
-        db.query(Learn_Skill).filter(Learn_Skill.user_id == req.user_id).delete()
+        report_stage("skill_importance")
+        job_skill_scores = timed_stage("skill_importance", calculate_skill_importance, job_skills, target_position, seniority_level)
+    except Exception:
+        resume_future.cancel()
+        raise
+    print(f"job skill scores: {job_skill_scores}")
+
+    end_time = time.time()
+    print(f"Execution time: {end_time - start_time:.4f} seconds")
+    print("------------------------------job skill extract finished---------------------")
+
+    job_skill_list = [tuple[0] for tuple in job_skill_scores]
+
+    # 3. Join, then score the resume against the job skills
+    print("------------------------------resume skill extract begin---------------------------")
+    report_stage("resume_analysis")
+    start_time = time.time()
 
+    file_hash, resume_text = resume_future.result()
+    cache_key, resume_output = lookup_resume_analysis(user_id, file_hash, job_skill_list)
+    if resume_output is None:
+        resume_output = timed_stage("resume_analysis", score_resume_text, resume_text, job_skill_list, GEMINI_KEY, user_id, cache_key)
+
+    end_time = time.time()
+    print(f"Execution time: {end_time - start_time:.4f} seconds")
+    print("------------------------------resume skill extract finished---------------------------")
+
+    report_stage("focus_scores")
+    resume_skill_scores = match_resume_scores(job_skill_scores, resume_output)
+    print(resume_skill_scores,"---------------------")
+    normalized_skills = calculateFocus(job_skill_scores, resume_skill_scores)
+
+    report_stage("save_skills")
+    start_time = time.perf_counter()
+    db.query(Learn_Skill).filter(Learn_Skill.user_id == user_id).delete()
+
+    for skill in normalized_skills:
+        db.add(Learn_Skill(
+            user_id=user_id,
+            skill_name=skill[0],
+            focus_score=skill[1],
+            confidence_score=skill[2]
+        ))
+
+    db.commit()
+    timings["save_skills"] = time.perf_counter() - start_time
+    clear_learn_skill_cache(user_id)
+
+    return {"message": f"Generated {len(normalized_skills)} skills for user {user_id}", "skills": normalized_skills}
+
+
+@router.post("/")
+def generate_skills(req: GenerateSkillsRequest, response: Response, db: Session = Depends(get_db)):
+    timings = {}
+    try:
+        result = run_generate_skills(req.user_id, db, timings=timings)
+        response.headers["Server-Timing"] = server_timing_header(timings)
+        return result
+
+    except Exception as e:
+        db.rollback()
+        print("🔥 Exception occurred:", e)
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _prepare_bulk_user(goal):
+    """Job skill scores + a cached analysis (or, on a miss, the resume text) for one user of a bulk run."""
+    job_skills = extractGoalSkills(SPACE_URL, goal.target_position, goal.exp_level, goal.industry, goal.responsibility)
+    job_skill_scores = calculate_skill_importance(job_skills, goal.target_position, goal.exp_level)
+    job_skill_list = [skill for skill, _ in job_skill_scores]
+
+    resume_path, file_type = find_resume(goal.user_id)
+    if not resume_path:
+        raise FileNotFoundError(f"Resume file not found for user: {goal.user_id}")
+    file_bytes, file_hash = read_resume(resume_path)
+    cache_key, cached = lookup_resume_analysis(goal.user_id, file_hash, job_skill_list)
+    text = None if cached is not None else load_resume_text(resume_path, file_type, file_bytes, file_hash)
+    return {
+        "job_skill_scores": job_skill_scores,
+        "job_skill_list": job_skill_list,
+        "cache_key": cache_key,
+        "resume_output": cached,
+        "text": text,
+    }
+
+
+def run_bulk_generate_skills(user_ids: List[int], db: Session, workers: int = BULK_WORKERS):
+    """
+    Generate learn skills for a whole cohort: job skills and resume texts are prepared in parallel,
+    resumes are scored in packed, rate-limited Gemini batches, and Learn_Skill is written in one commit.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    goals = db.query(User_Goal).filter(User_Goal.user_id.in_(user_ids)).all()
+    failed = {uid: "User goal not found" for uid in set(user_ids) - {g.user_id for g in goals}}
+
+    # 1. Job skills + analysis cache lookup (resume text extraction on a miss), in parallel
+    prepared = {}
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = {goal.user_id: pool.submit(_prepare_bulk_user, goal) for goal in goals}
+        for uid, future in futures.items():
+            try:
+                prepared[uid] = future.result()
+            except Exception as e:
+                failed[uid] = str(e)
+
+    # 2. Batched resume scoring for everything not already cached
+    items = [
+        {"id": uid, "skills": p["job_skill_list"], "text": p["text"]}
+        for uid, p in prepared.items() if p["resume_output"] is None and p["text"]
+    ]
+    analyses = analyze_resumes_bulk(items, GEMINI_KEY) if items else {}
+    for uid, resume_output in analyses.items():
+        prepared[uid]["resume_output"] = resume_output
+        if resume_output:
+            cache_resume_analysis(uid, prepared[uid]["cache_key"], resume_output)
+
+    # 3. Focus scores + one bulk write
+    rows = []
+    done = []
+    for uid, p in prepared.items():
+        if p["resume_output"] is None:
+            failed[uid] = "Resume could not be analyzed"
+            continue
+        try:
+            resume_skill_scores = match_resume_scores(p["job_skill_scores"], p["resume_output"])
+            normalized_skills = calculateFocus(p["job_skill_scores"], resume_skill_scores)
+        except Exception as e:
+            failed[uid] = str(e) or type(e).__name__
+            continue
         for skill in normalized_skills:
-            db.add(Learn_Skill(
-                user_id=req.user_id,
-                skill_name=skill[0],
-                focus_score=skill[1],
-                confidence_score=skill[2]
-            ))
+            rows.append(Learn_Skill(user_id=uid, skill_name=skill[0], focus_score=skill[1], confidence_score=skill[2]))
+        done.append(uid)
 
+    if done:
+        db.query(Learn_Skill).filter(Learn_Skill.user_id.in_(done)).delete(synchronize_session=False)
+        db.add_all(rows)
         db.commit()
-        
-        return {"message": f"Generated {len(normalized_skills)} skills for user {req.user_id}", "skills": normalized_skills}
+        for uid in done:
+            clear_learn_skill_cache(uid)
+
+    return {"message": f"Generated skills for {len(done)} of {len(user_ids)} users", "succeeded": done, "failed": failed}
+
+
+@router.post("/bulk/")
+def generate_skills_bulk(req: BulkGenerateSkillsRequest, db: Session = Depends(get_db)):
+    try:
+        return run_bulk_generate_skills(req.user_ids, db)
 
     except Exception as e:
         db.rollback()
         print("🔥 Exception occurred:", e)
         traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -2,98 +2,168 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, timedelta
-import pandas as pd
 import json
 import os
 from sqlalchemy.orm import Session
 from fastapi import Depends
 from database import get_db
 from models import Scheduled_Tasks, Learn_Skill, User_Goal
+from executors import run_db, run_stage
+from caches.scheduled_tasks_cache import clear_task_cache
 
-# Adjust imports according to your helper path
-from utils.skill_extractor_helper.match_job_domain import matchJobDomain
-from utils.schedule_generator_helper.embedding_model import embedding_model
-from utils.schedule_generator_helper.module_generator import build_prereq_graph_from_edges, parse_prerequisite_edges, generate_modules
-from utils.schedule_generator_helper.course_selection import suggest_courses
-from utils.schedule_generator_helper.task_generator import schedule_all_modules
+# Heavy helpers (pandas, pulp, sklearn) are imported inside the stage functions
+# so importing this router stays fast
+from utils.schedule_generator_helper.embedding_model import get_embedding_model
 
 router = APIRouter(tags=["Generate Tasks"])
 
 COURSE_DIR = "data/courses/"
 DOMAIN_SKILL_DIR = "data/job_domain_skills.json"
 SKILL_GRAPH_DIR = "data/skill_graph"
+# "per_skill": one course selection per skill; "global": one selection across all skills, so a
+# course listed under several skills is picked and scheduled once (see suggest_courses_global)
+COURSE_SELECTION_MODE = os.getenv("COURSE_SELECTION_MODE", "per_skill").lower()
 
 class GenerateScheduleRequest(BaseModel):
     user_id: int
     start_date: Optional[str] = None  # format: YYYY-MM-DD
 
+def load_schedule_inputs(db: Session, user_id: int):
+    """Read the user's goal and learn skills (blocking DB access)."""
+    goal = db.query(User_Goal).filter(User_Goal.user_id == user_id).first()
+    if not goal:
+        raise HTTPException(status_code=404, detail="User goal not found")
+
+    skills = db.query(Learn_Skill).filter(Learn_Skill.user_id == user_id).all()
+    if not skills:
+        raise HTTPException(status_code=404, detail="User skills not found")
+    skill_list = [[s.skill_name, s.focus_score, s.confidence_score] for s in skills]
+
+    learning_days = {
+        "Monday": goal.isMonday,
+        "Tuesday": goal.isTuesday,
+        "Wednesday": goal.isWednesday,
+        "Thursday": goal.isThursday,
+        "Friday": goal.isFriday,
+        "Saturday": goal.isSaturday,
+        "Sunday": goal.isSunday,
+    }
+    return goal.target_position, goal.duration_weeks, goal.weekly_hours, skill_list, learning_days
+
+
+def save_scheduled_tasks(db: Session, tasks):
+    """Insert the generated tasks (blocking DB access)."""
+    for task in tasks:
+        db_task = Scheduled_Tasks(
+            user_id=task["user_id"],
+            module=task["module"],
+            skill=task["skill"],
+            date=task["date"],
+            resource_name=task["resource_name"],
+            resource_url=task["resource_url"],
+            thumbnail_url=task['thumbnail_url'],
+            start=task["start"],
+            end=task["end"],
+            status=task["status"]
+        )
+        db.add(db_task)
+
+    db.commit()
+
+
+def load_course_catalog(domain):
+    from utils.schedule_generator_helper.course_catalog import load_course_catalog as load_catalog
+
+    # Cached per domain together with the per-course skill tags used by match scoring
+    return load_catalog(os.path.join(COURSE_DIR, f"{domain}.csv"), os.path.join(SKILL_GRAPH_DIR, f"{domain}.json"))
+
+
+def build_modules_and_prereqs(skill_graph_path, domain, skill_list, total_weeks, weekly_hours):
+    from utils.schedule_generator_helper.module_generator import build_prereq_graph_from_edges, parse_prerequisite_edges, generate_modules
+
+    prereq_graph = build_prereq_graph_from_edges(parse_prerequisite_edges(skill_graph_path, skill_list))
+    modules = generate_modules(skill_graph_path, domain, skill_list, total_weeks, weekly_hours, 0.4, 0.7)
+    return modules, prereq_graph
+
+
+def select_courses(catalog, skill_list, total_weeks, weekly_hours, domain, modules, prereq_graph):
+    from utils.schedule_generator_helper.course_selection import suggest_courses, suggest_courses_global
+
+    suggest = suggest_courses_global if COURSE_SELECTION_MODE == "global" else suggest_courses
+    return suggest(get_embedding_model(), catalog.courses, skill_list, total_weeks, weekly_hours,
+                   domain, modules, prereq_graph, portion=1, catalog=catalog)
+
+
+def schedule_tasks(modules, start_date, weekly_hours, learning_days, courses, user_id):
+    from utils.schedule_generator_helper.task_generator import schedule_all_modules
+
+    return schedule_all_modules(modules, start_date, weekly_hours, learning_days, courses, user_id)
+
+
+def match_domain(target_position):
+    from utils.skill_extractor_helper.match_job_domain import matchJobDomain
+
+    return matchJobDomain(target_position).lower()
+
+
+async def build_schedule(user_id: int, start_date_str: Optional[str], db: Session, report_stage=None):
+    """Full schedule pipeline for one user; `report_stage(name)` is called as each stage starts."""
+    report_stage = report_stage or (lambda stage: None)
+
+    report_stage("load_inputs")
+    target_position, total_weeks, weekly_hours, skill_list, learning_days = await run_db(
+        "load_schedule_inputs", load_schedule_inputs, db, user_id
+    )
+
+    # Parse start date or use tomorrow
+    start_date = (
+        datetime.strptime(start_date_str, "%Y-%m-%d")
+        if start_date_str
+        else datetime.today() + timedelta(days=1)
+    )
+
+    report_stage("domain_match")
+    domain = await run_stage("domain_match", match_domain, target_position)
+    print(f"matched domain: {domain}")
+
+    # Load course dataset
+    report_stage("load_courses")
+    catalog = await run_stage("load_courses", load_course_catalog, domain)
+
+    # Load skill graph for the given domain
+    skill_graph_path = os.path.join(SKILL_GRAPH_DIR, f"{domain}.json")
+    if not os.path.exists(skill_graph_path):
+        raise FileNotFoundError(f"Skill graph not found for domain: {domain}")
+
+    report_stage("module_generation")
+    modules, prereq_graph = await run_stage(
+        "module_generation", build_modules_and_prereqs,
+        skill_graph_path, domain, skill_list, total_weeks, weekly_hours
+    )
+    report_stage("course_selection")
+    courses = await run_stage(
+        "course_selection", select_courses,
+        catalog, skill_list, total_weeks, weekly_hours, domain, modules, prereq_graph
+    )
+    report_stage("scheduling")
+    tasks = await run_stage(
+        "scheduling", schedule_tasks,
+        modules, start_date, weekly_hours, learning_days, courses, user_id
+    )
+    # Insert into DB
+    report_stage("save_tasks")
+    await run_db("save_scheduled_tasks", save_scheduled_tasks, db, tasks)
+    clear_task_cache(user_id)
+
+    return {"message": f"Scheduled {len(tasks)} tasks for user {user_id}", "tasks": tasks, "modules": modules, "courses": courses}
+
+
 @router.post("/")
 async def generate_scheduled_tasks(req: GenerateScheduleRequest, db: Session = Depends(get_db)):
+    # Blocking work runs off the event loop: DB calls on the threadpool, the CPU-heavy stages
+    # (domain match, modules, course selection, scheduling) on the bounded pipeline executor.
     try:
-        goal = db.query(User_Goal).filter(User_Goal.user_id == req.user_id).first()
-        if not goal:
-            raise HTTPException(status_code=404, detail="User goal not found")
-        target_position = goal.target_position
-        total_weeks = goal.duration_weeks
-        weekly_hours = goal.weekly_hours
-
-        skills = db.query(Learn_Skill).filter(Learn_Skill.user_id == req.user_id).all()
-        if not skills:
-            raise HTTPException(status_code=404, detail="User skills not found")
-        skill_list = [[s.skill_name, s.focus_score, s.confidence_score] for s in skills]
-
-        learning_days = {
-            "Monday": goal.isMonday,
-            "Tuesday": goal.isTuesday,
-            "Wednesday": goal.isWednesday,
-            "Thursday": goal.isThursday,
-            "Friday": goal.isFriday,
-            "Saturday": goal.isSaturday,
-            "Sunday": goal.isSunday,
-        }
-
-        # Parse start date or use tomorrow
-        start_date = (
-            datetime.strptime(req.start_date, "%Y-%m-%d")
-            if req.start_date
-            else datetime.today() + timedelta(days=1)
-        )
-
-        domain = matchJobDomain(target_position).lower()
-        print(f"matched domain: {domain}")
-
-        # Load course dataset
-        course_df = pd.read_csv(f"{COURSE_DIR}/{domain}.csv")
-        
-        # Load skill graph for the given domain
-        skill_graph_path = os.path.join(SKILL_GRAPH_DIR, f"{domain}.json")
-        if not os.path.exists(skill_graph_path):
-            raise FileNotFoundError(f"Skill graph not found for domain: {domain}")
-
-        prereq_graph = build_prereq_graph_from_edges(parse_prerequisite_edges(skill_graph_path, skill_list))
-        modules = generate_modules(skill_graph_path, domain, skill_list, total_weeks, weekly_hours, 0.4, 0.7)
-        courses = suggest_courses(embedding_model, course_df, skill_list, total_weeks, weekly_hours,
-                                  domain, modules, prereq_graph, portion=1)        
-        tasks = schedule_all_modules(modules, start_date, weekly_hours, learning_days, courses, req.user_id)
-        # Insert into DB
-        for task in tasks:
-            db_task = Scheduled_Tasks(
-                user_id=task["user_id"],
-                module=task["module"],
-                skill=task["skill"],
-                date=task["date"],
-                resource_name=task["resource_name"],
-                resource_url=task["resource_url"],
-                thumbnail_url=task['thumbnail_url'],
-                start=task["start"],
-                end=task["end"],
-                status=task["status"]
-            )            
-            db.add(db_task)
-
-        db.commit()
-
-        return {"message": f"Scheduled {len(tasks)} tasks for user {req.user_id}", "tasks": tasks, "modules": modules, "courses": courses}
+        return await build_schedule(req.user_id, req.start_date, db)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
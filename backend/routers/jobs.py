@@ -0,0 +1,83 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from database import SessionLocal
+from jobs import register_job_kind, submit_job, get_job, SUCCEEDED, FAILED
+from routers.generate_skills import run_generate_skills
+from routers.generate_task import build_schedule
+
+router = APIRouter(tags=["Background Jobs"])
+
+SKILLS_JOB = "generate-learn-skills"
+SCHEDULE_JOB = "generate-scheduled-tasks"
+
+
+class SkillsJobRequest(BaseModel):
+    user_id: int
+
+class ScheduleJobRequest(BaseModel):
+    user_id: int
+    start_date: Optional[str] = None  # format: YYYY-MM-DD
+
+
+# === JOB RUNNERS (each job gets its own DB session) ===
+async def _run_skills_job(user_id: int, params: dict, report_stage):
+    def run():
+        db = SessionLocal()
+        try:
+            return run_generate_skills(user_id, db, report_stage)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    return await run_in_threadpool(run)
+
+
+async def _run_schedule_job(user_id: int, params: dict, report_stage):
+    db = SessionLocal()
+    try:
+        return await build_schedule(user_id, params.get("start_date"), db, report_stage)
+    finally:
+        await run_in_threadpool(db.close)
+
+
+register_job_kind(SKILLS_JOB, _run_skills_job)
+register_job_kind(SCHEDULE_JOB, _run_schedule_job)
+
+
+# === SUBMIT ===
+@router.post("/generate-learn-skills/", status_code=202)
+async def submit_skills_job(req: SkillsJobRequest):
+    return submit_job(SKILLS_JOB, req.user_id)
+
+
+@router.post("/generate-scheduled-tasks/", status_code=202)
+async def submit_schedule_job(req: ScheduleJobRequest):
+    return submit_job(SCHEDULE_JOB, req.user_id, {"start_date": req.start_date})
+
+
+# === STATUS / RESULT ===
+@router.get("/{job_id}/")
+def get_job_status(job_id: str):
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/result/")
+def get_job_result(job_id: str):
+    job = get_job(job_id, include_result=True)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == FAILED:
+        # The job failed, not this request: report the job's error with a 200 and status "failed"
+        return {"job_id": job_id, "status": job["status"], "error": job["error"]}
+    if job["status"] != SUCCEEDED:
+        # Not finished yet: poll again later
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": job["status"], "stage": job["stage"]})
+    return job["result"]
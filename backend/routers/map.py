@@ -1,32 +1,13 @@
 from fastapi     import APIRouter, Query
 from pydantic    import BaseModel
 from typing      import List, Optional
-from sentence_transformers import SentenceTransformer
-import csv, math
+from resources import get_resource
+import math
 
 router = APIRouter(tags=["Map"])   # no prefix here
 
-# Preload model on CPU
-MODEL = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
-
-# Load CSV
-DATA_PATH = "data/job_map.csv"
-JOBS = []
-with open(DATA_PATH, newline="", encoding="utf-8") as f:
-    reader = csv.DictReader(f)
-    for r in reader:
-        if not r["CITY_LATITUDE"] or not r["STATE_LATITUDE"]:
-            continue
-        JOBS.append({
-            "CITY":      r["CITY"],
-            "STATE":     r["STATE"],
-            "SALARY":    float(r["SALARY"]),
-            "TITLE_EMB": [float(x) for x in r["TITLE_EMB"].split(",")],
-            "CITY_LAT":  float(r["CITY_LATITUDE"]),
-            "CITY_LNG":  float(r["CITY_LONGITUDE"]),
-            "STATE_LAT": float(r["STATE_LATITUDE"]),
-            "STATE_LNG": float(r["STATE_LONGITUDE"]),
-        })
+# The MiniLM model and the job CSV are loaded lazily (see resources.py) so importing
+# this router no longer blocks API startup.
 
 def cosine(a: List[float], b: List[float]) -> float:
     dot   = sum(x*y for x,y in zip(a,b))
@@ -48,11 +29,12 @@ def get_map(
     q:         Optional[str] = Query(None, description="Job title keyword"),
 ):
     # 1) Salary filter
-    filtered = [job for job in JOBS if minSalary <= job["SALARY"] <= maxSalary]
+    jobs = get_resource("job_map")
+    filtered = [job for job in jobs if minSalary <= job["SALARY"] <= maxSalary]
 
     # 2) Semantic filter
     if q:
-        q_emb = MODEL.encode(q)
+        q_emb = get_resource("minilm_model").encode(q)
         filtered = [job for job in filtered if cosine(q_emb, job["TITLE_EMB"]) > 0.7]
 
     # 3) Aggregate
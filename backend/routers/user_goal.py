@@ -1,8 +1,12 @@
+import hashlib
 import json
 import os
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
 from sqlalchemy.orm import Session
 from database import get_db
 from models import User_Goal
@@ -14,6 +18,9 @@ from caches.goal_cache import (
     clear_user_goal_cache,
     clear_all_user_goal_cache,
 )
+from caches.resume_analysis_cache import clear_resume_analysis_cache
+from caches.resume_text_cache import clear_text_cache
+from utils.skill_extractor_helper.resume_skill_extractor import cache_resume_text
 
 UPLOAD_DIR = "./data/uploaded_resumes"
 
@@ -69,12 +76,63 @@ def update_user_goal(user_id: int, request: GoalRequest, db: Session = Depends(g
     cache_user_goal(user_id, goal)
 
     return {"message": "User goal updated successfully!"}
-from fastapi import UploadFile, File
-from fastapi.responses import JSONResponse
-import os
 
 UPLOAD_DIR = "data/uploaded_resumes"
 ALLOWED_EXTENSIONS = [".pdf", ".docx", ".txt"]
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", str(10 * 1024 * 1024)))  # 10 MB
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Multipart framing (boundaries, part headers) on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class _UploadTooLarge(HTTPException):
+    # An HTTPException, so FastAPI's form parsing passes it through instead of turning it into a 400
+    def __init__(self):
+        super().__init__(status_code=413)
+
+
+def _too_large_response():
+    return JSONResponse(status_code=413, content={"message": f"Resume exceeds {MAX_RESUME_BYTES} bytes."})
+
+
+class ResumeUploadRoute(APIRoute):
+    """
+    Route whose request body is capped while it is received, before FastAPI parses the form
+    (which spools the whole upload to disk): a Content-Length over the cap is rejected without
+    reading the body, and a body that grows past it (e.g. chunked, no Content-Length) is cut off
+    with a 413 as soon as the cap is crossed.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request):
+            max_body = MAX_RESUME_BYTES + MULTIPART_OVERHEAD_BYTES
+            content_length = request.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > max_body:
+                return _too_large_response()
+
+            received = 0
+            receive = request.receive
+
+            async def limited_receive():
+                nonlocal received
+                message = await receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > max_body:
+                        raise _UploadTooLarge()
+                return message
+
+            try:
+                return await handler(Request(request.scope, limited_receive))
+            except _UploadTooLarge:
+                return _too_large_response()
+
+        return limited_handler
+
+
+upload_router = APIRouter(route_class=ResumeUploadRoute)
 
 @router.get("/get-resume-url/{user_id}/")
 def get_resume_url(user_id: int):
@@ -87,8 +145,16 @@ def get_resume_url(user_id: int):
     return JSONResponse(status_code=404, content={"message": "Resume not found."})
 
 
-@router.post("/save-resume/{user_id}/")
-async def save_resume(user_id: int, file: UploadFile = File(...)):
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+@upload_router.post("/save-resume/{user_id}/")
+async def save_resume(user_id: int, background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     filename = file.filename
     _, ext = os.path.splitext(filename)
     ext = ext.lower()
@@ -99,17 +165,43 @@ async def save_resume(user_id: int, file: UploadFile = File(...)):
     user_dir = os.path.join(UPLOAD_DIR, str(user_id))
     os.makedirs(user_dir, exist_ok=True)
 
-    # Remove any previously saved resume file with different extension
-    for prev_ext in ALLOWED_EXTENSIONS:
-        old_path = os.path.join(user_dir, f"resume{prev_ext}")
-        if os.path.exists(old_path):
-            os.remove(old_path)
+    # The body was capped while it was received (ResumeUploadRoute). Copy the parsed upload into a
+    # temp file in the same folder in fixed-size chunks (flat memory), hashing and checking the
+    # file's own size as we go, then atomically rename it into place.
+    hasher = hashlib.sha256()
+    size = 0
+    tmp = tempfile.NamedTemporaryFile(dir=user_dir, prefix=".upload-", suffix=ext, delete=False)
+    try:
+        with tmp:
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > MAX_RESUME_BYTES:
+                    raise ValueError("too large")
+                hasher.update(chunk)
+                await run_in_threadpool(tmp.write, chunk)
+    except ValueError:
+        _remove_quietly(tmp.name)
+        return _too_large_response()
+    except BaseException:
+        _remove_quietly(tmp.name)
+        raise
 
     file_path = os.path.join(user_dir, f"resume{ext}")
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    os.replace(tmp.name, file_path)
+
+    # Remove any previously saved resume file with different extension, plus its extracted text
+    for prev_ext in ALLOWED_EXTENSIONS:
+        if prev_ext != ext:
+            _remove_quietly(os.path.join(user_dir, f"resume{prev_ext}"))
+    clear_text_cache(user_dir)
 
-    return {"message": f"Resume saved as resume{ext}."}
+    # New resume → stored analyses no longer apply
+    clear_resume_analysis_cache(user_id)
+    # Extract the text now (after the response is sent) instead of on every analysis
+    file_hash = hasher.hexdigest()
+    background_tasks.add_task(cache_resume_text, file_path, file_hash)
+
+    return {"message": f"Resume saved as resume{ext}.", "size": size, "sha256": file_hash}
 
 
 @router.post("/remove-resume/{user_id}/")
@@ -118,12 +210,16 @@ async def remove_resume(user_id: int):
     deleted = False
 
     for ext in ALLOWED_EXTENSIONS:
-        path = os.path.join(user_dir, f"resume{ext}")
-        if os.path.exists(path):
-            os.remove(path)
+        if _remove_quietly(os.path.join(user_dir, f"resume{ext}")):
             deleted = True
 
+    clear_text_cache(user_dir)
+    clear_resume_analysis_cache(user_id)
+
     if deleted:
         return {"message": "Resume removed successfully."}
     else:
         return {"message": "No resume found for this user."}
+
+
+router.include_router(upload_router)
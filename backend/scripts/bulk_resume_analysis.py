@@ -0,0 +1,45 @@
+"""
+Bulk onboarding: generate learn skills for many users at once.
+
+Job skills and resume texts are prepared in parallel, resumes are scored by Gemini in
+packed batches (BULK_MAX_PROMPT_TOKENS / BULK_MAX_RESUMES_PER_REQUEST) under the
+GEMINI_REQUESTS_PER_MINUTE limit, and Learn_Skill rows are written in one transaction.
+
+Run from the backend folder:
+    python -m scripts.bulk_resume_analysis --user-ids 1 2 3
+    python -m scripts.bulk_resume_analysis --all
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from database import SessionLocal
+from models import User_Goal
+from routers.generate_skills import run_bulk_generate_skills, BULK_WORKERS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--user-ids", type=int, nargs="+", help="users to (re)generate skills for")
+    group.add_argument("--all", action="store_true", help="every user with a saved goal")
+    parser.add_argument("--workers", type=int, default=BULK_WORKERS, help="parallel preparation workers")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        user_ids = args.user_ids or [uid for (uid,) in db.query(User_Goal.user_id).all()]
+        start_time = time.perf_counter()
+        result = run_bulk_generate_skills(user_ids, db, workers=args.workers)
+    finally:
+        db.close()
+
+    print(json.dumps(result, indent=2))
+    print(f"⏱ {len(user_ids)} users in {time.perf_counter() - start_time:.1f}s")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
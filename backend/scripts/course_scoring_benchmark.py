@@ -0,0 +1,128 @@
+"""
+Microbenchmark for course match scoring.
+
+Scores every course of a domain catalog three times with compute_match_score: once rebuilding
+the ScoringContext (prerequisite map, module peers, lowercase skill names) for every course row,
+as the row-wise scorer used to, once with a single context per request, and once more with the
+catalog's precomputed skill tags, as suggest_courses does now. Checks all give the same scores
+and prints the timings.
+
+Run from the backend folder:
+    python -m scripts.course_scoring_benchmark
+    python -m scripts.course_scoring_benchmark --domain "machine learning engineer" --skills 60
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from utils.schedule_generator_helper.course_catalog import CourseCatalog, domain_skill_names, load_course_catalog
+from utils.schedule_generator_helper.course_selection import ScoringContext, compute_match_score
+from utils.schedule_generator_helper.module_generator import (
+    build_prereq_graph_from_edges, generate_modules, parse_prerequisite_edges,
+)
+
+COURSE_DIR = "data/courses"
+SKILL_GRAPH_DIR = "data/skill_graph"
+
+
+def load_inputs(domain, skill_count, weeks, weekly_hours):
+    graph_path = os.path.join(SKILL_GRAPH_DIR, f"{domain}.json")
+    catalog = load_course_catalog(os.path.join(COURSE_DIR, f"{domain}.csv"), graph_path)
+    course_df = catalog.courses
+
+    skills = list(course_df["skill"].str.lower().value_counts().index[:skill_count])
+    skill_list = [[skill, 1 / len(skills), 0.2] for skill in skills]
+    modules = generate_modules(graph_path, domain, skill_list, weeks, weekly_hours, 0.4, 0.7)
+    skill_set = set(skills)
+    prereq_graph = build_prereq_graph_from_edges(parse_prerequisite_edges(graph_path, skill_set))
+    rows = [
+        (skill, title, description, catalog.skill_tags.get(index))
+        for index, skill, title, description in course_df[["skill", "title", "description"]].itertuples()
+        if str(skill).lower() in skill_set and isinstance(description, str)
+    ]
+    return catalog, skill_list, modules, prereq_graph, rows
+
+
+class UncachedPrereqGraph:
+    """
+    Edge view of a SkillDiGraph without its cached predecessor map, so build_prereq_map walks
+    every edge again each time, as the row-wise scorer did for every course row.
+    """
+
+    __slots__ = ("graph",)
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def edges(self):
+        return self.graph.edges()
+
+
+def score_per_row_context(rows, skill_list, modules, prereq_graph):
+    uncached_graph = UncachedPrereqGraph(prereq_graph)
+    return [
+        compute_match_score(title, description, skill, ScoringContext(skill_list, modules, uncached_graph))
+        for skill, title, description, _ in rows
+    ]
+
+
+def score_shared_context(rows, skill_list, modules, prereq_graph):
+    context = ScoringContext(skill_list, modules, prereq_graph)
+    return [compute_match_score(title, description, skill, context) for skill, title, description, _ in rows]
+
+
+def score_with_tags(rows, skill_list, modules, prereq_graph, tagged_skills):
+    context = ScoringContext(skill_list, modules, prereq_graph, tagged_skills)
+    return [compute_match_score(title, description, skill, context, tags) for skill, title, description, tags in rows]
+
+
+def best_of(repeat, fn, *args):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start_time)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--domain", default="java developer")
+    parser.add_argument("--skills", type=int, default=40, help="number of catalog skills in the request")
+    parser.add_argument("--weeks", type=int, default=12)
+    parser.add_argument("--weekly-hours", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="keep the best of N runs")
+    args = parser.parse_args(argv)
+
+    catalog, skill_list, modules, prereq_graph, rows = load_inputs(
+        args.domain, args.skills, args.weeks, args.weekly_hours
+    )
+    inputs = (rows, skill_list, modules, prereq_graph)
+
+    per_row_seconds, per_row_scores = best_of(args.repeat, score_per_row_context, *inputs)
+    shared_seconds, shared_scores = best_of(args.repeat, score_shared_context, *inputs)
+    tagged_seconds, tagged_scores = best_of(args.repeat, score_with_tags, *inputs, catalog.tagged_skills)
+    context_seconds, _ = best_of(args.repeat, ScoringContext, skill_list, modules, UncachedPrereqGraph(prereq_graph))
+    tagging_seconds, _ = best_of(
+        1, CourseCatalog, catalog.courses, domain_skill_names(catalog.courses, os.path.join(SKILL_GRAPH_DIR, f"{args.domain}.json"))
+    )
+
+    if not per_row_scores == shared_scores == tagged_scores:
+        print("❌ Scores differ between per-row context, shared context and catalog tags")
+        return 1
+
+    print(f"{args.domain}: {len(rows)} courses, {len(skill_list)} skills, {len(modules)} modules")
+    print(f"  context build          {context_seconds * 1e6:10.1f} µs")
+    print(f"  per-row context        {per_row_seconds * 1000:10.2f} ms")
+    print(f"  shared context         {shared_seconds * 1000:10.2f} ms")
+    print(f"  catalog skill tags     {tagged_seconds * 1000:10.2f} ms  "
+          f"(tagging the catalog once at load: {tagging_seconds * 1000:.1f} ms)")
+    print(f"  saved                  {(per_row_seconds - tagged_seconds) * 1000:10.2f} ms "
+          f"({per_row_seconds / tagged_seconds:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Startup benchmark for the backend.
+
+Imports `main` in a fresh interpreter with `-X importtime`, then times every heavy
+initializer (model loads, CSV parses, `Base.metadata.create_all`) in its own fresh
+interpreter so they don't share warm caches. Writes a JSON report and exits with
+status 1 when startup regresses past the stored baseline.
+
+Run from the backend folder:
+    python -m scripts.startup_benchmark                   # report + compare to baseline
+    python -m scripts.startup_benchmark --update-baseline # store this run as the baseline
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+BENCHMARK_DIR = "benchmarks"
+DEFAULT_REPORT = os.path.join(BENCHMARK_DIR, "startup_report.json")
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "startup_baseline.json")
+COURSE_DIR = "data/courses"
+
+# Each snippet runs alone in a fresh interpreter; the timed part prints its duration.
+INITIALIZERS = {
+    "libraries": "from resources import get_resource; get_resource('libraries')",
+    "minilm_model": "from resources import get_resource; get_resource('minilm_model')",
+    "mpnet_model": "from resources import get_resource; get_resource('mpnet_model')",
+    "job_map_csv": "from resources import get_resource; get_resource('job_map')",
+    "course_csv": (
+        "import os, pandas as pd; "
+        f"pd.read_csv(os.path.join('{COURSE_DIR}', sorted(os.listdir('{COURSE_DIR}'))[0]))"
+    ),
+    "create_all": "from database import engine, Base; import models; Base.metadata.create_all(bind=engine)",
+}
+
+TIMER_TEMPLATE = """
+import json, time
+_start = time.perf_counter()
+{snippet}
+print(json.dumps({{"seconds": time.perf_counter() - _start}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into [{module, self_us, cumulative_us}], slowest first."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules.append({
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            })
+        except ValueError:
+            continue
+    return sorted(modules, key=lambda m: -m["cumulative_us"])
+
+
+def time_main_import(env):
+    start_time = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, env=env,
+    )
+    wall_seconds = time.perf_counter() - start_time
+    modules = parse_importtime(proc.stderr)
+    result = {
+        "wall_seconds": round(wall_seconds, 4),
+        "ok": proc.returncode == 0,
+        "modules": modules,
+    }
+    if proc.returncode != 0:
+        result["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"
+    return result
+
+
+def time_initializer(snippet, env):
+    proc = subprocess.run(
+        [sys.executable, "-c", TIMER_TEMPLATE.format(snippet=snippet)],
+        capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return {"ok": False, "error": lines[-1] if lines else "failed"}
+    seconds = json.loads(proc.stdout.strip().splitlines()[-1])["seconds"]
+    return {"ok": True, "seconds": round(seconds, 4)}
+
+
+def run_benchmark(top_n, repeat):
+    # Keep the imported app from warming resources itself
+    env = dict(os.environ, WARMUP_ON_STARTUP="false")
+    # Best of `repeat` runs: the first one also pays for writing .pyc files
+    main_import = min((time_main_import(env) for _ in range(repeat)), key=lambda r: r["wall_seconds"])
+    main_import["modules"] = main_import["modules"][:top_n]
+
+    initializers = {}
+    for name, snippet in INITIALIZERS.items():
+        initializers[name] = time_initializer(snippet, env)
+        print(f"{name:>15}: {initializers[name].get('seconds', initializers[name].get('error'))}")
+
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "main_import": main_import,
+        "initializers": initializers,
+    }
+
+
+def failures(report):
+    """Human-readable list of the steps that failed in a report (empty when everything ran)."""
+    failed = []
+    if not report["main_import"].get("ok"):
+        failed.append(f"main import: {report['main_import'].get('error')}")
+    for name, result in report["initializers"].items():
+        if not result.get("ok"):
+            failed.append(f"{name}: {result.get('error')}")
+    return failed
+
+
+def compare_to_baseline(report, baseline, tolerance, slack):
+    """
+    Return a list of human-readable regressions (empty when within tolerance). A step that
+    ran in the baseline but fails now is a regression too.
+    """
+    regressions = []
+
+    def check(label, current, previous):
+        if current is None or previous is None:
+            return
+        # Relative tolerance plus an absolute slack so sub-second timings don't flap
+        if current > previous * (1 + tolerance) and current - previous > slack:
+            regressions.append(f"{label}: {current:.3f}s > baseline {previous:.3f}s (+{tolerance:.0%} allowed)")
+
+    main_import, previous_import = report["main_import"], baseline["main_import"]
+    if previous_import.get("ok", True) and not main_import.get("ok"):
+        regressions.append(f"main import: failed ({main_import.get('error')}), ok in baseline")
+    elif main_import.get("ok"):
+        check("main import", main_import["wall_seconds"], previous_import["wall_seconds"])
+    for name, result in report["initializers"].items():
+        previous = baseline.get("initializers", {}).get(name, {})
+        if not previous.get("ok"):
+            continue
+        if result.get("ok"):
+            check(name, result["seconds"], previous["seconds"])
+        else:
+            regressions.append(f"{name}: failed ({result.get('error')}), ok in baseline")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend startup benchmark")
+    parser.add_argument("--output", default=DEFAULT_REPORT, help="Where to write the JSON report")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--slack", type=float, default=0.1, help="Absolute slowdown in seconds ignored as noise")
+    parser.add_argument("--top", type=int, default=30, help="Number of slowest modules to keep in the report")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh-interpreter imports of main; the fastest is kept")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.top, max(args.repeat, 1))
+    print(f"main import: {report['main_import']['wall_seconds']}s")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.update_baseline:
+        failed = failures(report)
+        if failed:
+            print("❌ Not updating the baseline from a run with failures:")
+            for line in failed:
+                print(f"  - {line}")
+            return 1
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not report["main_import"]["ok"]:
+        print(f"❌ Importing main failed: {report['main_import'].get('error')}")
+        return 1
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare_to_baseline(report, baseline, args.tolerance, args.slack)
+    if regressions:
+        print("❌ Startup regressed:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print("✅ Startup within baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
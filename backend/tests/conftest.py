@@ -0,0 +1,13 @@
+# Tests run from the backend folder (python -m pytest), like the app and the scripts.
+# database.py needs DATABASE_URL at import time; point it at a throwaway SQLite file.
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)  # data/ paths are relative to the backend folder
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'career_roadmap_test.db')}")
@@ -0,0 +1,50 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+
+HEAVY_MODULES = ("numpy", "pandas", "pulp", "sklearn", "sentence_transformers", "google.genai")
+
+
+def test_importing_the_app_loads_no_heavy_library():
+    # A fresh interpreter: this one has imported them already through other tests
+    code = f"import sys, main; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True,
+                            cwd=os.getcwd(), env=dict(os.environ), timeout=60, check=True)
+
+    assert result.stdout.strip() == ""
+
+
+def test_lifespan_creates_tables_off_the_loop_and_does_not_wait_for_warm_up(monkeypatch):
+    create_all_calls = []
+    release = threading.Event()
+
+    def create_all(**kwargs):
+        try:
+            asyncio.get_running_loop()
+            create_all_calls.append("event loop")
+        except RuntimeError:
+            create_all_calls.append("worker thread")
+
+    def slow_warm_up():
+        release.wait(10)  # a model load that outlives the app
+
+    monkeypatch.setattr(main.Base.metadata, "create_all", create_all)
+    monkeypatch.setattr(main, "warm_up", slow_warm_up)
+    monkeypatch.setattr(main, "WARMUP_ON_STARTUP", True)
+
+    try:
+        with TestClient(main.app) as client:
+            assert client.get("/").status_code == 200
+            stop_start = time.perf_counter()
+        assert time.perf_counter() - stop_start < 2
+    finally:
+        release.set()
+
+    assert create_all_calls == ["worker thread"]
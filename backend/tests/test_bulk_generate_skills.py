@@ -0,0 +1,199 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from caches import resume_analysis_cache
+from database import Base
+from models import Learn_Skill, User_Goal
+from routers import generate_skills
+from utils import llm_gateway
+from utils.llm_gateway import StubBackend, set_llm_backend
+
+JOB_SKILLS = {
+    1: [("python", 90.0), ("sql", 60.0), ("docker", 40.0)],
+    2: [("java", 80.0), ("spring", 70.0)],
+    3: [],                                # nothing extracted for this goal: focus scoring fails
+    4: [("excel", 50.0)],                 # no resume uploaded
+}
+RESUME_SCORES = {"python": 80.0, "sql": 10.0, "java": 30.0, "spring": 90.0}
+
+
+def score_resumes(prompt):
+    """Stub LLM answer to a batched resume prompt: a fixed confidence per skill of every resume."""
+    answer = {}
+    for resume_id, skills in re.findall(r"### RESUME_ID: (\d+)\nSKILL LIST:\n(\[.*?\])", prompt):
+        skills = json.loads(skills.replace("'", '"')) or ["python"]
+        answer[resume_id] = [{"skill": skill, "confidence": RESUME_SCORES.get(skill, 0.0)} for skill in skills]
+    return json.dumps(answer)
+
+
+@pytest.fixture
+def cohort(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_gateway, "_gateway", None)
+    stub = StubBackend(score_resumes)
+    set_llm_backend(stub)
+    monkeypatch.setattr(resume_analysis_cache, "CACHE_DIR", str(tmp_path / "analysis"))
+    monkeypatch.setattr(generate_skills, "UPLOAD_DIR", str(tmp_path / "resumes"))
+    # The skill-prediction Space and the domain classifier are remote/heavy; fake their output
+    monkeypatch.setattr(generate_skills, "extractGoalSkills", lambda url, title, *args: title)
+    monkeypatch.setattr(generate_skills, "calculate_skill_importance",
+                        lambda job_skills, title, level: JOB_SKILLS[int(title)])
+
+    for user_id in (1, 2, 3):
+        user_dir = tmp_path / "resumes" / str(user_id)
+        user_dir.mkdir(parents=True)
+        (user_dir / "resume.txt").write_text(f"Resume of user {user_id}: python, sql, java, spring.")
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    for user_id in JOB_SKILLS:
+        db.add(User_Goal(user_id=user_id, duration_weeks=4, weekly_hours=5, target_position=str(user_id),
+                         industry="Tech", exp_level="Junior", responsibility=""))
+    db.commit()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def test_bulk_run_reports_failures_per_user(cohort):
+    result = generate_skills.run_bulk_generate_skills([1, 2, 3, 4, 5], cohort, workers=2)
+
+    assert sorted(result["succeeded"]) == [1, 2]
+    assert sorted(result["failed"]) == [3, 4, 5]
+    assert "Resume file not found" in result["failed"][4]
+    assert result["failed"][5] == "User goal not found"
+
+    saved = {}
+    for row in cohort.query(Learn_Skill).all():
+        saved.setdefault(row.user_id, {})[row.skill_name] = (row.focus_score, row.confidence_score)
+    assert set(saved) == {1, 2}
+    assert set(saved[1]) == {"python", "sql", "docker"}  # every job skill above the resume score
+    assert set(saved[2]) == {"java"}                      # spring is already covered by the resume
+    expected = generate_skills.calculateFocus(JOB_SKILLS[1], [(s, RESUME_SCORES.get(s, 0.0)) for s, _ in JOB_SKILLS[1]])
+    assert saved[1] == {skill: (focus, confidence) for skill, focus, confidence in expected}
+
+
+class FakeGemini:
+    """
+    Local HTTP server on an ephemeral port speaking the Gemini generateContent API: every request
+    is answered with responder(prompt text). Records the request paths and API keys.
+    """
+
+    def __init__(self, responder):
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = "".join(part.get("text", "") for content in body["contents"] for part in content["parts"])
+                fake.requests.append((self.path, self.headers.get("x-goog-api-key")))
+                text = responder(prompt)
+                data = json.dumps({
+                    "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+                    "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4},
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_bulk_run_through_gemini_client(cohort, monkeypatch):
+    pytest.importorskip("google.genai")
+    with FakeGemini(score_resumes) as fake:
+        # The gateway built from configuration, as in production: Gemini backend, base URL from GEMINI_BASE_URL
+        monkeypatch.setattr(llm_gateway, "GEMINI_BASE_URL", fake.url)
+        monkeypatch.setattr(llm_gateway, "LLM_BACKEND", "gemini")
+        monkeypatch.setattr(llm_gateway, "_gateway", None)
+        monkeypatch.setattr(generate_skills, "GEMINI_KEY", "test-key")
+
+        result = generate_skills.run_bulk_generate_skills([1, 2, 3, 4], cohort, workers=2)
+
+    assert isinstance(llm_gateway.get_llm_gateway().backend, llm_gateway.GeminiBackend)
+    assert sorted(result["succeeded"]) == [1, 2]
+    assert sorted(result["failed"]) == [3, 4]
+    # Users 1-3 have resumes: one batched request for all of them, with the configured key
+    assert len(fake.requests) == 1
+    path, api_key = fake.requests[0]
+    assert path.endswith(f"/models/{llm_gateway.GEMINI_MODEL}:generateContent")
+    assert api_key == "test-key"
+    saved = {row.skill_name: (row.focus_score, row.confidence_score)
+             for row in cohort.query(Learn_Skill).filter(Learn_Skill.user_id == 1).all()}
+    expected = generate_skills.calculateFocus(JOB_SKILLS[1], [(s, RESUME_SCORES.get(s, 0.0)) for s, _ in JOB_SKILLS[1]])
+    assert saved == {skill: (focus, confidence) for skill, focus, confidence in expected}
+
+
+def no_text_extraction(*args):
+    raise AssertionError("resume text loaded on an analysis cache hit")
+
+
+def test_bulk_run_reuses_cached_analyses(cohort, monkeypatch):
+    generate_skills.run_bulk_generate_skills([1, 2], cohort)
+    calls = []
+    llm_gateway.get_llm_gateway().backend.responder = lambda prompt: calls.append(prompt) or "{}"
+    monkeypatch.setattr(generate_skills, "load_resume_text", no_text_extraction)
+
+    result = generate_skills.run_bulk_generate_skills([1, 2], cohort)
+
+    assert sorted(result["succeeded"]) == [1, 2]
+    assert calls == []
+
+
+def record_span(spans, name, fn, seconds=0.2):
+    """`fn` that also sleeps `seconds` and records its (start, end) in spans[name]."""
+    def timed(*args):
+        start_time = time.perf_counter()
+        time.sleep(seconds)
+        try:
+            return fn(*args)
+        finally:
+            spans[name] = (start_time, time.perf_counter())
+    return timed
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["analysis_miss", "analysis_hit"])
+def test_single_user_run_overlaps_resume_text_with_goal_skills(cohort, monkeypatch, cached):
+    if cached:
+        generate_skills.run_bulk_generate_skills([1, 2], cohort)  # one batched request caches both analyses
+    prompts = []
+    llm_gateway.get_llm_gateway().backend.responder = lambda prompt: prompts.append(prompt) or "[]"
+    spans = {}
+    monkeypatch.setattr(generate_skills, "extractGoalSkills",
+                        record_span(spans, "goal_skills", generate_skills.extractGoalSkills))
+    monkeypatch.setattr(generate_skills, "load_resume_text",
+                        record_span(spans, "resume_text", generate_skills.load_resume_text))
+    timings = {}
+
+    result = generate_skills.run_generate_skills(1, cohort, timings=timings)
+
+    assert [skill[0] for skill in result["skills"]] == ["python", "sql", "docker"]
+    (goal_start, goal_end), (text_start, text_end) = spans["goal_skills"], spans["resume_text"]
+    assert text_start < goal_end and goal_start < text_end  # the two branches ran at the same time
+    assert len(prompts) == (0 if cached else 1)
+    assert ("resume_analysis" in timings) is not cached
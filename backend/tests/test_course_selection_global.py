@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.schedule_generator_helper.course_selection import suggest_courses_global
+from utils.schedule_generator_helper.skill_graph import SkillDiGraph
+
+WEEKS, WEEKLY_HOURS, PORTION = 12, 10, 0.8
+
+
+class FakeEmbeddingModel:
+    """score_skill_courses only stores the embeddings; the sentence model itself is not needed."""
+
+    def encode(self, text, convert_to_tensor=False):
+        return np.zeros(4)
+
+
+def course(skill, link, duration, title=None, difficulty=1.0, price=10.0, wilson_score=0.5):
+    return {
+        "skill": skill, "link": link, "title": title or f"{skill} course", "description": f"learn {skill}",
+        "duration": duration, "price": price, "wilson_score": wilson_score,
+        "difficulty_numeric": difficulty, "course_type": "Course",
+    }
+
+
+def select(course_df, skill_list, weeks=WEEKS):
+    return suggest_courses_global(
+        FakeEmbeddingModel(), course_df, skill_list, weeks, WEEKLY_HOURS, "Java Developer", [], SkillDiGraph(),
+        portion=PORTION,
+    )
+
+
+def test_every_skill_gets_a_valid_selection_from_the_catalog():
+    course_df = pd.read_csv("data/courses/java developer.csv")
+    skills = ["java", "spring boot", "sql", "git", "docker", "hibernate"]
+    skill_list = [[skill, focus, 0.2] for skill, focus in zip(skills, [0.3, 0.2, 0.15, 0.1, 0.15, 0.1])]
+
+    result = select(course_df, skill_list)
+
+    assert sorted(result) == sorted(skills)
+    links = [c["link"] for courses in result.values() for c in courses]
+    assert len(links) == len(set(links))  # a course shared by several skills is picked once
+    assert sum(c["duration"] for courses in result.values() for c in courses) <= PORTION * WEEKS * WEEKLY_HOURS
+    for skill, focus, _ in skill_list:
+        assert result[skill], skill
+        skill_courses = course_df[course_df["skill"].str.lower() == skill]
+        assert {c["link"] for c in result[skill]} <= set(skill_courses["link"])
+        shortest_two = skill_courses["duration"].nsmallest(2).sum()
+        cap = max(1.1 * int(PORTION * WEEKS * WEEKLY_HOURS * focus), shortest_two)
+        assert sum(c["duration"] for c in result[skill]) <= cap + 1e-9
+
+
+def test_courses_without_link_are_not_merged():
+    course_df = pd.DataFrame([
+        course("java", np.nan, 10.0),
+        course("java", np.nan, 12.0),
+        course("java", None, 14.0),
+        course("sql", np.nan, 8.0),
+        course("sql", np.nan, 9.0),
+    ])
+
+    result = select(course_df, [["java", 0.5, 0.2], ["sql", 0.5, 0.2]])
+
+    assert len(result["java"]) >= 2 and len(result["sql"]) >= 2
+    assert all(c["skill"] == "java" for c in result["java"])
+    assert all(c["skill"] == "sql" for c in result["sql"])
+
+
+def test_skill_left_without_courses_gets_the_shortest_course():
+    shared = "https://example.com/shared"
+    course_df = pd.DataFrame([
+        course("java", shared, 20.0),
+        course("java", "https://example.com/java-2", 20.0),
+        course("sql", shared, 20.0),   # sql's only course also counts for java, which wins the tie
+        course("git", "https://example.com/git", 2.0),
+    ])
+
+    result = select(course_df, [["java", 0.5, 0.2], ["sql", 0.5, 0.2]])
+
+    assert {c["link"] for c in result["java"]} == {shared, "https://example.com/java-2"}
+    assert [c["link"] for c in result["sql"]] == ["https://example.com/git"]
+
+
+@pytest.mark.parametrize("weeks", [1, 3])
+def test_tight_budgets_still_cover_every_skill(weeks):
+    course_df = pd.read_csv("data/courses/java developer.csv")
+    skill_list = [["java", 0.5, 0.2], ["sql", 0.3, 0.2], ["git", 0.2, 0.2]]
+
+    result = select(course_df, skill_list, weeks=weeks)
+
+    assert all(result[skill] for skill, _, _ in skill_list)
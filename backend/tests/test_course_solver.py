@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from pulp import LpAffineExpression, LpMaximize, LpProblem, LpStatusOptimal, LpVariable, PULP_CBC_CMD
+
+from caches.course_model_cache import clear_course_model_cache
+from utils.schedule_generator_helper.course_solver import course_selection_template
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_course_model_cache()
+    yield
+    clear_course_model_cache()
+
+
+def fresh_selection(index, durations, objective, lower, upper):
+    """The selection model built from scratch and solved without a warm start."""
+    variables = [LpVariable(f"fresh_{i}", cat="Binary") for i in index]
+    problem = LpProblem("Fresh_Course_Selection", LpMaximize)
+    problem += LpAffineExpression(zip(variables, objective.tolist()))
+    problem += LpAffineExpression((x, 1) for x in variables) >= 2
+    problem += LpAffineExpression(zip(variables, durations.tolist())) <= upper
+    problem += LpAffineExpression(zip(variables, durations.tolist())) >= lower
+    if problem.solve(PULP_CBC_CMD(msg=False)) != LpStatusOptimal:
+        return []
+    return [i for i, x in zip(index, variables) if x.varValue == 1]
+
+
+def test_cached_template_matches_a_fresh_model_on_every_request():
+    rng = np.random.default_rng(7)
+    index = list(range(100, 130))
+    durations = rng.integers(2, 40, size=len(index)).astype(np.float64)
+    template = course_selection_template("java", index, durations)
+
+    for _ in range(25):
+        objective = rng.normal(size=len(index))
+        ideal = float(rng.integers(0, 120))
+        lower, upper = 0.9 * ideal, 1.1 * ideal
+
+        result = course_selection_template("java", index, durations).solve(objective, lower, upper)
+
+        assert result.selected == fresh_selection(index, durations, objective, lower, upper)
+    assert course_selection_template("java", index, durations) is template
+
+
+def test_warm_start_does_not_carry_the_previous_selection_over():
+    index = [0, 1, 2, 3, 4]
+    durations = np.array([10.0, 10.0, 10.0, 30.0, 30.0])
+    template = course_selection_template("sql", index, durations)
+
+    first = template.solve(np.array([5.0, 4.0, 0.0, 0.0, 0.0]), 15, 25)
+    assert first.selected == [0, 1]
+
+    # Same bounds, so the last solution is a feasible start, but it is no longer optimal
+    second = template.solve(np.array([1.0, -1.0, 3.0, 0.0, 0.0]), 15, 25)
+    assert second.warm_started and second.selected == [0, 2]
+
+    # New bounds the last solution violates: a greedy start (or none) instead
+    third = template.solve(np.array([0.0, 0.0, 0.0, 1.0, 2.0]), 55, 65)
+    assert third.selected == [3, 4]
+
+    # Infeasible bounds leave no solution behind and the next request is unaffected
+    assert template.solve(np.ones(5), 1, 5).selected == []
+    assert template.solve(np.array([5.0, 4.0, 0.0, 0.0, 0.0]), 15, 25).selected == [0, 1]
@@ -0,0 +1,43 @@
+import pytest
+
+from caches import goal_skill_cache
+from caches.goal_skill_cache import cache_goal_skills, clear_goal_skill_cache, get_cached_goal_skills
+
+PAYLOAD = {"job_title": "Data Scientist", "experience_level": "Junior", "responsibilities": ["Tech"]}
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = tmp_path / "goal_skills.sqlite3"
+    monkeypatch.setattr(goal_skill_cache, "CACHE_PATH", str(path))
+    monkeypatch.setattr(goal_skill_cache, "_initialized", False)
+    return path
+
+
+def test_entries_are_per_endpoint(cache_path):
+    cache_goal_skills(PAYLOAD, "- python", "https://space-a/predict")
+
+    assert get_cached_goal_skills(PAYLOAD, "https://space-a/predict") == "- python"
+    assert get_cached_goal_skills(PAYLOAD, "https://space-b/predict") is None
+    assert get_cached_goal_skills(PAYLOAD) is None
+
+
+def test_payload_key_ignores_case_and_whitespace(cache_path):
+    cache_goal_skills(PAYLOAD, "- python", "https://space-a/predict")
+    noisy = {"job_title": "  data   SCIENTIST", "experience_level": "junior", "responsibilities": ["tech "]}
+
+    assert get_cached_goal_skills(noisy, "https://space-a/predict") == "- python"
+
+
+def test_clear_removes_every_entry(cache_path):
+    cache_goal_skills(PAYLOAD, "- python", "https://space-a/predict")
+    clear_goal_skill_cache()
+
+    assert get_cached_goal_skills(PAYLOAD, "https://space-a/predict") is None
+
+
+def test_clear_survives_an_unavailable_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(goal_skill_cache, "CACHE_PATH", str(tmp_path))  # a directory: sqlite cannot open it
+    monkeypatch.setattr(goal_skill_cache, "_initialized", False)
+
+    clear_goal_skill_cache()
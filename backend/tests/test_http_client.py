@@ -0,0 +1,144 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from utils import http_client
+from utils.http_client import CircuitBreaker, CircuitOpenError, PooledHttpClient
+from utils.skill_extractor_helper import goal_skill_extractor
+
+
+class StubUpstream:
+    """Local HTTP/1.1 server on an ephemeral port that answers POSTs with queued (status, body) pairs."""
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []              # (client port, decoded JSON body) per request
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stub.requests.append((self.client_address[1], json.loads(body)))
+                status, payload = stub.responses.pop(0) if stub.responses else (200, {})
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/predict"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def upstream():
+    with StubUpstream() as stub:
+        yield stub
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of sleeping."""
+    delays = []
+    monkeypatch.setattr(http_client.time, "sleep", delays.append)
+    return delays
+
+
+def test_connections_are_reused(upstream):
+    client = PooledHttpClient("test")
+    for i in range(5):
+        assert client.post_json(upstream.url, {"n": i}).status_code == 200
+
+    assert [body for _, body in upstream.requests] == [{"n": i} for i in range(5)]
+    assert len({port for port, _ in upstream.requests}) == 1
+
+
+def test_retries_with_backoff_until_success(upstream, sleeps, monkeypatch):
+    client = PooledHttpClient("test", backoff_base=0.5, backoff_max=8.0)
+    monkeypatch.setattr(goal_skill_extractor, "space_client", client)
+    upstream.responses = [(503, {}), (429, {}), (200, {"predicted_skills": "python, sql"})]
+
+    skills = goal_skill_extractor.extractGoalSkills(upstream.url, "Engineer", "Junior", "Tech", "", use_cache=False)
+
+    assert skills == "python, sql"
+    assert len(upstream.requests) == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+    assert client.breaker(upstream.url).state == CircuitBreaker.CLOSED
+
+
+def test_backoff_delay_is_capped():
+    client = PooledHttpClient("test", backoff_base=0.5, backoff_max=2.0)
+    for attempt in range(10):
+        assert 0 <= client.backoff_delay(attempt) <= min(2.0, 0.5 * 2 ** attempt)
+
+
+def test_gives_up_after_max_retries(upstream, sleeps, monkeypatch):
+    client = PooledHttpClient("test", failure_threshold=10)
+    monkeypatch.setattr(goal_skill_extractor, "space_client", client)
+    upstream.responses = [(500, {})] * 3
+
+    skills = goal_skill_extractor.extractGoalSkills(upstream.url, "Engineer", "Junior", "Tech", "", use_cache=False)
+
+    assert skills == ""
+    assert len(upstream.requests) == 3
+    assert len(sleeps) == 2
+
+
+def test_breaker_opens_then_half_opens(upstream, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: now[0])
+    client = PooledHttpClient("test", failure_threshold=2, reset_timeout=30.0)
+    breaker = client.breaker(upstream.url)
+    upstream.responses = [(500, {}), (502, {})]
+
+    client.post_json(upstream.url, {})
+    assert breaker.state == CircuitBreaker.CLOSED
+    client.post_json(upstream.url, {})
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        client.post_json(upstream.url, {})
+    assert len(upstream.requests) == 2  # failed fast, the upstream was not called
+
+    now[0] += 30.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # a single trial call at a time
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN  # failed trial re-opens
+
+    now[0] += 30.0
+    upstream.responses = [(200, {})]
+    assert client.post_json(upstream.url, {}).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_connection_errors_count_as_failures(monkeypatch):
+    with StubUpstream() as stub:
+        url = stub.url  # nothing listens on the port once the stub is closed
+    client = PooledHttpClient("test", failure_threshold=1, connect_timeout=0.5)
+
+    with pytest.raises(requests.ConnectionError):
+        client.post_json(url, {})
+    assert client.breaker(url).state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        client.post_json(url, {})
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import jobs
+from routers import jobs as jobs_router
+
+
+@pytest.fixture
+def job_queue():
+    """Run each test inside its own event loop with fresh job workers."""
+    jobs._jobs.clear()
+    jobs._finished_jobs.clear()
+    jobs._active.clear()
+
+    def run(scenario):
+        async def main():
+            jobs.start_job_workers(2)
+            try:
+                return await scenario()
+            finally:
+                await jobs.stop_job_workers()
+
+        return asyncio.run(main(), debug=True)
+
+    return run
+
+
+async def wait_for(job_id, timeout=5):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        job = jobs.get_job(job_id, include_result=True)
+        if job["status"] in (jobs.SUCCEEDED, jobs.FAILED):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_submit_from_worker_thread_wakes_the_loop(job_queue):
+    async def runner(user_id, params, report_stage):
+        report_stage("work")
+        return {"user_id": user_id}
+
+    jobs.register_job_kind("test-thread", runner)
+
+    async def scenario():
+        # Like a plain `def` endpoint: submitted from a threadpool thread
+        submitted = await asyncio.to_thread(jobs.submit_job, "test-thread", 7)
+        return await wait_for(submitted["job_id"])
+
+    job = job_queue(scenario)
+    assert job["status"] == jobs.SUCCEEDED
+    assert job["result"] == {"user_id": 7}
+
+
+def test_active_jobs_are_never_evicted(job_queue, monkeypatch):
+    monkeypatch.setattr(jobs, "_finished_jobs", jobs.LRUCache(maxsize=3))
+    release = None
+
+    async def blocked(user_id, params, report_stage):
+        await release.wait()
+        return "done"
+
+    async def quick(user_id, params, report_stage):
+        return user_id
+
+    jobs.register_job_kind("test-blocked", blocked)
+    jobs.register_job_kind("test-quick", quick)
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        slow_id = jobs.submit_job("test-blocked", 1)["job_id"]
+        for user_id in range(10):
+            await wait_for(jobs.submit_job("test-quick", user_id)["job_id"])
+        still_running = jobs.get_job(slow_id)
+        release.set()
+        return still_running, await wait_for(slow_id)
+
+    still_running, finished = job_queue(scenario)
+    assert still_running is not None and still_running["status"] == jobs.RUNNING
+    assert finished["result"] == "done"
+    assert len(jobs._finished_jobs) == 3
+
+
+def test_result_of_a_failed_job_is_its_error(job_queue):
+    async def missing_goal(user_id, params, report_stage):
+        raise HTTPException(status_code=404, detail="User goal not found")
+
+    jobs.register_job_kind("test-failing", missing_goal)
+
+    async def scenario():
+        job_id = jobs.submit_job("test-failing", 3)["job_id"]
+        await wait_for(job_id)
+        return job_id, jobs_router.get_job_result(job_id)
+
+    job_id, result = job_queue(scenario)
+    # A plain dict: FastAPI serves it with a 200, not the 500 of a broken request
+    assert result == {"job_id": job_id, "status": jobs.FAILED, "error": "User goal not found"}
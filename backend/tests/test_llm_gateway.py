@@ -0,0 +1,59 @@
+import pytest
+
+from utils import llm_gateway
+from utils.llm_gateway import LLMGateway, StubBackend
+
+
+class FlakyBackend(StubBackend):
+    """Fails the first `failures` calls with `error`, then answers "ok"."""
+
+    def __init__(self, failures, error=RuntimeError("upstream unavailable")):
+        super().__init__(lambda prompt: "ok")
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def generate(self, prompt, model, api_key):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return super().generate(prompt, model, api_key)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(llm_gateway.time, "sleep", lambda seconds: None)
+
+
+@pytest.mark.parametrize("max_retries", [0, -1, 1])
+def test_without_retries_the_call_is_still_made_once(max_retries):
+    backend = FlakyBackend(failures=0)
+
+    assert LLMGateway(backend, max_retries=max_retries).generate("prompt") == "ok"
+    assert backend.calls == 1
+
+
+@pytest.mark.parametrize("max_retries", [0, 1])
+def test_without_retries_the_first_error_is_raised(max_retries):
+    backend = FlakyBackend(failures=1)
+
+    with pytest.raises(RuntimeError, match="upstream unavailable"):
+        LLMGateway(backend, max_retries=max_retries).generate("prompt")
+    assert backend.calls == 1
+
+
+def test_retries_until_success():
+    backend = FlakyBackend(failures=2)
+
+    assert LLMGateway(backend, max_retries=3).generate("prompt") == "ok"
+    assert backend.calls == 3
+
+
+def test_client_errors_are_not_retried():
+    error = RuntimeError("bad request")
+    error.code = 400
+    backend = FlakyBackend(failures=1, error=error)
+
+    with pytest.raises(RuntimeError, match="bad request"):
+        LLMGateway(backend, max_retries=3).generate("prompt")
+    assert backend.calls == 1
@@ -0,0 +1,125 @@
+"""
+group_skills_by_association now scores against a precomputed association matrix (user-042) and
+keeps running per-group totals (user-043). This checks it against the original implementation,
+which looked pairs up in parse_association_weights' {(src, tgt): weight} dict and re-summed every
+candidate group for every skill, on random skill sets and parameters drawn from every shipped
+domain graph. Both the matrix input (as generate_modules passes it) and the dict input are checked.
+"""
+
+import glob
+import os
+from collections import defaultdict
+
+import numpy as np
+import pytest
+from hypothesis import HealthCheck, given, settings, strategies as st
+
+from utils.schedule_generator_helper.module_generator import (
+    association_submatrix, build_prereq_graph_from_edges, domain_feedback_arcs,
+    group_skills_by_association, load_knowledge_graph, parse_association_weights, parse_prerequisite_edges,
+    topological_sort_with_priorities,
+)
+
+GRAPH_PATHS = sorted(glob.glob(os.path.join("data", "skill_graph", "*.json")))
+
+
+def reference_parse_association_weights(graph_path, input_skill_set, threshold=0.4, conf_weight=0.8):
+    """The original association lookup: {(src, tgt): weight} over the input skills only."""
+    knowledge_graph = load_knowledge_graph(graph_path)
+    association_scores = {}
+    for rel in knowledge_graph.get("relationships", []):
+        if rel["relationship"] == "association":
+            src, tgt = rel["source"].lower(), rel["target"].lower()
+            if src in input_skill_set and tgt in input_skill_set:
+                confidence = rel.get("confidence", 0)
+                lift = rel.get("lift", 0)
+                if confidence > threshold:
+                    norm = (1 / (1 + np.exp(-lift)) - 0.5) / 0.5  # sigmoid & normalize
+                    weight = conf_weight * confidence + (1-conf_weight) * norm
+                else:
+                    weight = 0
+                association_scores[(src, tgt)] = weight
+                association_scores[(tgt, src)] = weight
+    return association_scores
+
+
+def reference_group_skills_by_association(topo_order, association_scores, total_hours, input_skills, prereq_graph,
+                                          threshold=0.3, max_portion=1/3):
+    """The original grouping: dict lookups per pair, every candidate group re-summed."""
+    groups = []
+    skill_to_module = {}
+    prereq_map = defaultdict(set)
+    skill_focus_map = {s[0].lower(): s[1] for s in input_skills}
+
+    for src, tgt in prereq_graph.edges():
+        prereq_map[tgt].add(src)
+
+    for skill in topo_order:
+        max_prereq_module = max(
+            [skill_to_module[pre] for pre in prereq_map[skill] if pre in skill_to_module],
+            default=-1
+        )
+
+        best_group = None
+        for idx in range(max_prereq_module + 1, len(groups)):
+            group = groups[idx]
+            new_skill_duration = round(skill_focus_map.get(skill, 0) * total_hours, 1)
+            durations = [round(skill_focus_map.get(s, 0) * total_hours, 1) for s in group]
+            total_duration = sum(durations) + new_skill_duration
+            if len(group) >= 3 or total_duration > max_portion * total_hours:
+                continue
+            score = sum(association_scores.get((skill, other), 0) for other in group)
+            avg_score = score / len(group) if group else 0
+            if avg_score >= threshold:
+                best_group = idx
+                break
+
+        if best_group is not None:
+            groups[best_group].append(skill)
+            skill_to_module[skill] = best_group
+        else:
+            groups.append([skill])
+            skill_to_module[skill] = len(groups) - 1
+
+    return groups
+
+
+def graph_skills(graph_path):
+    return sorted({skill["name"].lower() for skill in load_knowledge_graph(graph_path).get("skills", [])})
+
+
+def test_every_shipped_graph_is_covered():
+    assert GRAPH_PATHS
+
+
+@pytest.mark.parametrize("graph_path", GRAPH_PATHS, ids=lambda path: os.path.basename(path)[:-5])
+@settings(max_examples=60, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(data=st.data())
+def test_grouping_matches_original(graph_path, data):
+    skills = data.draw(st.lists(st.sampled_from(graph_skills(graph_path)), min_size=1, max_size=40, unique=True))
+    focus = data.draw(st.lists(st.floats(0, 1), min_size=len(skills), max_size=len(skills)))
+    input_skills = [[skill, weight, 0.0] for skill, weight in zip(skills, focus)]
+    total_hours = data.draw(st.integers(1, 60)) * data.draw(st.integers(1, 40))
+    assoc_threshold = data.draw(st.sampled_from([0.0, 0.2, 0.42]))
+    conf_weight = data.draw(st.sampled_from([0.5, 0.8, 1.0]))
+    threshold = data.draw(st.sampled_from([0.0, 0.1, 0.3, 0.42]))
+    max_portion = data.draw(st.sampled_from([1/3, 0.5, 1.0]))
+
+    skill_set = set(skills)
+    prereq_graph = build_prereq_graph_from_edges(parse_prerequisite_edges(graph_path, skill_set))
+    order = topological_sort_with_priorities(prereq_graph, skill_set, domain_feedback_arcs(graph_path))
+    reference_scores = reference_parse_association_weights(graph_path, skill_set, assoc_threshold, conf_weight)
+
+    expected = reference_group_skills_by_association(
+        order, reference_scores, total_hours, input_skills, prereq_graph, threshold, max_portion
+    )
+    from_matrix = group_skills_by_association(
+        order, association_submatrix(graph_path, order, assoc_threshold, conf_weight),
+        total_hours, input_skills, prereq_graph, threshold, max_portion
+    )
+    from_dict = group_skills_by_association(
+        order, parse_association_weights(graph_path, skill_set, assoc_threshold, conf_weight),
+        total_hours, input_skills, prereq_graph, threshold, max_portion
+    )
+    assert from_matrix == expected
+    assert from_dict == expected
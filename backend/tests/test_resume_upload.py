@@ -0,0 +1,91 @@
+import hashlib
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.formparsers import MultiPartParser
+
+from caches import resume_analysis_cache
+from routers import user_goal
+
+MAX_BYTES = 4096
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(user_goal, "UPLOAD_DIR", str(tmp_path / "resumes"))
+    monkeypatch.setattr(user_goal, "MAX_RESUME_BYTES", MAX_BYTES)
+    monkeypatch.setattr(user_goal, "MULTIPART_OVERHEAD_BYTES", 1024)
+    monkeypatch.setattr(resume_analysis_cache, "CACHE_DIR", str(tmp_path / "analysis"))
+    app = FastAPI()
+    app.include_router(user_goal.router, prefix="/user-goal")
+    return TestClient(app)
+
+
+@pytest.fixture
+def text_cache_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(user_goal, "cache_resume_text", lambda *args: calls.append(args))
+    return calls
+
+
+@pytest.fixture
+def form_parses(monkeypatch):
+    calls = []
+    original = MultiPartParser.parse
+
+    async def parse(self):
+        calls.append(self)
+        return await original(self)
+
+    monkeypatch.setattr(MultiPartParser, "parse", parse)
+    return calls
+
+
+def saved_files(tmp_path):
+    user_dir = tmp_path / "resumes" / "7"
+    return sorted(os.listdir(user_dir)) if user_dir.exists() else []
+
+
+def test_upload_is_saved_and_hash_passed_to_text_cache(client, text_cache_calls, tmp_path):
+    content = b"python sql docker\n" * 10
+
+    response = client.post("/user-goal/save-resume/7/", files={"file": ("cv.txt", content, "text/plain")})
+
+    assert response.status_code == 200
+    file_hash = hashlib.sha256(content).hexdigest()
+    assert response.json()["sha256"] == file_hash
+    assert (tmp_path / "resumes" / "7" / "resume.txt").read_bytes() == content
+    assert text_cache_calls == [(os.path.join(str(tmp_path / "resumes"), "7", "resume.txt"), file_hash)]
+
+
+def test_oversized_content_length_is_rejected_before_form_parsing(client, text_cache_calls, form_parses, tmp_path):
+    response = client.post("/user-goal/save-resume/7/", files={"file": ("cv.pdf", b"x" * (MAX_BYTES * 2), "application/pdf")})
+
+    assert response.status_code == 413
+    assert form_parses == []
+    assert saved_files(tmp_path) == [] and text_cache_calls == []
+
+
+def test_oversized_streamed_body_is_cut_off_while_received(client, text_cache_calls, tmp_path):
+    boundary = "resume-boundary"
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"cv.pdf\"\r\n"
+            "Content-Type: application/pdf\r\n\r\n").encode()
+    def body():  # no Content-Length: sent chunked
+        yield head
+        yield from [b"x" * 1024] * 16
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    response = client.post("/user-goal/save-resume/7/", content=body(),
+                           headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+
+    assert response.status_code == 413
+    assert saved_files(tmp_path) == [] and text_cache_calls == []
+
+
+def test_file_over_the_limit_within_the_body_cap_is_rejected(client, text_cache_calls, tmp_path):
+    response = client.post("/user-goal/save-resume/7/", files={"file": ("cv.txt", b"x" * (MAX_BYTES + 10), "text/plain")})
+
+    assert response.status_code == 413
+    assert saved_files(tmp_path) == [] and text_cache_calls == []
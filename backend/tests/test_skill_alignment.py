@@ -0,0 +1,40 @@
+from utils.skill_extractor_helper.skill_alignment import SkillAligner, get_skill_aligner
+
+
+def graph(*names, **aliases):
+    return {"skills": [{"id": name, "name": name, "aliases": aliases.get(name, [])} for name in names]}
+
+
+def test_abbreviation_that_is_a_graph_node_stays_distinct():
+    aligner = SkillAligner.from_skill_graphs([graph("js", "java", "kubernetes")])
+
+    alignment = aligner.align([("js", 80.0), ("kubernetes", 60.0)], [("JavaScript", 70.0), ("k8s", 50.0)])
+
+    assert alignment.scores == [("js", 0), ("kubernetes", 50.0)]
+    assert alignment.unmatched_resume == ["JavaScript"]
+
+
+def test_abbreviation_applies_when_not_a_node():
+    aligner = SkillAligner.from_skill_graphs([graph("javascript", "python")])
+
+    alignment = aligner.align([("javascript", 80.0)], [("JS", 70.0)])
+
+    assert alignment.scores == [("javascript", 70.0)]
+
+
+def test_graph_aliases_never_merge_two_nodes():
+    aligner = SkillAligner.from_skill_graphs([
+        graph("postgresql", "sql", postgresql=["postgres", "sql"]),
+    ])
+
+    assert aligner.key("Postgres") == "postgresql"
+    assert aligner.key("sql") == "sql"
+
+
+def test_shipped_graphs_keep_js_separate_in_every_domain():
+    aligner = get_skill_aligner()
+
+    assert aligner.key("js") == "js"
+    assert aligner.key("javascript") == "javascript"
+    assert aligner.key("K8s") == "kubernetes"
+    assert aligner.key("Machine-Learning") == "machine learning"
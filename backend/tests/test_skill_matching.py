@@ -0,0 +1,65 @@
+import difflib
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from utils.schedule_generator_helper.course_selection import is_close_match
+from utils.schedule_generator_helper.skill_matcher import SkillMatcher
+
+# Overlapping, nested and prefix-sharing names, like real skill vocabularies
+SKILLS = [
+    "c", "c++", "c#", "java", "javascript", "script", "sql", "mysql", "nosql", "postgresql",
+    "spring", "spring boot", "boot", "git", "github", "r", "rest", "rest api", "api", ".net", "asp.net",
+    "aa", "aab", "ab", "bab",
+]
+
+
+def brute_force(skills, text):
+    return frozenset(skill for skill in skills if skill and skill in text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", set()),
+    ("javascript", {"java", "javascript", "script", "c", "r"}),
+    ("mysql and postgresql", {"sql", "mysql", "postgresql", "r"}),
+    ("spring boot rest api", {"spring", "spring boot", "boot", "rest", "rest api", "api", "r"}),
+    ("asp.net core with c#", {".net", "asp.net", "c", "c#", "r"}),
+    ("aaab", {"aa", "aab", "ab"}),
+    ("babab", {"ab", "bab"}),
+])
+def test_find_all_table(text, expected):
+    assert SkillMatcher(SKILLS).find_all(text) == frozenset(expected)
+
+
+@settings(max_examples=300, deadline=None)
+@given(
+    skills=st.lists(st.text(alphabet="abc .+#", min_size=0, max_size=5), max_size=15),
+    text=st.text(alphabet="abc .+#", max_size=60),
+)
+def test_find_all_matches_substring_scan(skills, text):
+    assert SkillMatcher(skills).find_all(text) == brute_force(skills, text)
+
+
+@settings(max_examples=200, deadline=None)
+@given(text=st.lists(st.sampled_from(SKILLS + ["x", " ", "-"]), max_size=20).map("".join))
+def test_find_all_matches_substring_scan_on_skill_vocabulary(text):
+    assert SkillMatcher(SKILLS).find_all(text) == brute_force(SKILLS, text)
+
+
+@pytest.mark.parametrize("word, text", [
+    ("java", "java"), ("java", "jav"), ("spring boot", "spring bot"), ("sql", "mysql"),
+    ("kubernetes", "kubernetes fundamentals for developers"), ("", ""), ("", "x"), ("git", ""),
+])
+@pytest.mark.parametrize("cutoff", [0.6, 0.8])
+def test_is_close_match_table(word, text, cutoff):
+    assert is_close_match(word, text, cutoff) == bool(difflib.get_close_matches(word, [text], n=1, cutoff=cutoff))
+
+
+@settings(max_examples=500, deadline=None)
+@given(
+    word=st.text(alphabet="abcde ", max_size=12),
+    text=st.text(alphabet="abcde ", max_size=40),
+    cutoff=st.sampled_from([0.0, 0.5, 0.6, 0.8, 1.0]),
+)
+def test_is_close_match_matches_difflib(word, text, cutoff):
+    assert is_close_match(word, text, cutoff) == bool(difflib.get_close_matches(word, [text], n=1, cutoff=cutoff))
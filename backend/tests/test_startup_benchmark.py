@@ -0,0 +1,32 @@
+from scripts.startup_benchmark import compare_to_baseline, failures
+
+
+def report(main_seconds=1.0, **initializers):
+    return {
+        "main_import": {"ok": True, "wall_seconds": main_seconds},
+        "initializers": {
+            name: {"ok": True, "seconds": seconds} if seconds is not None else {"ok": False, "error": "ImportError"}
+            for name, seconds in initializers.items()
+        },
+    }
+
+
+def test_initializer_failing_now_is_a_regression():
+    regressions = compare_to_baseline(report(mpnet_model=None), report(mpnet_model=2.0), tolerance=0.2, slack=0.1)
+
+    assert regressions == ["mpnet_model: failed (ImportError), ok in baseline"]
+
+
+def test_initializer_failing_in_both_runs_is_not_compared():
+    assert compare_to_baseline(report(mpnet_model=None), report(mpnet_model=None), tolerance=0.2, slack=0.1) == []
+
+
+def test_slowdown_past_tolerance_and_slack_is_a_regression():
+    regressions = compare_to_baseline(report(2.0, course_csv=0.15), report(1.0, course_csv=0.1), tolerance=0.2, slack=0.1)
+
+    assert [line.split(":")[0] for line in regressions] == ["main import"]
+
+
+def test_failures_lists_failed_steps():
+    assert failures(report(create_all=0.2)) == []
+    assert failures(report(create_all=None)) == ["create_all: ImportError"]
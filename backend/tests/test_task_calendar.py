@@ -0,0 +1,233 @@
+"""
+schedule_module walks a LearningCalendar (user-050): the weekday slot pattern is built once and
+learning_dates() jumps straight to the next usable day. This checks it against the original
+day-by-day walk, which stepped through every calendar day and parsed each block's times again,
+on random learning days (gaps between them, days whose share of the hours is too small for a
+block), block layouts (including blocks too short for a session) and course pools. The original
+loops forever once the remaining courses cannot be placed; here it is cut off after
+REFERENCE_MAX_DAYS, and the rewrite must stop on its own (the idle_days guard) with the same
+sessions.
+"""
+
+import copy
+from datetime import datetime, timedelta
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from utils.schedule_generator_helper import task_generator
+from utils.schedule_generator_helper.task_generator import LearningCalendar, WEEKDAYS, _to_label, schedule_module
+
+REFERENCE_MAX_DAYS = 3000
+
+
+def reference_schedule_module(module, start_date, weekly_hours, learning_days, skill_course_dict, user_id):
+    """The original day-by-day walk, cut off after REFERENCE_MAX_DAYS."""
+    module_id = module['module']
+    total_duration = sum([round(d * 2) / 2 for d in module['duration']])
+    skills = module['skills']
+    scheduled_sessions = []
+    current_date = start_date
+    hours_remaining = total_duration
+
+    course_pool = []
+    for skill in skills:
+        for course in skill_course_dict.get(skill, []):
+            course_entry = copy.deepcopy(course)
+            course_entry['remaining'] = round(course_entry['duration'] * 2) / 2
+            course_entry['skill'] = skill
+            course_pool.append(course_entry)
+    course_pool.sort(key=lambda x: -x['duration'])
+
+    if weekly_hours <= hours_remaining:
+        daily_hours = task_generator.distribute_weekly_hours(weekly_hours, learning_days)
+    else:
+        daily_hours = task_generator.distribute_short_hours(hours_remaining, learning_days)
+
+    block_plan = {}
+    for day_name, hours in daily_hours.items():
+        if hours < 0.5:
+            continue
+        if hours not in task_generator.block_cache:
+            task_generator.block_cache[hours] = task_generator.generate_learning_blocks(hours)
+        block_plan[day_name] = task_generator.block_cache[hours]
+
+    while hours_remaining > 0.0 and current_date < start_date + timedelta(days=REFERENCE_MAX_DAYS):
+        day_name = current_date.strftime("%A")
+        if not learning_days.get(day_name, False) or day_name not in block_plan:
+            current_date += timedelta(days=1)
+            continue
+
+        blocks = block_plan[day_name]
+        used_today = set()
+        one_course_left = len([c for c in course_pool if c['remaining'] >= 0.5]) == 1
+        if one_course_left:
+            break
+
+        for block in blocks:
+            block_start = datetime.strptime(f"{current_date.date()} {block['start']}", "%Y-%m-%d %H:%M")
+            block_end = datetime.strptime(f"{current_date.date()} {block['end']}", "%Y-%m-%d %H:%M")
+            block_duration = round(((block_end - block_start).seconds / 3600) * 2) / 2
+            for course in course_pool:
+                remaining = round(course['remaining'] * 2) / 2
+                if remaining < 0.5:
+                    continue
+                if not one_course_left and course['title'] in used_today:
+                    continue
+
+                allocated = min(remaining, block_duration)
+                allocated = round(allocated * 2) / 2
+                if allocated < 1.0:
+                    continue
+
+                actual_end = block_start + timedelta(hours=allocated)
+
+                scheduled_sessions.append({
+                    'user_id': user_id,
+                    'module': module_id,
+                    'skill': course['skill'],
+                    'date': current_date.strftime("%Y-%m-%d"),
+                    'resource_name': course['title'],
+                    'resource_url': course['link'],
+                    'thumbnail_url': course['image_link'],
+                    'start': block_start.strftime("%H:%M"),
+                    'end': actual_end.strftime("%H:%M"),
+                    "status": "pending"
+                })
+
+                course['remaining'] -= allocated
+                course['remaining'] = round(course['remaining'] * 2) / 2
+
+                if course['remaining'] < 0.5:
+                    course['remaining'] = 0.0
+                elif 0.5 <= course['remaining'] < 1.0:
+                    course['remaining'] = 1.0
+
+                used_today.add(course['title'])
+                break
+
+        hours_remaining = round(
+            sum(c['remaining'] for c in course_pool if c['remaining'] >= 0.5) * 2
+        ) / 2
+        current_date += timedelta(days=1)
+
+    return scheduled_sessions
+
+
+def course(title, duration):
+    return {"title": title, "duration": duration, "link": f"https://example.com/{title}", "image_link": ""}
+
+
+@pytest.fixture
+def fixed_blocks(monkeypatch):
+    """Serve every day's hours with the given blocks instead of solving for them."""
+    def use(blocks):
+        monkeypatch.setattr(task_generator, "block_cache", {})
+        monkeypatch.setattr(task_generator, "generate_learning_blocks", lambda hours: blocks)
+    return use
+
+
+def days(*names):
+    return {day: day in names for day in WEEKDAYS}
+
+
+def both(*args):
+    return schedule_module(*args), reference_schedule_module(*args)
+
+
+def test_gaps_between_learning_days(fixed_blocks):
+    fixed_blocks([{"start": "09:00", "end": "11:00"}, {"start": "19:00", "end": "20:30"}])
+    module = {"module": 1, "skills": ["sql", "git"], "duration": [12, 6]}
+    suggestions = {"sql": [course("sql-a", 7.5), course("sql-b", 4)], "git": [course("git-a", 6)]}
+    start = datetime(2025, 3, 4)  # a Tuesday: the first learning day is two days out
+
+    sessions, expected = both(module, start, 4, days("Monday", "Thursday"), suggestions, 7)
+
+    assert sessions == expected
+    assert {datetime.strptime(s["date"], "%Y-%m-%d").strftime("%A") for s in sessions} == {"Monday", "Thursday"}
+
+
+def test_idle_guard_stops_when_no_block_fits_a_session(fixed_blocks):
+    # Every block rounds to 0.5h, below the 1h minimum session: the original never returned
+    fixed_blocks([{"start": "09:00", "end": "09:30"}, {"start": "18:00", "end": "18:40"}])
+    module = {"module": 1, "skills": ["docker"], "duration": [10]}
+    suggestions = {"docker": [course("docker-a", 5), course("docker-b", 5)]}
+    args = (module, datetime(2025, 3, 3), 6, days("Monday", "Wednesday", "Saturday"), suggestions, 7)
+
+    assert schedule_module(*args) == reference_schedule_module(*args) == []
+
+
+def test_session_end_is_clamped_to_the_day():
+    assert _to_label(23 * 60 + 30) == "23:30"
+    assert _to_label(24 * 60) == "23:59"
+    assert _to_label(24 * 60 + 45) == "23:59"
+
+
+def test_block_rounding_up_to_midnight_ends_at_2359(fixed_blocks):
+    # 23:00-23:50 rounds to a 1h block; the original wrapped the session end to "00:00"
+    fixed_blocks([{"start": "23:00", "end": "23:50"}])
+    module = {"module": 1, "skills": ["git"], "duration": [3]}
+    suggestions = {"git": [course("git-a", 2), course("git-b", 1)]}
+
+    sessions = schedule_module(module, datetime(2025, 3, 3), 3, days("Monday"), suggestions, 7)
+
+    assert sessions
+    assert {(s["start"], s["end"]) for s in sessions} == {("23:00", "23:59")}
+
+
+def test_calendar_rejects_blocks_past_midnight():
+    with pytest.raises(ValueError):
+        LearningCalendar(days("Friday"), {"Friday": [{"start": "22:00", "end": "01:00"}]})
+
+
+def test_real_learning_blocks_match_original():
+    # Blocks solved by generate_learning_blocks (08:00-21:00), as generate_schedule uses them
+    module = {"module": 1, "skills": ["python", "sql"], "duration": [14, 9]}
+    suggestions = {"python": [course("py-a", 9), course("py-b", 5)], "sql": [course("sql-a", 8.5), course("sql-b", 1)]}
+    for learning_days, weekly_hours in [(days("Monday", "Friday"), 5), (days("Saturday", "Sunday"), 12),
+                                        (days(*WEEKDAYS), 30), (days("Tuesday"), 2)]:
+        sessions, expected = both(module, datetime(2025, 6, 11), weekly_hours, learning_days, suggestions, 3)
+        assert sessions == expected
+
+
+@st.composite
+def block_layouts(draw):
+    """Non-overlapping blocks from 15 minutes to 4h, all ending by 23:30 (so rounding never reaches midnight)."""
+    blocks = []
+    minute = draw(st.integers(0, 40)) * 15
+    for _ in range(draw(st.integers(1, 4))):
+        length = draw(st.integers(1, 16)) * 15
+        if minute + length > 23 * 60 + 30:
+            break
+        blocks.append({"start": _to_label(minute), "end": _to_label(minute + length)})
+        minute += length + draw(st.integers(0, 16)) * 15
+    return blocks
+
+
+@settings(max_examples=300, deadline=None)
+@given(data=st.data())
+def test_calendar_walk_matches_original(data):
+    learning_days = dict(zip(WEEKDAYS, data.draw(st.lists(st.booleans(), min_size=7, max_size=7).filter(any))))
+    layouts = data.draw(st.lists(block_layouts(), min_size=1, max_size=4))
+    titles = st.sampled_from(["a", "b", "c", "d", "e", "f"])
+    skills = data.draw(st.lists(st.sampled_from(["python", "sql", "git", "docker"]), min_size=1, max_size=3, unique=True))
+    suggestions = {
+        skill: [course(data.draw(titles), data.draw(st.integers(1, 80)) / 4)
+                for _ in range(data.draw(st.integers(0, 4)))]
+        for skill in skills
+    }
+    module = {
+        "module": 1,
+        "skills": skills,
+        "duration": data.draw(st.lists(st.integers(0, 120).map(lambda q: q / 4), min_size=1, max_size=3)),
+    }
+    weekly_hours = data.draw(st.integers(1, 30))
+    start = datetime(2024, 1, 1) + timedelta(days=data.draw(st.integers(0, 900)))
+
+    with pytest.MonkeyPatch.context() as mp:
+        # Days with the same hours share a layout, as they share block_cache entries for real
+        mp.setattr(task_generator, "block_cache", {})
+        mp.setattr(task_generator, "generate_learning_blocks", lambda hours: layouts[int(hours * 2) % len(layouts)])
+        sessions, expected = both(module, start, weekly_hours, learning_days, suggestions, 5)
+
+    assert sessions == expected
@@ -0,0 +1,133 @@
+import random
+import threading
+import time
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures; while open, calls fail fast.
+    After `reset_timeout` seconds one trial call is let through (half-open): success closes
+    the circuit again, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class PooledHttpClient:
+    """
+    Shared HTTP client: one keep-alive connection pool, connect/read timeouts, a circuit
+    breaker per URL and per-call latency metrics (`http.<name>`). Retrying is left to the
+    caller, which can use `sleep_backoff(attempt)` for exponential backoff with full jitter.
+    """
+
+    def __init__(self, name, connect_timeout=3.05, read_timeout=60.0, pool_maxsize=10,
+                 failure_threshold=5, reset_timeout=30.0, backoff_base=0.5, backoff_max=8.0):
+        self.name = name
+        self.timeout = (connect_timeout, read_timeout)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url) -> CircuitBreaker:
+        with self._lock:
+            if url not in self._breakers:
+                self._breakers[url] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[url]
+
+    def post_json(self, url, payload) -> requests.Response:
+        """
+        Single POST attempt. Connection errors, timeouts and 5xx/429 responses count as
+        failures for the circuit breaker; the response is returned either way.
+        """
+        breaker = self.breaker(url)
+        if not breaker.allow_request():
+            metrics.incr(f"http.{self.name}.circuit_open")
+            raise CircuitOpenError(f"Circuit open for {self.name} ({url})")
+
+        start_time = time.perf_counter()
+        try:
+            response = self.session.post(url, json=payload, timeout=self.timeout)
+        except requests.RequestException:
+            breaker.record_failure()
+            metrics.incr(f"http.{self.name}.errors")
+            raise
+        finally:
+            metrics.observe(f"http.{self.name}", time.perf_counter() - start_time)
+
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+            metrics.incr(f"http.{self.name}.errors")
+        else:
+            breaker.record_success()
+        return response
+
+    def backoff_delay(self, attempt) -> float:
+        """Exponential backoff with full jitter: uniform(0, min(max, base * 2^attempt))."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def sleep_backoff(self, attempt):
+        time.sleep(self.backoff_delay(attempt))
@@ -0,0 +1,169 @@
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import metrics
+
+# Process-wide gateway for every LLM call: pooled clients, a cap on in-flight requests,
+# retries with backoff and per-call metrics (`llm.<purpose>` latency, token counters).
+# LLM_BACKEND=stub swaps Gemini for a local canned responder (tests, load runs).
+GEMINI_MODEL = "gemini-2.0-flash"
+# Point the Gemini client at another endpoint (e.g. a local fake LLM server for tests/load runs)
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL")
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_BACKOFF_BASE = 1.0
+LLM_BACKOFF_MAX = 16.0
+
+
+class LLMResponse:
+    __slots__ = ("text", "prompt_tokens", "output_tokens")
+
+    def __init__(self, text, prompt_tokens=0, output_tokens=0):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.output_tokens = output_tokens
+
+
+class GeminiBackend:
+    """google-genai backend: one client per API key for the whole process (reuses its connection pool)."""
+
+    name = "gemini"
+
+    def __init__(self, base_url=None, timeout=LLM_TIMEOUT_SECONDS):
+        self.base_url = base_url or GEMINI_BASE_URL
+        self.timeout = timeout
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def client(self, api_key):
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                from google import genai
+
+                http_options = {"timeout": int(self.timeout * 1000)}
+                if self.base_url:
+                    http_options["base_url"] = self.base_url
+                client = self._clients[api_key] = genai.Client(api_key=api_key, http_options=http_options)
+            return client
+
+    def generate(self, prompt, model, api_key) -> LLMResponse:
+        response = self.client(api_key).models.generate_content(model=model, contents=prompt)
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            response.text,
+            getattr(usage, "prompt_token_count", None) or 0,
+            getattr(usage, "candidates_token_count", None) or 0,
+        )
+
+
+class StubBackend:
+    """
+    Local stand-in for the real LLM. `responder(prompt) -> str` builds the answer
+    (default: LLM_STUB_RESPONSE, "[]" if unset); `latency` simulates a slow upstream.
+    """
+
+    name = "stub"
+
+    def __init__(self, responder: Optional[Callable[[str], str]] = None,
+                 latency=float(os.getenv("LLM_STUB_LATENCY", "0"))):
+        default_text = os.getenv("LLM_STUB_RESPONSE", "[]")
+        self.responder = responder or (lambda prompt: default_text)
+        self.latency = latency
+
+    def generate(self, prompt, model, api_key) -> LLMResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        text = self.responder(prompt)
+        return LLMResponse(text, len(prompt) // 4, len(text) // 4)
+
+
+class LLMGateway:
+    def __init__(self, backend, max_concurrency=LLM_MAX_CONCURRENCY, max_retries=LLM_MAX_RETRIES,
+                 backoff_base=LLM_BACKOFF_BASE, backoff_max=LLM_BACKOFF_MAX):
+        self.backend = backend
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._semaphore = threading.BoundedSemaphore(max(max_concurrency, 1))
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _set_in_flight(self, delta):
+        with self._lock:
+            self._in_flight += delta
+            metrics.set_gauge("llm.in_flight", self._in_flight)
+
+    @staticmethod
+    def _is_retryable(error) -> bool:
+        # google-genai APIError carries the HTTP status in `code`; other client errors won't succeed on retry
+        code = getattr(error, "code", None)
+        return not (isinstance(code, int) and 400 <= code < 500 and code != 429)
+
+    def backoff_delay(self, attempt) -> float:
+        """Exponential backoff with full jitter: uniform(0, min(max, base * 2^attempt))."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def generate(self, prompt, api_key=None, model=GEMINI_MODEL, purpose="generate") -> str:
+        """Send one prompt and return the response text; raises the last error once retries run out."""
+        attempts = max(1, self.max_retries)  # LLM_MAX_RETRIES=0 still makes the call once
+        for attempt in range(1, attempts + 1):
+            wait_start = time.perf_counter()
+            with self._semaphore:
+                metrics.observe("llm.wait", time.perf_counter() - wait_start)
+                self._set_in_flight(1)
+                start_time = time.perf_counter()
+                try:
+                    response = self.backend.generate(prompt, model, api_key)
+                except Exception as e:
+                    metrics.incr(f"llm.{purpose}.errors")
+                    if attempt == attempts or not self._is_retryable(e):
+                        raise
+                    print(f"⚠️ LLM call failed (attempt {attempt}/{attempts}): {e}")
+                    metrics.incr(f"llm.{purpose}.retries")
+                    delay = self.backoff_delay(attempt - 1)
+                else:
+                    metrics.incr(f"llm.{purpose}.calls")
+                    metrics.incr(f"llm.{purpose}.prompt_tokens", response.prompt_tokens)
+                    metrics.incr(f"llm.{purpose}.output_tokens", response.output_tokens)
+                    return response.text
+                finally:
+                    metrics.observe(f"llm.{purpose}", time.perf_counter() - start_time)
+                    self._set_in_flight(-1)
+            time.sleep(delay)  # outside the semaphore so waiting callers can use the slot
+
+
+_BACKENDS: Dict[str, Callable[[], object]] = {
+    "gemini": GeminiBackend,
+    "stub": StubBackend,
+}
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            if LLM_BACKEND not in _BACKENDS:
+                raise ValueError(f"Unknown LLM_BACKEND: {LLM_BACKEND}")
+            _gateway = LLMGateway(_BACKENDS[LLM_BACKEND]())
+        return _gateway
+
+
+def set_llm_backend(backend):
+    """Swap the backend of the shared gateway (e.g. a StubBackend in tests or load runs)."""
+    global _gateway
+    with _gateway_lock:
+        _gateway = LLMGateway(backend)
+    return _gateway
+
+
+def generate_text(prompt, api_key=None, model=GEMINI_MODEL, purpose="generate") -> str:
+    return get_llm_gateway().generate(prompt, api_key=api_key, model=model, purpose=purpose)
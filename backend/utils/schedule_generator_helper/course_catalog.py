@@ -0,0 +1,74 @@
+import os
+
+import pandas as pd
+
+from caches.course_catalog_cache import catalog_key, get_cached_catalog, cache_catalog
+from .course_selection import course_difficulty_features
+from .module_generator import load_knowledge_graph
+from .skill_matcher import SkillMatcher
+
+
+def course_full_text(title, description):
+    """Lowercase text the match scorer searches for skill mentions."""
+    return f"{title.lower()} {description.lower()}"
+
+
+def domain_skill_names(course_df, skill_graph_path=None):
+    """Every skill of a domain: the catalog's skill column plus the skill graph's skills."""
+    names = {str(skill).lower() for skill in course_df["skill"].dropna()}
+    if skill_graph_path and os.path.exists(skill_graph_path):
+        knowledge_graph = load_knowledge_graph(skill_graph_path)
+        names.update(skill["name"].lower() for skill in knowledge_graph.get("skills", []))
+        for rel in knowledge_graph.get("relationships", []):
+            names.update((rel["source"].lower(), rel["target"].lower()))
+    return names
+
+
+def tag_courses(course_df, matcher):
+    """
+    {row index: frozenset of the matcher's skills mentioned in the course's title + description}.
+    The same course appears once per skill it is listed under, so each distinct text is scanned once.
+    Rows without text are left out (the scorer then falls back to plain substring checks).
+    """
+    tags_by_text = {}
+    course_tags = {}
+    for index, title, description in course_df[["title", "description"]].itertuples():
+        if not isinstance(title, str) or not isinstance(description, str):
+            continue
+        full_text = course_full_text(title, description)
+        tags = tags_by_text.get(full_text)
+        if tags is None:
+            tags = tags_by_text[full_text] = matcher.find_all(full_text)
+        course_tags[index] = tags
+    return course_tags
+
+
+class CourseCatalog:
+    """
+    A domain's course table plus the per-course features used by course scoring (skill tags for
+    match scoring, difficulty and certificate flag for difficulty scoring), computed once when
+    the catalog is loaded. `courses` is shared between requests: treat it as read-only.
+    """
+
+    __slots__ = ("courses", "matcher", "skill_tags", "difficulty_features")
+
+    def __init__(self, courses, skill_names=()):
+        self.courses = courses
+        self.matcher = SkillMatcher(skill_names)
+        self.skill_tags = tag_courses(courses, self.matcher)
+        self.difficulty_features = course_difficulty_features(courses)
+
+    @property
+    def tagged_skills(self):
+        return self.matcher.patterns
+
+
+def load_course_catalog(csv_path, skill_graph_path=None):
+    """Cached CourseCatalog for a catalog CSV; reloaded when the CSV or the skill graph changes."""
+    key = catalog_key(csv_path, skill_graph_path)
+    catalog = get_cached_catalog(key)
+    if catalog is None:
+        course_df = pd.read_csv(csv_path)
+        catalog = CourseCatalog(course_df, domain_skill_names(course_df, skill_graph_path))
+        cache_catalog(key, catalog)
+    return catalog
@@ -1,11 +1,19 @@
 
 import numpy as np
-from pulp import LpProblem, LpMaximize, LpVariable, lpSum, lpSum, PULP_CBC_CMD
+import pandas as pd
 from collections import defaultdict
+from utils.skill_gap import normalize_weights
+from .course_solver import (
+    COURSE_SOLVER_TIME_LIMIT, GLOBAL_CANDIDATES_PER_SKILL, SkillCandidates,
+    course_selection_template, solve_global_course_selection,
+)
+from .skill_graph import SkillDiGraph
 
 
 
 def build_prereq_map(prereq_graph):
+    if isinstance(prereq_graph, SkillDiGraph):
+        return prereq_graph.predecessor_map()  # cached reverse adjacency
     prereq_map = defaultdict(set)
     for src, tgt in prereq_graph.edges():
         prereq_map[tgt].add(src)
@@ -25,15 +33,8 @@ def standardize_focus_scores(skill_list):
     Returns:
     - list: A standardized skill list where focus scores sum to 1.
     """
-    # Extract focus scores
-    focus_scores = np.array([entry[1] for entry in skill_list], dtype=np.float64)
-
-    # Normalize so the sum equals 1
-    total_focus = np.sum(focus_scores)
-    if total_focus > 0:
-        normalized_focus_scores = focus_scores / total_focus
-    else:
-        normalized_focus_scores = focus_scores  # If total is 0, keep them unchanged
+    # Normalize so the sum equals 1 (unchanged if the total is 0)
+    normalized_focus_scores = normalize_weights([entry[1] for entry in skill_list])
 
     # Update skill list with standardized focus scores
     standardized_skill_list = [[skill[0], float(focus), skill[2]] for skill, focus in zip(skill_list, normalized_focus_scores)]
@@ -44,105 +45,162 @@ import difflib
 
 from sklearn.discriminant_analysis import StandardScaler
 
-def compute_match_score(course_title, course_description, main_skill, all_skills, modules, prereq_graph):
+class ScoringContext:
+    """
+    Per-request lookups for course match scoring, built once per suggest_courses call instead
+    of once per course row: lowercase skill names, each skill's module peers and its
+    direct prerequisites.
+    """
+
+    __slots__ = ("skill_names", "module_peers", "prereq_map", "tagged_skills")
+
+    def __init__(self, all_skills, modules, prereq_graph, tagged_skills=()):
+        self.skill_names = [s[0].lower() if isinstance(s, (list, tuple)) else s.lower() for s in all_skills]
+        self.prereq_map = build_prereq_map(prereq_graph)
+        # Skills the catalog's per-course tags were computed for (see CourseCatalog)
+        self.tagged_skills = frozenset(tagged_skills)
+        # Skills of the first module containing each skill, minus the skill itself
+        self.module_peers = {}
+        for module in modules:
+            for skill in module["skills"]:
+                if skill not in self.module_peers:
+                    self.module_peers[skill] = set(module["skills"]) - {skill}
+
+    def same_module_skills(self, skill):
+        return self.module_peers.get(skill, ())
+
+    def prerequisites(self, skill):
+        return self.prereq_map.get(skill, set())
+
+    def mentions(self, skill, full_text, skill_tags):
+        """`skill in full_text`, answered from the course's precomputed tags when it has them."""
+        if skill_tags is not None and skill in self.tagged_skills:
+            return skill in skill_tags
+        return skill in full_text
+
+
+def is_close_match(word, text, cutoff=0.8):
+    """
+    Same answer as difflib.get_close_matches(word, [text], cutoff=cutoff), but skips the scan when
+    the lengths alone rule a match out (difflib's real_quick_ratio bound) — e.g. a skill name
+    against a whole course description.
+    """
+    total = len(word) + len(text)
+    if total and 2.0 * min(len(word), len(text)) / total < cutoff:
+        return False
+    return bool(difflib.get_close_matches(word, [text], n=1, cutoff=cutoff))
+
+
+def compute_match_score(course_title, course_description, main_skill, context, skill_tags=None):
     """
     Compute a course's match score based on:
     - Title match with main skill
     - Mentions of other skills from same module
     - Mentions of prerequisites of the main skill
+    `context` is the request's ScoringContext; `skill_tags` the course's precomputed skill
+    mentions from its CourseCatalog, if any.
     """
 
-    # Normalize course text and skills
+    # Normalize course text
     title = course_title.lower()
     description = course_description.lower()
     full_text = f"{title} {description}"
-    all_skill_names = [s[0].lower() if isinstance(s, (list, tuple)) else s.lower() for s in all_skills]
     main_skill = main_skill.lower()
-    prereq_map = build_prereq_map(prereq_graph)
 
     score = 0.0
 
     # --- 1. Title Matching Boost ---
     if main_skill in title:
         score += 2.0  # Strong boost for exact match
-    else:
-        close_matches = difflib.get_close_matches(main_skill, [title], n=1, cutoff=0.8)
-        if close_matches:
-            score += 1.2  # Partial match
+    elif is_close_match(main_skill, title):
+        score += 1.2  # Partial match
 
     # --- 2. Module Group Boost ---
-    for module in modules:
-        if main_skill in module["skills"]:
-            same_module_skills = set(module["skills"]) - {main_skill}
-            for skill in same_module_skills:
-                if skill.lower() in full_text:
-                    score += 0.5
-                else:
-                    matches = difflib.get_close_matches(skill.lower(), [full_text], n=1, cutoff=0.8)
-                    if matches:
-                        score += 0.3
-            break
+    for skill in context.same_module_skills(main_skill):
+        skill = skill.lower()
+        if context.mentions(skill, full_text, skill_tags):
+            score += 0.5
+        elif is_close_match(skill, full_text):
+            score += 0.3
 
     # --- 3. Prerequisite Boost ---
-    prereqs = prereq_map.get(main_skill, set())
+    prereqs = context.prerequisites(main_skill)
     for prereq in prereqs:
-        if prereq.lower() in full_text:
+        prereq = prereq.lower()
+        if context.mentions(prereq, full_text, skill_tags):
             score += 0.4
-        else:
-            matches = difflib.get_close_matches(prereq.lower(), [full_text], n=1, cutoff=0.8)
-            if matches:
-                score += 0.2
+        elif is_close_match(prereq, full_text):
+            score += 0.2
 
     return round(score, 3)
 
 
-def compute_difficulty_scores(row, main_skill, skill_list):
+def get_ideal_difficulty(confidence):
+    """Course difficulty (1–3 scale) that suits a learner with this confidence in the skill."""
+    if confidence >= 0.5:
+        return 3
+    elif confidence >= 0.3:
+        return 2
+    elif confidence >= 0.2:
+        return 1.5
+    elif confidence >= 0.1:
+        return 1
+    return 0
+
+
+def get_certificate_score(confidence):
+    """Bonus for professional certificates: worth it for confident learners, not for beginners."""
+    if confidence >= 0.6:
+        return 10
+    elif confidence <= 0.3:
+        return -10
+    return 0
+
+
+def course_difficulty_features(course_df):
+    """
+    Catalog-constant inputs of the difficulty model, one row per course: numeric difficulty and
+    the professional-certificate flag. Computed once per catalog (see CourseCatalog).
+    """
+    return pd.DataFrame(
+        {
+            "difficulty": course_df["difficulty_numeric"].to_numpy(dtype=np.float64),
+            "is_certificate": (course_df["course_type"] == "Certificate").to_numpy(),
+        },
+        index=course_df.index,
+    )
+
+
+def compute_difficulty_scores(course_difficulty, is_certificate, confidence):
     """
-    Apply difficulty score computation to all courses in the dataset using the confidence level of the main skill.
+    Difficulty scores for all of a skill's courses at once, given the learner's confidence in it:
+    1 - |ideal difficulty - course difficulty|, plus the certificate score for certificates.
     Parameters:
-    - course_df (DataFrame): The dataset containing course information.
-    - main_skill (str): The main skill for which courses are being evaluated.
-    - skill_list (list): A list of skills with their focus-score and confidence level.
+    - course_difficulty (array): The courses' numeric difficulty.
+    - is_certificate (array of bool): Whether each course is a professional certificate.
+    - confidence (float): The user's confidence level in the main skill.
     Returns:
-    - DataFrame: The original DataFrame with an added 'difficulty_score' column.
+    - array: The difficulty score of each course.
     """
+    difficulty_penalty = np.abs(get_ideal_difficulty(confidence) - np.asarray(course_difficulty, dtype=np.float64))
+    certificate_score = np.where(is_certificate, get_certificate_score(confidence), 0)
+    return 1 - difficulty_penalty + certificate_score
 
-    # Function to determine the ideal difficulty based on confidence
-    def get_ideal_difficulty(confidence):
-        if confidence >= 0.5:
-            diff = 3
-        elif confidence >= 0.3:
-            diff = 2
-        elif confidence >= 0.2:
-            diff = 1.5
-        elif confidence >= 0.1:
-            diff = 1
-        else:
-            diff = 0
-        return diff
-
-    # Function to compute difficulty score for a single course row
-    def get_difficulty_score(course_difficulty, user_confidence, is_pro_certificate):
-        ideal_difficulty = get_ideal_difficulty(user_confidence)
-        difficulty_penalty = 1 * np.abs(ideal_difficulty - course_difficulty)
-        if is_pro_certificate and user_confidence >= 0.6:
-            certificate_score = 10
-        elif is_pro_certificate and user_confidence <= 0.3:
-            certificate_score = -10
-        else:
-            certificate_score = 0
-        return 1-difficulty_penalty + certificate_score
-
-    
-    main_skill_confidence = next((conf for skill, focus, conf in skill_list if skill.lower() == main_skill.lower()), 0)
-    return get_difficulty_score(
-        course_difficulty=row["difficulty_numeric"],
-        user_confidence=main_skill_confidence,
-        is_pro_certificate=(row["course_type"] == "Certificate")
+def course_objective(courses, alpha, beta, lambda_, gamma):
+    """
+    Objective coefficient of each course: maximize skill match, difficulty and review score while
+    minimizing price, with a cost of `gamma` per selected course.
+    """
+    return (
+        courses["match_score"].to_numpy() +
+        alpha * courses["difficulty_score"].to_numpy() +
+        beta * courses["wilson_score"].to_numpy() -
+        lambda_ * courses["price"].to_numpy() -
+        gamma
     )
 
 # Function to solve the ILP for selecting courses with a dynamic duration constraint
-def solve_course_selection_pulp(course_df, skill, D_ideal, alpha, beta, lambda_, gamma):
+def solve_course_selection_pulp(course_df, skill, D_ideal, alpha, beta, lambda_, gamma, time_limit=COURSE_SOLVER_TIME_LIMIT):
     """
     Solves the ILP for selecting courses that maximize skill match and difficulty score while minimizing price,
     while ensuring the total selected duration stays within ±10% of the ideal duration.
@@ -150,56 +208,88 @@ def solve_course_selection_pulp(course_df, skill, D_ideal, alpha, beta, lambda_,
     Parameters:
     - course_df (DataFrame): The dataset containing courses with relevant fields.
     - skill (str): The skill being optimized in this iteration.
-    - skill_list (list): A list of skills with their focus-score and confidence level.
     - D_ideal (float): The ideal duration for the selected courses.
     - alpha, gamma, lambda_, beta: Weight parameters for optimization.
+    - time_limit (float): CBC time limit in seconds.
 
     Returns:
     - Selected courses as a list of course indices.
     """
 
     # Extract relevant courses for the given skill
-    relevant_courses = course_df[course_df["skill"].str.lower() == skill.lower()].copy()
+    relevant_courses = course_df[course_df["skill"].str.lower() == skill.lower()]
     if relevant_courses.empty:
         return []  # No courses available for this skill
 
-    # Define decision variables (binary: select or not)
-    x = {i: LpVariable(f"x_{i}", cat="Binary") for i in relevant_courses.index}
-
-    # Define the ILP problem
-    problem = LpProblem("Course_Selection", LpMaximize)
-
-    match_score = lpSum(relevant_courses.loc[i, "match_score"] * x[i] for i in relevant_courses.index)
-    difficulty_score = lpSum(relevant_courses.loc[i, "difficulty_score"] * x[i] for i in relevant_courses.index)
-    wilson_score = lpSum(relevant_courses.loc[i, "wilson_score"] * x[i] for i in relevant_courses.index)
-    price_score = lpSum(relevant_courses.loc[i, "price"] * x[i] for i in relevant_courses.index)
-    number_score = lpSum(x[i] for i in relevant_courses.index)
-
-    # Objective Function: Maximize average skill match, difficulty, and review score while minimizing price
-    problem += (
-        match_score +
-        alpha * difficulty_score +
-        beta * wilson_score -
-        lambda_ * price_score -
-        gamma *  number_score
+    objective = course_objective(relevant_courses, alpha, beta, lambda_, gamma)
+
+    # Skill coverage: at least 2 courses; duration: within ±10% of the ideal duration
+    duration_tolerance = 0.1 * D_ideal
+    template = course_selection_template(skill.lower(), relevant_courses.index, relevant_courses["duration"].to_numpy())
+    result = template.solve(objective, D_ideal - duration_tolerance, D_ideal + duration_tolerance, time_limit)
+    print(f"course selection '{skill}': {result.status} in {result.solve_seconds:.3f}s "
+          f"(gap {result.gap if result.gap is not None else 'n/a'}, warm start {result.warm_started})")
+
+    return result.selected
+
+def prepare_course_scoring(course_df, skill_list, module_skills, prereq_graph, catalog=None):
+    """
+    Per-request scoring inputs shared by every skill: the ScoringContext, the catalog's course
+    skill tags and difficulty features (computed here when there is no catalog), and each
+    skill's confidence (the first one listed).
+    """
+    course_tags = catalog.skill_tags if catalog is not None else {}
+    tagged_skills = catalog.tagged_skills if catalog is not None else ()
+    scoring_context = ScoringContext(skill_list, module_skills, prereq_graph, tagged_skills)
+    difficulty_features = (
+        catalog.difficulty_features if catalog is not None else course_difficulty_features(course_df)
     )
-    
+    skill_confidence = {}
+    for entry in skill_list:
+        skill_confidence.setdefault(entry[0].lower(), entry[2])
+    return scoring_context, course_tags, difficulty_features, skill_confidence
 
-    # Skill Coverage Constraint: At least 2 courses must be selected
-    problem += lpSum(x[i] for i in relevant_courses.index) >= 2
 
-    # Duration Constraint: Total selected duration must be within ±10% of the ideal duration
-    duration_tolerance = 0.1 * D_ideal
-    problem += lpSum(relevant_courses.loc[i, "duration"] * x[i] for i in relevant_courses.index) <= (D_ideal + duration_tolerance)
-    problem += lpSum(relevant_courses.loc[i, "duration"] * x[i] for i in relevant_courses.index) >= (D_ideal - duration_tolerance)
+def score_skill_courses(embedding_model, course_df, main_skill, scoring):
+    """
+    The courses of `main_skill` with match and difficulty scores, and the match, difficulty,
+    price and review columns standardized over those courses (empty when the skill has none).
+    `scoring` comes from prepare_course_scoring.
+    """
+    scoring_context, course_tags, difficulty_features, skill_confidence = scoring
+    courses = extract_courses_for_skill(course_df, main_skill)
+    if courses.empty:
+        return courses
 
-    # Solve the ILP
-    problem.solve(PULP_CBC_CMD(msg=False))
+    courses["description_embedding"] = courses["description"].apply(
+        lambda text: embedding_model.encode(text, convert_to_tensor=True)
+    )
+    courses["title_embedding"] = courses["title"].apply(
+        lambda text: embedding_model.encode(text, convert_to_tensor=True)
+    )
+    courses["match_score"] = courses.apply(
+        lambda row: compute_match_score(
+            row["title"],
+            row["description"],
+            main_skill,
+            scoring_context,
+            course_tags.get(row.name)
+        ),
+        axis=1
+    )
+    features = difficulty_features.loc[courses.index]
+    courses["difficulty_score"] = compute_difficulty_scores(
+        features["difficulty"].to_numpy(),
+        features["is_certificate"].to_numpy(),
+        skill_confidence.get(main_skill, 0)
+    )
 
-    # Extract selected courses
-    selected_courses = [i for i in relevant_courses.index if x[i].varValue == 1]
+    # Normalize scores
+    scaler = StandardScaler()
+    for col in ["match_score", "difficulty_score", "price", "wilson_score"]:
+        courses[col] = scaler.fit_transform(courses[[col]])
+    return courses
 
-    return selected_courses
 
 def suggest_courses(
     embedding_model,
@@ -214,47 +304,24 @@ def suggest_courses(
     alpha=0.5,
     beta=0.5,
     lambda_=0.5,
-    gamma=1
+    gamma=1,
+    catalog=None
 ):
+    # `catalog`: the CourseCatalog course_df comes from, to score with its precomputed skill tags
     result = {}
     skill_list = standardize_focus_scores(skill_list)
-    scaler = StandardScaler()
+    scoring = prepare_course_scoring(course_df, skill_list, module_skills, prereq_graph, catalog)
 
     for [skill, focus, confidence] in skill_list:
         main_skill = skill.lower()
         D_ideal = int(portion * total_weeks * weekly_hours * focus)
 
-        # Extract + preprocess courses
-        courses = extract_courses_for_skill(course_df, main_skill)
+        # Extract + score courses
+        courses = score_skill_courses(embedding_model, course_df, main_skill, scoring)
         if courses.empty:
             result[main_skill] = []
             continue
 
-        courses["description_embedding"] = courses["description"].apply(
-            lambda text: embedding_model.encode(text, convert_to_tensor=True)
-        )
-        courses["title_embedding"] = courses["title"].apply(
-            lambda text: embedding_model.encode(text, convert_to_tensor=True)
-        )
-        courses["match_score"] = courses.apply(
-            lambda row: compute_match_score(
-                row["title"],
-                row["description"],
-                main_skill,
-                skill_list,
-                module_skills,
-                prereq_graph
-            ),
-            axis=1
-        )
-        courses["difficulty_score"] = courses.apply(
-            lambda row: compute_difficulty_scores(row, main_skill, skill_list), axis=1
-        )
-
-        # Normalize scores
-        for col in ["match_score", "difficulty_score", "price", "wilson_score"]:
-            courses[col] = scaler.fit_transform(courses[[col]])
-
         # Solve ILP
         selected_indices = solve_course_selection_pulp(
             courses, main_skill, D_ideal, alpha, beta, lambda_, gamma
@@ -269,4 +336,85 @@ def suggest_courses(
 
         result[main_skill] = selected_courses
 
+    return result
+
+
+def course_keys(courses):
+    """Identity of each course across skills: its link, or its row index when it has no link."""
+    return pd.Series(
+        [link if isinstance(link, str) and link else f"row:{index}" for index, link in courses["link"].items()],
+        index=courses.index, dtype=object
+    )
+
+
+def suggest_courses_global(
+    embedding_model,
+    course_df,
+    skill_list,
+    total_weeks,
+    weekly_hours,
+    job_title,
+    module_skills,
+    prereq_graph,
+    portion=0.8,
+    alpha=0.5,
+    beta=0.5,
+    lambda_=0.5,
+    gamma=1,
+    catalog=None,
+    top_k=GLOBAL_CANDIDATES_PER_SKILL
+):
+    """
+    Like suggest_courses, but selects the courses of all skills in one MILP, so a course listed
+    under several skills (same link) is picked and scheduled once, against one hours budget of
+    portion × total_weeks × weekly_hours. Each skill keeps its `top_k` best-scoring courses and
+    its two shortest as candidates, and its hours are capped near its focus share (see
+    solve_global_course_selection). Each picked course is listed under the skill it scores best
+    for; a skill left without courses that way gets the shortest course, like suggest_courses
+    does when its solver picks nothing. Courses without a link are told apart by row. The budget
+    is an upper bound: the selection may leave hours unused. Falls back to suggest_courses when
+    the budget cannot cover every skill.
+    """
+    standardized_skills = standardize_focus_scores(skill_list)
+    scoring = prepare_course_scoring(course_df, standardized_skills, module_skills, prereq_graph, catalog)
+
+    result = {}
+    candidates = []
+    for [skill, focus, confidence] in standardized_skills:
+        main_skill = skill.lower()
+        result[main_skill] = []
+        courses = score_skill_courses(embedding_model, course_df, main_skill, scoring)
+        if courses.empty:
+            continue
+
+        # Candidates: the top_k best-scoring courses plus the two shortest (to keep the budget
+        # feasible), one row per course
+        courses["objective"] = course_objective(courses, alpha, beta, lambda_, gamma)
+        courses["course_key"] = course_keys(courses)
+        courses = courses.sort_values("objective", ascending=False, kind="stable").drop_duplicates("course_key")
+        shortest = courses.sort_values("duration", kind="stable").index[:2]
+        courses = courses[courses.index.isin(courses.index[:top_k].union(shortest))]
+        D_ideal = int(portion * total_weeks * weekly_hours * focus)
+        candidates.append(SkillCandidates(
+            main_skill, courses.index, courses["course_key"].to_numpy(), courses["duration"].to_numpy(),
+            courses["objective"].to_numpy(), 1.1 * D_ideal
+        ))
+
+    # At least 2 courses per skill like suggest_courses, or 1 when the budget is too tight for that
+    budget = portion * total_weeks * weekly_hours
+    solution = solve_global_course_selection(candidates, budget, gamma, min_courses=2)
+    if solution.status == "no_solution":
+        solution = solve_global_course_selection(candidates, budget, gamma, min_courses=1)
+    print(f"global course selection: {solution.status} in {solution.solve_seconds:.3f}s "
+          f"({len(candidates)} skills, gap {solution.gap if solution.gap is not None else 'n/a'})")
+    if solution.status == "no_solution":
+        return suggest_courses(embedding_model, course_df, skill_list, total_weeks, weekly_hours, job_title,
+                               module_skills, prereq_graph, portion, alpha, beta, lambda_, gamma, catalog)
+
+    for main_skill, indices in solution.selected.items():
+        if indices:
+            result[main_skill] = course_df.loc[indices].to_dict(orient="records")
+        else:
+            # ⛑️ Pick fallback: shortest duration course
+            result[main_skill] = course_df.sort_values("duration").head(1).to_dict(orient="records")
     return result
\ No newline at end of file
@@ -0,0 +1,221 @@
+import os
+import threading
+import time
+
+import numpy as np
+from pulp import (
+    LpAffineExpression, LpMinimize, LpProblem, LpVariable, PULP_CBC_CMD,
+    LpSolutionIntegerFeasible, LpSolutionOptimal, value,
+)
+
+import metrics
+from caches.course_model_cache import template_key, get_cached_template, cache_template
+
+# Course-selection MILP adapter for CBC (see solve_course_selection_pulp):
+#   maximize   sum(objective_i * x_i)     (passed to CBC as minimizing the negated objective:
+#                                          with -max, CBC 2.10 misreads a MIP start's cost as a
+#                                          cutoff and can stop at the start solution)
+#   subject to sum(x_i) >= 2,  lower <= sum(duration_i * x_i) <= upper,  x binary
+# The constraint matrix only depends on the skill's courses, so each skill's model is built
+# once from NumPy columns and cached; a solve only swaps the objective and the duration bounds.
+# CBC gets a warm start (the template's last solution or a greedy fill, when feasible) and a
+# time limit. When the limit stops CBC early, the gap to the LP relaxation bound is reported.
+# solve_global_course_selection is the optional all-skills model (see suggest_courses_global).
+COURSE_SOLVER_TIME_LIMIT = float(os.getenv("COURSE_SOLVER_TIME_LIMIT", "10"))  # seconds
+GLOBAL_CANDIDATES_PER_SKILL = int(os.getenv("GLOBAL_CANDIDATES_PER_SKILL", "10"))
+
+
+class SolveResult:
+    __slots__ = ("selected", "status", "objective", "gap", "solve_seconds", "warm_started")
+
+    def __init__(self, selected, status, objective=None, gap=None, solve_seconds=0.0, warm_started=False):
+        self.selected = selected          # row index labels of the chosen courses
+        self.status = status              # "optimal", "feasible" (time limit) or "no_solution"
+        self.objective = objective
+        self.gap = gap                    # relative gap to the LP bound (0 when proven optimal)
+        self.solve_seconds = solve_seconds
+        self.warm_started = warm_started
+
+
+def greedy_selection(objective, durations, lower, upper):
+    """Best-objective-first fill under the upper bound; None when that is not a feasible start."""
+    mask = np.zeros(len(objective), dtype=bool)
+    total = 0.0
+    for i in np.argsort(-objective, kind="stable"):
+        if total + durations[i] <= upper:
+            mask[i] = True
+            total += durations[i]
+    return mask if is_feasible(mask, durations, lower, upper) else None
+
+
+def is_feasible(mask, durations, lower, upper):
+    total = float(np.dot(durations, mask))
+    return int(mask.sum()) >= 2 and lower <= total <= upper
+
+
+def relaxation_bound(problem):
+    """Objective of the LP relaxation, as a bound on the maximized (not negated) objective."""
+    problem.solve(PULP_CBC_CMD(msg=False, mip=False))
+    bound = value(problem.objective)
+    return None if bound is None else -bound
+
+
+def solve_with_cbc(problem, variables, objective, time_limit, warm_started=False):
+    """
+    Solve `problem` (set up to minimize -objective) with CBC.
+    Returns (solution mask, status, objective value, gap, solve seconds).
+    """
+    start_time = time.perf_counter()
+    problem.solve(PULP_CBC_CMD(msg=False, warmStart=warm_started, timeLimit=time_limit))
+    solve_seconds = time.perf_counter() - start_time
+
+    solution = np.array([x.varValue == 1 for x in variables], dtype=bool)
+    if problem.sol_status == LpSolutionOptimal:
+        status, objective_value, gap = "optimal", float(np.dot(objective, solution)), 0.0
+    elif problem.sol_status == LpSolutionIntegerFeasible:
+        status, objective_value = "feasible", float(np.dot(objective, solution))
+        bound = relaxation_bound(problem)
+        gap = (bound - objective_value) / max(abs(bound), 1e-9) if bound is not None else None
+    else:
+        status, objective_value, gap = "no_solution", None, None
+    return solution, status, objective_value, gap, solve_seconds
+
+
+def record_solve(name, status, gap, solve_seconds, warm_started=False):
+    metrics.observe(name, solve_seconds)
+    metrics.incr(f"{name}.{status}")
+    if warm_started:
+        metrics.incr(f"{name}.warm_start")
+    if gap is not None:
+        metrics.set_gauge(f"{name}.last_gap", gap)
+
+
+class CourseSelectionTemplate:
+    """One skill's course-selection model: binary variables and constraints over its courses."""
+
+    __slots__ = ("index", "durations", "variables", "problem", "max_duration", "min_duration", "last_solution", "lock")
+
+    def __init__(self, index, durations):
+        self.index = list(index)
+        self.durations = np.asarray(durations, dtype=np.float64)
+        self.variables = [LpVariable(f"x_{i}", cat="Binary") for i in self.index]
+        self.last_solution = None
+        self.lock = threading.Lock()  # one solve at a time per template
+
+        problem = LpProblem("Course_Selection", LpMinimize)
+        problem += LpAffineExpression((x, 1) for x in self.variables) >= 2, "min_courses"
+        duration = LpAffineExpression(zip(self.variables, self.durations.tolist()))
+        self.max_duration = duration <= 0
+        self.min_duration = duration >= 0
+        problem += self.max_duration, "max_duration"
+        problem += self.min_duration, "min_duration"
+        self.problem = problem
+
+    def set_duration_bounds(self, lower, upper):
+        self.max_duration.changeRHS(upper)
+        self.min_duration.changeRHS(lower)
+
+    def warm_start(self, objective, lower, upper):
+        """Set the variables' initial values; returns False when no feasible start was found."""
+        start = self.last_solution
+        if start is None or not is_feasible(start, self.durations, lower, upper):
+            start = greedy_selection(objective, self.durations, lower, upper)
+        if start is None:
+            return False
+        for x, chosen in zip(self.variables, start):
+            x.setInitialValue(1 if chosen else 0)
+        return True
+
+    def solve(self, objective, lower, upper, time_limit=COURSE_SOLVER_TIME_LIMIT):
+        objective = np.asarray(objective, dtype=np.float64)
+        with self.lock:
+            self.problem.setObjective(LpAffineExpression(zip(self.variables, (-objective).tolist())))
+            self.set_duration_bounds(lower, upper)
+            warm_started = self.warm_start(objective, lower, upper)
+            solution, status, objective_value, gap, solve_seconds = solve_with_cbc(
+                self.problem, self.variables, objective, time_limit, warm_started
+            )
+            selected = [i for i, chosen in zip(self.index, solution) if chosen]
+            if objective_value is not None:
+                self.last_solution = solution
+
+        record_solve("course_solver.solve", status, gap, solve_seconds, warm_started)
+        return SolveResult(selected, status, objective_value, gap, solve_seconds, warm_started)
+
+
+def course_selection_template(skill, index, durations):
+    """Cached CourseSelectionTemplate for a skill's courses (built on first use)."""
+    durations = np.asarray(durations, dtype=np.float64)
+    key = template_key(skill, index, durations)
+    template = get_cached_template(key)
+    if template is None:
+        template = cache_template(key, CourseSelectionTemplate(index, durations))
+    return template
+
+
+class SkillCandidates:
+    """One skill's candidate courses for the global selection, one entry per course (`links`: course keys)."""
+
+    __slots__ = ("skill", "index", "links", "durations", "objective", "max_hours")
+
+    def __init__(self, skill, index, links, durations, objective, max_hours):
+        self.skill = skill
+        self.index = list(index)
+        self.links = list(links)
+        self.durations = np.asarray(durations, dtype=np.float64)
+        self.objective = np.asarray(objective, dtype=np.float64)
+        self.max_hours = max_hours
+
+
+def solve_global_course_selection(candidates, budget, gamma, min_courses=2, time_limit=COURSE_SOLVER_TIME_LIMIT):
+    """
+    One MILP over every skill's candidates, with one binary per distinct course key (link):
+      maximize   sum of each picked course's per-skill objectives, paying the per-course cost
+                 `gamma` once however many skills the course counts for
+      subject to total hours of the picked courses <= budget
+                 per skill: at least min(min_courses, its candidates) of its candidates picked,
+                            and their hours <= max(its max_hours, its min_courses shortest candidates)
+    Returns a SolveResult whose `selected` maps each skill to the row indices of the picked
+    courses it has the best objective for (earlier skills win ties).
+    """
+    positions = {}
+    durations, values = [], []
+    owners = []                     # per course: (best objective, skill, row index)
+    for skill_candidates in candidates:
+        for row, link, duration, objective in zip(skill_candidates.index, skill_candidates.links,
+                                                  skill_candidates.durations, skill_candidates.objective):
+            position = positions.get(link)
+            if position is None:
+                position = positions[link] = len(durations)
+                durations.append(duration)
+                values.append(-gamma)
+                owners.append((objective, skill_candidates.skill, row))
+            elif objective > owners[position][0]:
+                owners[position] = (objective, skill_candidates.skill, row)
+            values[position] += objective + gamma
+
+    durations = np.array(durations, dtype=np.float64)
+    values = np.array(values, dtype=np.float64)
+    variables = [LpVariable(f"y_{j}", cat="Binary") for j in range(len(values))]
+    problem = LpProblem("Global_Course_Selection", LpMinimize)
+    problem += LpAffineExpression(zip(variables, durations.tolist())) <= budget, "budget"
+    for k, skill_candidates in enumerate(candidates):
+        members = [positions[link] for link in skill_candidates.links]
+        required = min(min_courses, len(members))
+        shortest = float(np.sort(skill_candidates.durations)[:required].sum())
+        problem += LpAffineExpression((variables[j], 1) for j in members) >= required, f"coverage_{k}"
+        problem += (
+            LpAffineExpression((variables[j], durations[j]) for j in members) <= max(skill_candidates.max_hours, shortest),
+            f"hours_{k}",
+        )
+    problem.setObjective(LpAffineExpression(zip(variables, (-values).tolist())))
+
+    solution, status, objective_value, gap, solve_seconds = solve_with_cbc(problem, variables, values, time_limit)
+    record_solve("course_solver.global", status, gap, solve_seconds)
+
+    selected = {skill_candidates.skill: [] for skill_candidates in candidates}
+    if status != "no_solution":
+        for j in np.flatnonzero(solution):
+            _, skill, row = owners[j]
+            selected[skill].append(row)
+    return SolveResult(selected, status, objective_value, gap, solve_seconds)
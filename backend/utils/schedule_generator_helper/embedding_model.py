@@ -1,4 +1,5 @@
-from sentence_transformers import SentenceTransformer
+from resources import get_resource
 
-# Load once when module is imported
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
\ No newline at end of file
+# Loaded on first use (or by the startup warm-up), shared with the map router
+def get_embedding_model():
+    return get_resource("minilm_model")
@@ -1,7 +1,11 @@
-from collections import defaultdict
 import json
-import networkx as nx
 import numpy as np
+from .skill_graph import SkillDiGraph, GraphCycleError
+from caches.module_plan_cache import (
+    graph_file_hash, skeleton_key, groups_key,
+    get_cached_skeleton, cache_skeleton, get_cached_groups, cache_groups,
+    get_cached_domain_data, cache_domain_data,
+)
 
 
 def load_knowledge_graph(path):
@@ -9,13 +13,13 @@ def load_knowledge_graph(path):
         return json.load(f)
 
 
-def parse_prerequisite_edges(graph_path, input_skill_set):
+def parse_prerequisite_edges(graph_path, input_skill_set=None):
     knowledge_graph = load_knowledge_graph(graph_path)
     prereq_edges = []
     for rel in knowledge_graph.get("relationships", []):
         if rel["relationship"] == "prerequisite":
             src, tgt = rel["source"].lower(), rel["target"].lower()
-            if src in input_skill_set and tgt in input_skill_set:
+            if input_skill_set is None or (src in input_skill_set and tgt in input_skill_set):
                 prereq_edges.append((src, tgt, rel["weight"]))
     return prereq_edges
 
@@ -42,34 +46,165 @@ def parse_association_weights(graph_path, input_skill_set, threshold=0.4, conf_w
     return association_scores
 
 
+def domain_association_matrix(graph_path, threshold=0.4, conf_weight=0.8):
+    """
+    All-pairs association weights of a domain graph as a dense symmetric matrix plus a
+    skill → row index map, computed once per (graph file, threshold, conf_weight).
+    Same formula and last-relationship-wins rule as parse_association_weights.
+    """
+    key = (graph_file_hash(graph_path), "association", threshold, conf_weight)
+    cached = get_cached_domain_data(key)
+    if cached is not None:
+        return cached
 
-def build_prereq_graph_from_edges(prereq_edges):
-    G = nx.DiGraph()
-    for src, tgt, weight in prereq_edges:
-        G.add_edge(src, tgt, weight=weight)
-    return G
+    knowledge_graph = load_knowledge_graph(graph_path)
+    skill_index = {}
+    weighted_pairs = []
+    for rel in knowledge_graph.get("relationships", []):
+        if rel["relationship"] == "association":
+            src, tgt = rel["source"].lower(), rel["target"].lower()
+            confidence = rel.get("confidence", 0)
+            lift = rel.get("lift", 0)
+            if confidence > threshold:
+                norm = (1 / (1 + np.exp(-lift)) - 0.5) / 0.5  # sigmoid & normalize
+                weight = conf_weight * confidence + (1-conf_weight) * norm
+            else:
+                weight = 0
+            i = skill_index.setdefault(src, len(skill_index))
+            j = skill_index.setdefault(tgt, len(skill_index))
+            weighted_pairs.append((i, j, weight))
+
+    matrix = np.zeros((len(skill_index), len(skill_index)), dtype=np.float64)
+    for i, j, weight in weighted_pairs:
+        matrix[i, j] = weight
+        matrix[j, i] = weight
+    matrix.setflags(write=False)
+
+    cached = (skill_index, matrix)
+    cache_domain_data(key, cached)
+    return cached
+
+
+def association_submatrix(graph_path, skills, threshold=0.4, conf_weight=0.8):
+    """Association weights among `skills` (lowercase), aligned with their order; 0 for unknown skills."""
+    skill_index, matrix = domain_association_matrix(graph_path, threshold, conf_weight)
+    local = [i for i, skill in enumerate(skills) if skill in skill_index]
+    global_rows = [skill_index[skills[i]] for i in local]
+    sub = np.zeros((len(skills), len(skills)), dtype=np.float64)
+    sub[np.ix_(local, local)] = matrix[np.ix_(global_rows, global_rows)]
+    return sub
+
+
+def association_matrix_from_scores(association_scores, skills):
+    """{(src, tgt): weight} (as from parse_association_weights) → matrix aligned with `skills`."""
+    position = {skill: i for i, skill in enumerate(skills)}
+    sub = np.zeros((len(skills), len(skills)), dtype=np.float64)
+    for (src, tgt), weight in association_scores.items():
+        if src in position and tgt in position:
+            sub[position[src], position[tgt]] = weight
+    return sub
 
 
-def break_cycles(graph):
-    while True:
-        try:
-            cycle = nx.find_cycle(graph, orientation="original")
-            weakest = min(cycle, key=lambda e: graph.get_edge_data(e[0], e[1]).get("weight", 1.0))
-            graph.remove_edge(weakest[0], weakest[1])
-        except nx.exception.NetworkXNoCycle:
-            break
+def build_prereq_graph_from_edges(prereq_edges):
+    return SkillDiGraph(prereq_edges)
+
+
+def _greedy_order(nodes, edges):
+    """
+    Weighted Eades–Lin–Smyth ordering of one strongly connected component: sinks go last,
+    sources first, otherwise the node with the largest (out-weight − in-weight) goes next,
+    so heavy prerequisite edges point forward and only light ones end up pointing back.
+    """
+    succ = {u: {} for u in nodes}
+    pred = {u: {} for u in nodes}
+    for (u, v), weight in edges.items():
+        succ[u][v] = weight
+        pred[v][u] = weight
+
+    def remove(u):
+        for v in succ.pop(u):
+            del pred[v][u]
+        for p in pred.pop(u):
+            del succ[p][u]
+
+    head, tail = [], []
+    while succ:
+        progressed = True
+        while progressed:
+            progressed = False
+            for u in [u for u in succ if not succ[u]]:
+                tail.append(u)
+                remove(u)
+                progressed = True
+            for u in [u for u in succ if not pred[u]]:
+                head.append(u)
+                remove(u)
+                progressed = True
+        if succ:
+            u = max(succ, key=lambda n: (sum(succ[n].values()) - sum(pred[n].values()), n))
+            head.append(u)
+            remove(u)
+    return head + tail[::-1]
+
+
+def greedy_feedback_arc_set(edge_weights):
+    """
+    edge_weights: {(src, tgt): weight}. Returns the edges to drop so the rest is acyclic, in one
+    pass: SCC decomposition, a greedy weight-aware order inside each SCC, and every edge that
+    points backwards in that order (plus self-loops).
+    """
+    graph = SkillDiGraph((u, v, w) for (u, v), w in edge_weights.items())
+    feedback_arcs = {(u, v) for (u, v) in edge_weights if u == v}
+
+    for component in graph.strongly_connected_components():
+        if len(component) < 2:
+            continue
+        inner = {(u, v): w for (u, v), w in edge_weights.items() if u in component and v in component and u != v}
+        position = {skill: i for i, skill in enumerate(_greedy_order(sorted(component), inner))}
+        feedback_arcs.update(edge for edge in inner if position[edge[0]] > position[edge[1]])
+    return feedback_arcs
+
+
+def domain_feedback_arcs(graph_path):
+    """Feedback arc set of the whole domain prerequisite graph, computed once per graph file."""
+    key = (graph_file_hash(graph_path), "feedback_arcs")
+    feedback_arcs = get_cached_domain_data(key)
+    if feedback_arcs is None:
+        full_graph = build_prereq_graph_from_edges(parse_prerequisite_edges(graph_path))
+        feedback_arcs = frozenset(greedy_feedback_arc_set(
+            {(u, v): weight for u, v, weight in full_graph.edges(weights=True)}
+        ))
+        cache_domain_data(key, feedback_arcs)
+    return feedback_arcs
+
+
+def break_cycles(graph, feedback_arcs=None):
+    """
+    Make `graph` acyclic in one pass. With the domain's precomputed `feedback_arcs` the request
+    subgraph drops the ones it contains (a subgraph of a DAG is a DAG), then puts back, heaviest
+    first, those that close no cycle among this user's skills.
+    """
+    if feedback_arcs is None:
+        feedback_arcs = greedy_feedback_arc_set(
+            {(u, v): weight for u, v, weight in graph.edges(weights=True)}
+        )
+    removed = [(u, v, graph.weight(u, v)) for u, v in feedback_arcs if graph.has_edge(u, v)]
+    graph.remove_edges_from([(u, v) for u, v, _ in removed])
+    for u, v, weight in sorted(removed, key=lambda e: (-e[2], e[0], e[1])):
+        if u != v and not graph.has_path(v, u):
+            graph.add_edge(u, v, weight)
 
 
-def topological_sort_with_priorities(prereq_graph, input_skill_set):
-    break_cycles(prereq_graph)
+def topological_sort_with_priorities(prereq_graph, input_skill_set, feedback_arcs=None):
+    break_cycles(prereq_graph, feedback_arcs)
 
     try:
-        topo_order = list(nx.topological_sort(prereq_graph))
+        topo_order = prereq_graph.topological_sort()
 
         skill_scores = {}
         for skill in topo_order:
-            incoming = list(prereq_graph.in_edges(skill, data=True))
-            prereq_weight = sum(data['weight'] for _, _, data in incoming) / len(incoming) if incoming else 0
+            incoming = prereq_graph.in_weights(skill)
+            prereq_weight = sum(incoming) / len(incoming) if incoming else 0
             skill_scores[skill] = prereq_weight
 
         refined_order = sorted(topo_order, key=lambda s: skill_scores[s])
@@ -80,51 +215,62 @@ def topological_sort_with_priorities(prereq_graph, input_skill_set):
 
         return refined_order
 
-    except nx.NetworkXUnfeasible:
-        return list(prereq_graph.nodes())
+    except GraphCycleError:
+        return prereq_graph.nodes()
 
 
 def group_skills_by_association(topo_order, association_scores, total_hours, input_skills, prereq_graph, threshold=0.3, max_portion=1/3):
+    """
+    association_scores: square matrix aligned with `topo_order` (see association_submatrix),
+    or a {(src, tgt): weight} dict.
+
+    Each group keeps a running duration total and a running association vector (the sum of
+    its members' columns), so placing a skill costs O(candidate groups). Totals are accumulated in
+    member order, exactly like re-summing the group each time.
+    """
+    if isinstance(association_scores, dict):
+        association_scores = association_matrix_from_scores(association_scores, topo_order)
+    position = {skill: i for i, skill in enumerate(topo_order)}
     groups = []
+    group_durations = []    # running sum of the members' rounded durations
+    group_association = []  # running sum of the members' association columns
     skill_to_module = {}
-    prereq_map = defaultdict(set)
     skill_focus_map = {s[0].lower(): s[1] for s in input_skills}
+    max_duration = max_portion * total_hours
 
 
-    if not isinstance(prereq_graph, nx.Graph):
+    if not isinstance(prereq_graph, SkillDiGraph):
         prereq_graph = build_prereq_graph_from_edges(prereq_graph)
-
-    for src, tgt in prereq_graph.edges():
-        prereq_map[tgt].add(src)
+    prereq_map = prereq_graph.predecessor_map()
 
     for skill in topo_order:
         max_prereq_module = max(
-            [skill_to_module[pre] for pre in prereq_map[skill] if pre in skill_to_module],
+            [skill_to_module[pre] for pre in prereq_map.get(skill, ()) if pre in skill_to_module],
             default=-1
         )
 
+        row = position[skill]
+        new_skill_duration = round(skill_focus_map.get(skill, 0) * total_hours, 1)
         best_group = None
-        best_score = 0
 
         for idx in range(max_prereq_module + 1, len(groups)):
-            group = groups[idx]
-            new_skill_duration = round(skill_focus_map.get(skill, 0) * total_hours, 1)
-            durations = [round(skill_focus_map.get(s, 0) * total_hours, 1) for s in group]
-            total_duration = sum(durations) + new_skill_duration
-            if len(group) >= 3 or total_duration > max_portion * total_hours:
+            size = len(groups[idx])
+            if size >= 3 or group_durations[idx] + new_skill_duration > max_duration:
                 continue
-            score = sum(association_scores.get((skill, other), 0) for other in group)
-            avg_score = score / len(group) if group else 0
+            avg_score = group_association[idx][row] / size
             if avg_score >= threshold:
                 best_group = idx
-                best_score = avg_score
                 break
 
         if best_group is not None:
             groups[best_group].append(skill)
+            group_durations[best_group] += new_skill_duration
+            group_association[best_group] += association_scores[:, row]
             skill_to_module[skill] = best_group
         else:
             groups.append([skill])
+            group_durations.append(new_skill_duration)
+            group_association.append(association_scores[:, row].copy())
             skill_to_module[skill] = len(groups) - 1
 
     return groups
@@ -152,11 +298,25 @@ def generate_modules(graph_path, matched_domain, input_skills, total_weeks, week
     
 
     input_skill_set = set(s[0].lower() for s in input_skills)
-    prereq_edges = parse_prerequisite_edges(graph_path, input_skill_set)
-    assoc_scores = parse_association_weights(graph_path, input_skill_set, threshold, conf_weight)
-    prereq_graph = build_prereq_graph_from_edges(prereq_edges)
-    ordered_skills = topological_sort_with_priorities(prereq_graph, input_skill_set)
-    skill_groups = group_skills_by_association(
-    ordered_skills, assoc_scores, total_hours, input_skills, prereq_graph, threshold=0.1)
+
+    # Graph-dependent part (prereqs, associations, order) is shared by every plan over these skills
+    skel_key = skeleton_key(matched_domain, graph_file_hash(graph_path), input_skill_set, threshold, conf_weight)
+    skeleton = get_cached_skeleton(skel_key)
+    if skeleton is None:
+        prereq_edges = parse_prerequisite_edges(graph_path, input_skill_set)
+        prereq_graph = build_prereq_graph_from_edges(prereq_edges)
+        ordered_skills = topological_sort_with_priorities(prereq_graph, input_skill_set, domain_feedback_arcs(graph_path))
+        assoc_scores = association_submatrix(graph_path, ordered_skills, threshold, conf_weight)
+        skeleton = (ordered_skills, assoc_scores, prereq_graph)
+        cache_skeleton(skel_key, skeleton)
+    ordered_skills, assoc_scores, prereq_graph = skeleton
+
+    skill_focus_map = {s[0].lower(): s[1] for s in input_skills}
+    grp_key = groups_key(skel_key, skill_focus_map, total_hours)
+    skill_groups = get_cached_groups(grp_key)
+    if skill_groups is None:
+        skill_groups = group_skills_by_association(
+        ordered_skills, assoc_scores, total_hours, input_skills, prereq_graph, threshold=0.1)
+        cache_groups(grp_key, skill_groups)
     final_modules = assign_module_durations(skill_groups, input_skills, total_hours)
     return final_modules
\ No newline at end of file
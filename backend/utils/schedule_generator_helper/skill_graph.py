@@ -0,0 +1,193 @@
+from collections import deque
+
+
+class GraphCycleError(Exception):
+    """Raised by topological_sort when the graph still has a cycle."""
+
+
+class SkillDiGraph:
+    """
+    Small weighted digraph for prerequisite graphs (a few dozen to a few hundred skills).
+    Skills get integer ids in insertion order; successors and predecessors are kept as
+    per-id dicts {id: weight}, so edge lookups, removals and in-edge scans are O(1)/O(degree).
+    Iteration orders follow networkx.DiGraph (nodes and edges in insertion order), so
+    orderings computed here match the networkx ones. Use to_networkx() for debugging.
+    """
+
+    __slots__ = ("_ids", "_names", "_succ", "_pred", "_predecessor_map")
+
+    def __init__(self, edges=()):
+        self._ids = {}
+        self._names = []
+        self._succ = []
+        self._pred = []
+        self._predecessor_map = None
+        for src, tgt, weight in edges:
+            self.add_edge(src, tgt, weight)
+
+    # --- construction / mutation ---
+    def add_node(self, name) -> int:
+        node_id = self._ids.get(name)
+        if node_id is None:
+            node_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._succ.append({})
+            self._pred.append({})
+            self._predecessor_map = None
+        return node_id
+
+    def add_edge(self, src, tgt, weight=1.0):
+        """Add (or re-weight) src → tgt; like networkx, an edge removed and added again goes last."""
+        u, v = self.add_node(src), self.add_node(tgt)
+        self._succ[u][v] = weight
+        self._pred[v][u] = weight
+        self._predecessor_map = None
+
+    def remove_edge(self, src, tgt):
+        u, v = self._ids[src], self._ids[tgt]
+        del self._succ[u][v]
+        del self._pred[v][u]
+        self._predecessor_map = None
+
+    def remove_edges_from(self, edges):
+        for src, tgt in edges:
+            if self.has_edge(src, tgt):
+                self.remove_edge(src, tgt)
+
+    # --- queries ---
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __len__(self):
+        return len(self._names)
+
+    def nodes(self):
+        return list(self._names)
+
+    def has_edge(self, src, tgt) -> bool:
+        u, v = self._ids.get(src), self._ids.get(tgt)
+        return u is not None and v is not None and v in self._succ[u]
+
+    def weight(self, src, tgt, default=None):
+        u, v = self._ids.get(src), self._ids.get(tgt)
+        if u is None or v is None:
+            return default
+        return self._succ[u].get(v, default)
+
+    def edges(self, weights=False):
+        """(src, tgt) pairs, or (src, tgt, weight) with weights=True, in insertion order."""
+        names = self._names
+        for u, targets in enumerate(self._succ):
+            for v, weight in targets.items():
+                yield (names[u], names[v], weight) if weights else (names[u], names[v])
+
+    def number_of_edges(self) -> int:
+        return sum(len(targets) for targets in self._succ)
+
+    def in_weights(self, name):
+        """Weights of the edges into `name`, in insertion order."""
+        node_id = self._ids.get(name)
+        return [] if node_id is None else list(self._pred[node_id].values())
+
+    def predecessor_map(self):
+        """Cached {skill: set of direct prerequisites} for every skill with one (reverse adjacency)."""
+        if self._predecessor_map is None:
+            names = self._names
+            self._predecessor_map = {
+                names[v]: {names[u] for u in sources} for v, sources in enumerate(self._pred) if sources
+            }
+        return self._predecessor_map
+
+    # --- algorithms ---
+    def topological_sort(self):
+        """Same generation-by-generation Kahn order as networkx.topological_sort."""
+        indegree = [len(sources) for sources in self._pred]
+        generation = [u for u, d in enumerate(indegree) if d == 0]
+        order = []
+        while generation:
+            order.extend(generation)
+            next_generation = []
+            for u in generation:
+                for v in self._succ[u]:
+                    indegree[v] -= 1
+                    if indegree[v] == 0:
+                        next_generation.append(v)
+            generation = next_generation
+        if len(order) < len(self._names):
+            raise GraphCycleError("Graph contains a cycle")
+        return [self._names[u] for u in order]
+
+    def has_path(self, src, tgt) -> bool:
+        u, v = self._ids.get(src), self._ids.get(tgt)
+        if u is None or v is None:
+            return False
+        seen = {u}
+        queue = deque([u])
+        while queue:
+            node = queue.popleft()
+            if node == v:
+                return True
+            for nxt in self._succ[node]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    queue.append(nxt)
+        return False
+
+    def strongly_connected_components(self):
+        """List of sets of skill names (iterative Tarjan)."""
+        index, low, on_stack = {}, {}, set()
+        stack, components = [], []
+        counter = 0
+        for root in range(len(self._names)):
+            if root in index:
+                continue
+            work = [(root, iter(self._succ[root]))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self._succ[child])))
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = set()
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.add(self._names[member])
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
+
+    # --- networkx interop (debugging, plotting) ---
+    def to_networkx(self):
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._names)
+        graph.add_weighted_edges_from(self.edges(weights=True))
+        return graph
+
+    @classmethod
+    def from_networkx(cls, graph):
+        skill_graph = cls()
+        for node in graph.nodes():
+            skill_graph.add_node(node)
+        for src, tgt, data in graph.edges(data=True):
+            skill_graph.add_edge(src, tgt, data.get("weight", 1.0))
+        return skill_graph
@@ -0,0 +1,59 @@
+from collections import deque
+
+
+class SkillMatcher:
+    """
+    Aho–Corasick automaton over a fixed set of (lowercase) skill names. `find_all(text)` returns
+    every skill that occurs in `text` as a substring — the same answer as `skill in text` for
+    each skill — in a single pass over the text, however many skills there are.
+    """
+
+    __slots__ = ("patterns", "_goto", "_fail", "_out")
+
+    def __init__(self, patterns):
+        self.patterns = frozenset(p for p in patterns if p)
+        goto = [{}]
+        out = [()]
+        for pattern in sorted(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = goto[state][ch] = len(goto)
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] += (pattern,)
+
+        # Failure links, breadth-first so a state's fallback is final before its children use it
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                out[nxt] += out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def __contains__(self, skill):
+        return skill in self.patterns
+
+    def find_all(self, text) -> frozenset:
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return frozenset(found)
@@ -252,13 +252,63 @@ def generate_learning_blocks(L_hours):
 
 block_cache = {}
 
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _to_minutes(label):
+    hours, minutes = label.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def _to_label(minutes):
+    minutes = min(minutes, 24 * 60 - 1)  # a session never runs past the end of its day
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class LearningCalendar:
+    """
+    A module's weekly slot pattern: for each weekday (0 = Monday) that is a learning day with
+    blocks, its blocks as (start label, start minute, duration in hours). learning_dates() jumps
+    from one usable day to the next with weekday arithmetic instead of stepping through every
+    calendar day. Blocks must end after they start, on the same day.
+    """
+
+    __slots__ = ("day_slots",)
+
+    def __init__(self, learning_days, block_plan):
+        self.day_slots = {}
+        for weekday, day_name in enumerate(WEEKDAYS):
+            if not learning_days.get(day_name, False) or day_name not in block_plan:
+                continue
+            slots = []
+            for block in block_plan[day_name]:
+                start, end = _to_minutes(block['start']), _to_minutes(block['end'])
+                if end <= start:
+                    raise ValueError(f"{day_name} block {block['start']}-{block['end']} does not end after it starts")
+                duration = round((((end - start) * 60) / 3600) * 2) / 2
+                slots.append((block['start'], start, duration))
+            self.day_slots[weekday] = slots
+
+    def learning_dates(self, start_date):
+        """Yield (date, slots) for every usable day from start_date on, week after week."""
+        if not self.day_slots:
+            return
+        first_weekday = start_date.weekday()
+        offsets = [d for d in range(7) if (first_weekday + d) % 7 in self.day_slots]
+        week_start = start_date
+        while True:
+            for offset in offsets:
+                day = week_start + timedelta(days=offset)
+                yield day, self.day_slots[day.weekday()]
+            week_start += timedelta(days=7)
+
+
 def schedule_module(module, start_date, weekly_hours, learning_days, skill_course_dict, user_id):
 
     module_id = module['module']
     total_duration = sum([round(d * 2) / 2 for d in module['duration']])  # Round each to nearest 0.5
     skills = module['skills']
     scheduled_sessions = []
-    current_date = start_date
     hours_remaining = total_duration
 
     # Build course stack
@@ -285,22 +335,24 @@ def schedule_module(module, start_date, weekly_hours, learning_days, skill_cours
             block_cache[hours] = generate_learning_blocks(hours)
         block_plan[day_name] = block_cache[hours]
 
-    while hours_remaining > 0.0:
-        day_name = current_date.strftime("%A")
-        if not learning_days.get(day_name, False) or day_name not in block_plan:
-            current_date += timedelta(days=1)
-            continue
+    calendar = LearningCalendar(learning_days, block_plan)
+    usable_days = len(calendar.day_slots)
+    idle_days = 0  # usable days in a row with nothing scheduled
+
+    for current_date, slots in calendar.learning_dates(start_date.date() if isinstance(start_date, datetime) else start_date):
+        if hours_remaining <= 0.0:
+            break
+        if idle_days >= usable_days:
+            break  # a whole week without progress: the remaining courses cannot be placed
 
-        blocks = block_plan[day_name]
+        date_label = current_date.strftime("%Y-%m-%d")
         used_today = set()  # Track courses already scheduled today
         one_course_left = len([c for c in course_pool if c['remaining'] >= 0.5]) == 1
         if one_course_left:
             break
 
-        for block in blocks:
-            block_start = datetime.strptime(f"{current_date.date()} {block['start']}", "%Y-%m-%d %H:%M")
-            block_end = datetime.strptime(f"{current_date.date()} {block['end']}", "%Y-%m-%d %H:%M")
-            block_duration = round(((block_end - block_start).seconds / 3600) * 2) / 2
+        sessions_before = len(scheduled_sessions)
+        for start_label, start_minute, block_duration in slots:
             for course in course_pool:
                 remaining = round(course['remaining'] * 2) / 2
                 if remaining < 0.5:
@@ -313,18 +365,16 @@ def schedule_module(module, start_date, weekly_hours, learning_days, skill_cours
                 if allocated < 1.0:
                     continue  # Only fill if 1h or more
 
-                actual_end = block_start + timedelta(hours=allocated)
-
                 scheduled_sessions.append({
                     'user_id': user_id,
                     'module': module_id,
                     'skill': course['skill'],
-                    'date': current_date.strftime("%Y-%m-%d"),
+                    'date': date_label,
                     'resource_name': course['title'],
                     'resource_url': course['link'],
                     'thumbnail_url': course['image_link'],
-                    'start': block_start.strftime("%H:%M"),
-                    'end': actual_end.strftime("%H:%M"),
+                    'start': start_label,
+                    'end': _to_label(start_minute + int(allocated * 60)),
                     "status": "pending"
                 })
 
@@ -339,10 +389,10 @@ def schedule_module(module, start_date, weekly_hours, learning_days, skill_cours
                 used_today.add(course['title'])
                 break  # Stop after assigning one course per block
 
+        idle_days = idle_days + 1 if len(scheduled_sessions) == sessions_before else 0
         hours_remaining = round(
             sum(c['remaining'] for c in course_pool if c['remaining'] >= 0.5) * 2
         ) / 2
-        current_date += timedelta(days=1)
 
     return scheduled_sessions
 
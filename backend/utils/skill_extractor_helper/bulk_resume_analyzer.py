@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from utils.llm_gateway import GEMINI_MODEL, generate_text
+from .resume_skill_extractor import (
+    SCORING_GUIDELINES,
+    extract_skills_with_llm,
+    get_skills_as_tuples,
+    remove_duplicates,
+)
+
+# Bulk onboarding: several resumes per Gemini request, within a token budget and an RPM limit
+BULK_MAX_PROMPT_TOKENS = int(os.getenv("BULK_MAX_PROMPT_TOKENS", "30000"))
+BULK_MAX_RESUMES_PER_REQUEST = int(os.getenv("BULK_MAX_RESUMES_PER_REQUEST", "5"))
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "15"))
+CHARS_PER_TOKEN = 4  # rough estimate, good enough for packing
+PROMPT_OVERHEAD_TOKENS = 800  # task text + scoring guidelines + response format
+
+
+class RateLimiter:
+    """Spaces calls evenly so at most `requests_per_minute` start in any minute (thread-safe)."""
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _item_tokens(item: Dict[str, Any]) -> int:
+    return estimate_tokens(item["text"]) + estimate_tokens(json.dumps(item["skills"]))
+
+
+def pack_batches(items: List[Dict[str, Any]], max_tokens=BULK_MAX_PROMPT_TOKENS,
+                 max_items=BULK_MAX_RESUMES_PER_REQUEST) -> List[List[Dict[str, Any]]]:
+    """
+    Greedily pack resumes ({"id", "skills", "text"}) into request-sized batches.
+    A resume that alone exceeds the budget still gets its own batch.
+    """
+    batches, current, current_tokens = [], [], PROMPT_OVERHEAD_TOKENS
+    for item in items:
+        tokens = _item_tokens(item)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, current_tokens = [], PROMPT_OVERHEAD_TOKENS
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(items: List[Dict[str, Any]]) -> str:
+    sections = "\n\n".join(
+        f"### RESUME_ID: {item['id']}\nSKILL LIST:\n{item['skills']}\n\nRESUME:\n{item['text']}"
+        for item in items
+    )
+    return f"""
+TASK:
+You are an expert AI tasked with analyzing several resumes. For EACH resume below, evaluate the candidate's demonstrated proficiency in each technical skill from that resume's own SKILL LIST.
+Assign a **confidence score between 0.0 and 100.0** per skill, reflecting how well that skill is evidenced in that RESUME only. Never use evidence from one resume for another.
+No explanations or commentary are allowed — **output only the JSON object**.
+
+{SCORING_GUIDELINES}
+
+RESUMES:
+{sections}
+
+RESPONSE FORMAT:
+Respond with a single valid JSON object. Each key is a RESUME_ID (as a string) and each value is an array of objects with these properties:
+- skill: The canonical skill name that should match exactly those in that resume's SKILL LIST (omitting from or adding to the list are NOT allowed)
+- confidence: Numeric score from 0.0 to 100.0
+
+Remember to only return a valid JSON object with nothing else.
+"""
+
+
+def parse_batch_response(response: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Parse {"<resume_id>": [{skill, confidence}, ...]} from the LLM output"""
+    text = response.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.index("\n") + 1:] if "\n" in text else text
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end == -1:
+        print(f"Error parsing batch response: {response}")
+        return {}
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        print(f"Error parsing batch response: {e}")
+        return {}
+    return {str(k): v for k, v in data.items() if isinstance(v, list)} if isinstance(data, dict) else {}
+
+
+def analyze_resume_batch(items: List[Dict[str, Any]], api_key, limiter: RateLimiter) -> Dict[Any, List[Tuple[str, float]]]:
+    """One Gemini call for the whole batch; resumes missing from the answer are retried alone."""
+    results = {}
+    if len(items) > 1:
+        limiter.wait()
+        response_text = generate_text(build_batch_prompt(items), api_key=api_key, model=GEMINI_MODEL,
+                                      purpose="resume_batch")
+        parsed = parse_batch_response(response_text)
+        for item in items:
+            skills = parsed.get(str(item["id"]))
+            if skills:
+                results[item["id"]] = get_skills_as_tuples(remove_duplicates(skills))
+
+    for item in items:
+        if item["id"] not in results:
+            limiter.wait()
+            results[item["id"]] = get_skills_as_tuples(extract_skills_with_llm(item["skills"], item["text"], api_key))
+    return results
+
+
+def analyze_resumes_bulk(items: List[Dict[str, Any]], api_key, max_tokens=BULK_MAX_PROMPT_TOKENS,
+                         max_items=BULK_MAX_RESUMES_PER_REQUEST,
+                         requests_per_minute=GEMINI_REQUESTS_PER_MINUTE) -> Dict[Any, List[Tuple[str, float]]]:
+    """
+    Score many resumes with as few Gemini requests as the token budget allows.
+    items: [{"id": ..., "skills": [job skill names], "text": resume text}]
+    Returns {id: [(skill_name, confidence), ...]}.
+    """
+    limiter = RateLimiter(requests_per_minute)
+    results = {}
+    batches = pack_batches(items, max_tokens, max_items)
+    print(f"[bulk] {len(items)} resumes packed into {len(batches)} requests")
+    for batch in batches:
+        try:
+            results.update(analyze_resume_batch(batch, api_key, limiter))
+        except Exception as e:
+            print(f"🔥 Batch {[item['id'] for item in batch]} failed: {e}")
+    return results
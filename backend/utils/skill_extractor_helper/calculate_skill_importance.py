@@ -4,8 +4,7 @@ import json
 from difflib import get_close_matches
 import logging
 import argparse
-from .job_domain_classifier import JobTitleClassifier
-from sentence_transformers import SentenceTransformer
+from resources import get_resource
 
 def load_all_skill_graphs():
 
@@ -296,8 +295,10 @@ def calculate_skill_importance(skill_text, job_title, seniority_level):
 
     skill_graphs = load_all_skill_graphs()
 
-    logging.getLogger('sentence_transformers').setLevel(logging.WARNING)
-    model = SentenceTransformer('all-mpnet-base-v2')
+    # Shared model, loaded once per process instead of on every call; the classifier (numpy) is
+    # imported with it so importing this module (and the routers using it) stays fast
+    model = get_resource("mpnet_model")
+    from .job_domain_classifier import JobTitleClassifier
     
     cluster_data = """
     Cluster 7
@@ -1,12 +1,21 @@
-import requests
-import time
+import os
 import re
+from utils.http_client import PooledHttpClient, CircuitOpenError
+from caches.goal_skill_cache import get_cached_goal_skills, cache_goal_skills
+import metrics
+
+# One pooled client per process for the skill-prediction Space (keep-alive, timeouts, circuit breaker)
+space_client = PooledHttpClient(
+    "skill_space",
+    connect_timeout=float(os.getenv("SPACE_CONNECT_TIMEOUT", "3.05")),
+    read_timeout=float(os.getenv("SPACE_READ_TIMEOUT", "60")),
+)
 
 def split_text(text):
     parts = re.split(r'[.,;:!?]', text)
     return [p.strip() for p in parts if p.strip()]
 
-def extractGoalSkills(api_url, title, level, industry, responsibility, max_retries=3):
+def extractGoalSkills(api_url, title, level, industry, responsibility, max_retries=3, use_cache=True):
     if responsibility:
         res = [industry] + split_text(responsibility)
     else:
@@ -18,9 +27,20 @@ def extractGoalSkills(api_url, title, level, industry, responsibility, max_retri
         "responsibilities": res
     }
 
+    # Same goal for the same Space as before → reuse the stored prediction instead of calling it
+    if use_cache:
+        cached = get_cached_goal_skills(payload, api_url)
+        if cached:
+            metrics.incr("cache.goal_skills.hit")
+            return cached
+        metrics.incr("cache.goal_skills.miss")
+
     for attempt in range(max_retries):
+        if attempt > 0:
+            space_client.sleep_backoff(attempt - 1)  # exponential backoff with jitter
+
         try:
-            response = requests.post(api_url, json=payload)
+            response = space_client.post_json(api_url, payload)
 
             if response.status_code != 200:
                 print(f"[❌ ERROR] Request failed with status: {response.status_code}")
@@ -31,14 +51,17 @@ def extractGoalSkills(api_url, title, level, industry, responsibility, max_retri
             skills = json_data.get("predicted_skills", "")
 
             if skills:
+                if use_cache:
+                    cache_goal_skills(payload, skills, api_url)
                 return skills
             else:
                 print(f"[⚠️ Empty skills] Attempt {attempt + 1}/{max_retries} returned no skills.")
-                time.sleep(1)  # optional backoff
 
+        except CircuitOpenError as e:
+            print(f"[🚧 CIRCUIT OPEN] {e}")
+            break
         except Exception as e:
             print(f"[🔥 JSON ERROR] Attempt {attempt + 1}/{max_retries} failed: {e}")
             print(f"[📭 RAW TEXT] {response.text if 'response' in locals() else 'No response object'}")
-            time.sleep(1)
 
     return ""
@@ -1,12 +1,11 @@
-import logging
 from .job_domain_classifier import JobTitleClassifier
-from sentence_transformers import SentenceTransformer
+from resources import get_resource
 
 
 
 def matchJobDomain(job_title):
-    logging.getLogger('sentence_transformers').setLevel(logging.WARNING)
-    model = SentenceTransformer('all-mpnet-base-v2')
+    # Shared model, loaded once per process instead of on every call
+    model = get_resource("mpnet_model")
     
     cluster_data = """
     Cluster 7
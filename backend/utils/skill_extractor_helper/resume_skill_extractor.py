@@ -1,20 +1,44 @@
+import hashlib
 import json
+import os
 import re
-import fitz
+import time
 from typing import Dict, List, Any, Optional, Tuple
-from google import genai
+from caches.resume_analysis_cache import resume_analysis_key, get_cached_resume_analysis, cache_resume_analysis
+from caches.resume_text_cache import read_text_cache, write_text_cache
+import metrics
+from utils.llm_gateway import GEMINI_MODEL, generate_text
 
-def extract_text_from_pdf(file_bytes) -> str:
-    """Extract text from a PDF file"""
+# Shared by the single-resume and the batched (bulk onboarding) prompts
+SCORING_GUIDELINES = """SCORING GUIDELINES (for each skill):
+**100.0** - Extensive, clearly demonstrated expertise (e.g. multiple job roles, advanced projects, certifications, tools or libraries tied to the skill)
+**75.0 - 99.9** - Strong, practical usage (e.g. used in key projects, listed in responsibilities, paired with related tools or platforms)
+**50.0 - 74.9** - Moderate or partial exposure (e.g. mentioned once or used as a supporting tool, course or internship)
+**25.0 - 49.9** - Light familiarity or vague mention (e.g. in a course list, minor project, or soft skill grouping)
+**0.0 - 24.9** - No evidence or only superficial mention (e.g. resume includes unrelated topics or lacks any mention)
+
+EVIDENCE TO CONSIDER:
+- **Direct mentions**: skills listed explicitly in work experience, education, certifications, or project descriptions
+- **Indirect indicators**: tools or frameworks tightly associated with a skill (e.g. “Pandas” implies some Python; “Spring Boot” implies Java)
+- **Depth signals**: frequency of mention, job title relevance (e.g. “Data Scientist” implies Python + ML), verbs like *built, led, optimized*
+- **Recency and context**: Recent and active usage counts more than passive learning or outdated experience
+- Avoid guessing. If a skill appears indirectly, give partial confidence — do not assume full proficiency unless clearly justified by the resume."""
+
+def extract_pdf_pages(file_bytes) -> List[str]:
+    """Extract the text of each page of a PDF file"""
     try:
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
-        text = ""
-        for page in doc:
-            text += page.get_text("text") + "\n"
-        return text
+        import fitz
+
+        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+            return [page.get_text("text") for page in doc]
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
-        return ""
+        return []
+
+def extract_text_from_pdf(file_bytes) -> str:
+    """Extract text from a PDF file"""
+    # One join instead of repeated `text +=` (quadratic on long multi-page CVs)
+    return "".join(page + "\n" for page in extract_pdf_pages(file_bytes))
         
 def extract_text_from_docx(file_bytes) -> str:
     """Extract text from a DOCX file"""
@@ -31,6 +55,60 @@ def extract_text_from_docx(file_bytes) -> str:
         print(f"Error extracting text from DOCX: {e}")
         return ""
     
+def normalize_resume_text(text: str) -> str:
+    """Trim trailing spaces, drop NUL bytes and collapse runs of blank lines"""
+    lines = [line.rstrip() for line in text.replace("\x00", "").splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+def extract_resume_text(file_bytes, file_type) -> Tuple[str, Optional[int]]:
+    """Extract normalized text and page count (PDF only) from a resume file"""
+    page_count = None
+    if file_type.lower() == "pdf":
+        pages = extract_pdf_pages(file_bytes)
+        page_count = len(pages)
+        text = "".join(page + "\n" for page in pages)
+    elif file_type.lower() == "docx":
+        text = extract_text_from_docx(file_bytes)
+    else:
+        # Assume plain text
+        try:
+            text = file_bytes.decode("utf-8")
+        except:
+            text = ""
+    return normalize_resume_text(text), page_count
+
+def cache_resume_text(resume_path: str, file_hash: Optional[str] = None):
+    """
+    Extract a resume's text once and store it as resume.txt.cache (run after upload).
+    `file_hash`: sha256 of the file when the caller already has it (computed while uploading).
+    """
+    with open(resume_path, "rb") as f:
+        file_bytes = f.read()
+
+    start_time = time.perf_counter()
+    text, page_count = extract_resume_text(file_bytes, os.path.splitext(resume_path)[1][1:])
+    extraction_seconds = time.perf_counter() - start_time
+    metrics.observe("resume.text_extraction", extraction_seconds)
+
+    write_text_cache(resume_path, {
+        "source": os.path.basename(resume_path),
+        "sha256": file_hash or hashlib.sha256(file_bytes).hexdigest(),
+        "pages": page_count,
+        "extraction_seconds": round(extraction_seconds, 4),
+        "extracted_at": time.time(),
+        "text": text,
+    })
+
+def load_resume_text(file_path, file_type, file_bytes, file_hash) -> str:
+    """Text cached at upload time if it matches this file, otherwise extract it now"""
+    text = read_text_cache(file_path, file_hash)
+    if text is not None:
+        metrics.incr("cache.resume_text.hit")
+        return text
+    metrics.incr("cache.resume_text.miss")
+    text, _ = extract_resume_text(file_bytes, file_type)
+    return text
+
 def parse_json_response(response: str) -> List[Dict]:
     """Parse the JSON response from the LLM"""
     # Find JSON content in the response (it might be embedded in text)
@@ -113,19 +191,7 @@ You are an expert AI tasked with analyzing resumes to evaluate the candidate's d
 Your objective is to assign a **confidence score between 0.0 and 100.0** for each skill in the SKILL LIST, reflecting how well that skill is evidenced in the RESUME.
 No explanations or commentary are allowed — **output only the JSON array**.
 
-SCORING GUIDELINES (for each skill):
-**100.0** - Extensive, clearly demonstrated expertise (e.g. multiple job roles, advanced projects, certifications, tools or libraries tied to the skill)
-**75.0 - 99.9** - Strong, practical usage (e.g. used in key projects, listed in responsibilities, paired with related tools or platforms)
-**50.0 - 74.9** - Moderate or partial exposure (e.g. mentioned once or used as a supporting tool, course or internship)
-**25.0 - 49.9** - Light familiarity or vague mention (e.g. in a course list, minor project, or soft skill grouping)
-**0.0 - 24.9** - No evidence or only superficial mention (e.g. resume includes unrelated topics or lacks any mention)
-
-EVIDENCE TO CONSIDER:
-- **Direct mentions**: skills listed explicitly in work experience, education, certifications, or project descriptions
-- **Indirect indicators**: tools or frameworks tightly associated with a skill (e.g. “Pandas” implies some Python; “Spring Boot” implies Java)
-- **Depth signals**: frequency of mention, job title relevance (e.g. “Data Scientist” implies Python + ML), verbs like *built, led, optimized*
-- **Recency and context**: Recent and active usage counts more than passive learning or outdated experience
-- Avoid guessing. If a skill appears indirectly, give partial confidence — do not assume full proficiency unless clearly justified by the resume.
+{SCORING_GUIDELINES}
 
 SKILL LIST:
 {skill_list}
@@ -142,43 +208,51 @@ Remember to only return a valid JSON array with nothing else.
 """
 
     # Call LLM
-    client = genai.Client(api_key=api_key)
-
-    response = client.models.generate_content(
-        model="gemini-2.0-flash", contents=prompt
-    )
+    response_text = generate_text(prompt, api_key=api_key, model=GEMINI_MODEL, purpose="resume_analysis")
 
     # Parse response
-    skills = parse_json_response(response.text)
+    skills = parse_json_response(response_text)
 
     # Remove any duplicates that might still be present
     unique_skills = remove_duplicates(skills)
 
     return unique_skills
 
-def analyze_resume_file(file_path, file_type, skill_list, api_key):
+def read_resume(file_path) -> Tuple[bytes, str]:
+    """(resume file bytes, their sha256); enough for the analysis cache lookup, no text extraction"""
     with open(file_path, "rb") as f:
         file_bytes = f.read()
+    return file_bytes, hashlib.sha256(file_bytes).hexdigest()
 
-    text = ""
-    if file_type.lower() == "pdf":
-        text = extract_text_from_pdf(file_bytes)
-    elif file_type.lower() == "docx":
-        text = extract_text_from_docx(file_bytes)
-    else:
-        # Assume plain text
-        try:
-            text = file_bytes.decode("utf-8")
-        except:
-            text = ""
+def lookup_resume_analysis(user_id, file_hash, skill_list) -> Tuple[str, Optional[List[Tuple[str, float]]]]:
+    """(cache key, cached analysis or None) for this resume + skill list + model"""
+    cache_key = resume_analysis_key(file_hash, skill_list, GEMINI_MODEL)
+    cached = get_cached_resume_analysis(user_id, cache_key)
+    metrics.incr("cache.resume_analysis.hit" if cached is not None else "cache.resume_analysis.miss")
+    return cache_key, cached
 
+def score_resume_text(text, skill_list, api_key, user_id=None, cache_key=None) -> List[Tuple[str, float]]:
+    """LLM scoring of an already extracted resume; stored under `cache_key` when given"""
     if not text:
         return []
-    
+
     skills = extract_skills_with_llm(skill_list, text, api_key)
+    skill_tuples = get_skills_as_tuples(skills)
 
-    return get_skills_as_tuples(skills)
+    if cache_key and skill_tuples:
+        cache_resume_analysis(user_id, cache_key, skill_tuples)
 
-        
+    return skill_tuples
 
-        
+def analyze_resume_file(file_path, file_type, skill_list, api_key, user_id=None):
+    file_bytes, file_hash = read_resume(file_path)
+
+    # Unchanged resume + same skill list + same model → reuse the stored analysis
+    cache_key = None
+    if user_id is not None:
+        cache_key, cached = lookup_resume_analysis(user_id, file_hash, skill_list)
+        if cached is not None:
+            return cached
+
+    text = load_resume_text(file_path, file_type, file_bytes, file_hash)
+    return score_resume_text(text, skill_list, api_key, user_id, cache_key)
\ No newline at end of file
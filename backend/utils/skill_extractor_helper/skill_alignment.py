@@ -0,0 +1,121 @@
+import glob
+import json
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Aligns the job skill list with the skills scored on a resume in O(n + m): both sides are
+# reduced to a canonical key (normalized name, then alias → canonical skill) and joined
+# through a dict instead of comparing every pair of raw names.
+
+SKILL_GRAPH_GLOB = "data/skill_graph/*.json"
+
+# Common abbreviations (same spirit as the special cases in calculate_skill_importance). From the
+# skill graphs, an abbreviation only applies when no graph has it as a node of its own
+# (e.g. "js" is a separate skill in the domain graphs, so it is not merged into "javascript").
+SKILL_ABBREVIATIONS = {
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "nn": "neural network",
+    "neural networks": "neural network",
+    "k8s": "kubernetes",
+    "js": "javascript",
+    "ts": "typescript",
+}
+
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+
+def normalize_skill_name(name: str) -> str:
+    """Case-, whitespace- and separator-insensitive form: " Machine-Learning " → "machine learning"."""
+    return _SEPARATORS.sub(" ", str(name).casefold()).strip()
+
+
+class SkillAlignment:
+    __slots__ = ("scores", "unmatched_job", "unmatched_resume")
+
+    def __init__(self, scores, unmatched_job, unmatched_resume):
+        self.scores = scores                      # [(job skill name, confidence)] in job skill order
+        self.unmatched_job = unmatched_job        # job skills with no resume score (given 0)
+        self.unmatched_resume = unmatched_resume  # resume skills that match no job skill
+
+
+class SkillAligner:
+    def __init__(self, aliases: Optional[Dict[str, str]] = None, abbreviations: Dict[str, str] = SKILL_ABBREVIATIONS):
+        # normalized alias → normalized canonical name
+        self.aliases = {normalize_skill_name(k): normalize_skill_name(v) for k, v in abbreviations.items()}
+        if aliases:
+            self.aliases.update({normalize_skill_name(k): normalize_skill_name(v) for k, v in aliases.items()})
+
+    @classmethod
+    def from_skill_graphs(cls, skill_graphs: Iterable[dict]) -> "SkillAligner":
+        """
+        Aliases from graph nodes: each node's id and optional "aliases" resolve to its name, and
+        SKILL_ABBREVIATIONS apply. Neither may rename a skill that is a node of its own in a graph.
+        """
+        skill_graphs = list(skill_graphs)
+        node_names = {
+            normalize_skill_name(skill["name"])
+            for graph in skill_graphs for skill in graph.get("skills", []) if skill.get("name")
+        }
+        aliases = {}
+        for graph in skill_graphs:
+            for skill in graph.get("skills", []):
+                name = skill.get("name")
+                if not name:
+                    continue
+                for alias in [skill.get("id"), *skill.get("aliases", [])]:
+                    if alias and normalize_skill_name(alias) not in node_names:
+                        aliases.setdefault(alias, name)
+        abbreviations = {
+            short: full for short, full in SKILL_ABBREVIATIONS.items() if normalize_skill_name(short) not in node_names
+        }
+        return cls(aliases, abbreviations)
+
+    def key(self, name: str) -> str:
+        normalized = normalize_skill_name(name)
+        return self.aliases.get(normalized, normalized)
+
+    def align(self, job_skills: List[Tuple[str, float]], resume_skills: List[Tuple[str, float]]) -> SkillAlignment:
+        """
+        Confidence of each job skill from the resume scores (0 when missing). The first resume
+        entry wins for a given key, like the pairwise loop this replaces.
+        """
+        resume_by_key = {}
+        for name, confidence in resume_skills:
+            resume_by_key.setdefault(self.key(name), (name, confidence))
+
+        scores, unmatched_job, matched_keys = [], [], set()
+        for skill_name, _ in job_skills:
+            key = self.key(skill_name)
+            match = resume_by_key.get(key)
+            if match is None:
+                scores.append((skill_name, 0))
+                unmatched_job.append(skill_name)
+            else:
+                scores.append((skill_name, match[1]))
+                matched_keys.add(key)
+
+        unmatched_resume = [name for key, (name, _) in resume_by_key.items() if key not in matched_keys]
+        return SkillAlignment(scores, unmatched_job, unmatched_resume)
+
+
+_default_aligner = None
+_default_lock = threading.Lock()
+
+
+def get_skill_aligner() -> SkillAligner:
+    """Process-wide aligner with aliases from every domain skill graph (built on first use)."""
+    global _default_aligner
+    with _default_lock:
+        if _default_aligner is None:
+            graphs = []
+            for path in sorted(glob.glob(SKILL_GRAPH_GLOB)):
+                try:
+                    with open(path, "r") as f:
+                        graphs.append(json.load(f))
+                except (OSError, ValueError) as e:
+                    print(f"Warning: skill graph {path} not loaded for aliases: {e}")
+            _default_aligner = SkillAligner.from_skill_graphs(graphs)
+        return _default_aligner
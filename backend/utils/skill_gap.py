@@ -0,0 +1,62 @@
+import numpy as np
+
+# Skill-gap engine: turns job importance scores and resume confidence scores (both 0–100) into
+# focus scores for the skills a user still has to learn, in one vectorized pass:
+#   shift   job scores so the most important skill sits at 100
+#   scale   both sides to [0, 1]
+#   gap     job - resume, only where the resume is weaker
+#   focus   gap / total gap           confidence   resume / total resume (over the gap skills)
+# Works on one user (1-D) or a batch of users (2-D, one row each) for offline re-ranking.
+# Sums are sequential (cumsum), so single-user results are bit-identical to summing the lists.
+
+
+def _row_total(values):
+    return np.cumsum(values, axis=1)[:, -1:]
+
+
+def batch_skill_gaps(job_scores, resume_scores, valid=None):
+    """
+    job_scores, resume_scores: (users, skills) arrays; `valid` marks real entries when rows are
+    padded to a common length. Returns (gap_mask, focus, confidence), each (users, skills);
+    focus/confidence are 0 outside the gap mask and unrounded.
+    """
+    job = np.atleast_2d(np.asarray(job_scores, dtype=np.float64))
+    resume = np.atleast_2d(np.asarray(resume_scores, dtype=np.float64))
+    if job.shape != resume.shape:
+        raise IndexError(f"Job scores and resume scores do not match: {job.shape} vs {resume.shape}")
+    valid = np.ones(job.shape, dtype=bool) if valid is None else np.atleast_2d(np.asarray(valid, dtype=bool))
+
+    max_job = np.max(np.where(valid, job, -np.inf), axis=1, keepdims=True)
+    shift = np.where(max_job < 100, 100 - max_job, 0.0)
+    job_norm = (job + shift) / 100.0
+    resume_norm = resume / 100.0
+
+    gap_mask = valid & (resume_norm < job_norm)
+    gaps = np.where(gap_mask, job_norm - resume_norm, 0.0)
+    confidences = np.where(gap_mask, resume_norm, 0.0)
+
+    total_gap = _row_total(gaps)
+    total_conf = _row_total(confidences)
+    focus = np.divide(gaps, total_gap, out=np.zeros_like(gaps), where=gap_mask & (total_gap > 0))
+    confidence = np.divide(confidences, total_conf, out=np.zeros_like(confidences), where=gap_mask & (total_conf > 0))
+    return gap_mask, focus, confidence
+
+
+def skill_gaps(skill_names, job_scores, resume_scores, decimals=2):
+    """
+    One user: [[skill, focus, confidence], ...] for the skills with a gap, in input order,
+    rounded like Python's round() (an empty list when the resume covers every skill).
+    """
+    gap_mask, focus, confidence = batch_skill_gaps(job_scores, resume_scores)
+    rows = np.flatnonzero(gap_mask[0])
+    return [
+        [skill_names[i], round(float(focus[0, i]), decimals), round(float(confidence[0, i]), decimals)]
+        for i in rows
+    ]
+
+
+def normalize_weights(values):
+    """Scale non-negative weights so they sum to 1 (unchanged when they sum to 0)."""
+    values = np.asarray(values, dtype=np.float64)
+    total = np.sum(values)
+    return values / total if total > 0 else values